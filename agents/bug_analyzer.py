@@ -1,5 +1,6 @@
 import autogen
 from typing import Dict, Any, List
+from utils.result_extractor import result_block_instructions
 
 class BugAnalyzerAgent:
     def __init__(self, llm_config: Dict[str, Any]):
@@ -25,7 +26,7 @@ class BugAnalyzerAgent:
             - Root cause explanation
             - Affected components
             - Recommended fix approach
-            """,
+            """ + result_block_instructions("analysis"),
             llm_config=llm_config,
             human_input_mode="NEVER"
         )
@@ -1,5 +1,6 @@
 import autogen
 from typing import Dict, Any
+from utils.result_extractor import result_block_instructions
 
 class CodeReviewerAgent:
     def __init__(self, llm_config: Dict[str, Any]):
@@ -26,7 +27,7 @@ class CodeReviewerAgent:
             - Severity levels (Critical, Major, Minor)
             - Suggested improvements
             - Code examples when applicable
-            """,
+            """ + result_block_instructions("review"),
             llm_config=llm_config,
             human_input_mode="NEVER"
         )
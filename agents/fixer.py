@@ -1,5 +1,6 @@
 import autogen
 from typing import Dict, Any
+from utils.result_extractor import result_block_instructions
 
 class FixerAgent:
     def __init__(self, llm_config: Dict[str, Any]):
@@ -27,7 +28,7 @@ class FixerAgent:
             - Tested and validated
             - Maintainable
             - Following best practices
-            """,
+            """ + result_block_instructions("fix"),
             llm_config=llm_config,
             human_input_mode="NEVER"
         )
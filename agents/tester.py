@@ -1,5 +1,6 @@
 import autogen
 from typing import Dict, Any
+from utils.result_extractor import result_block_instructions
 
 class TesterAgent:
     def __init__(self, llm_config: Dict[str, Any]):
@@ -26,7 +27,7 @@ class TesterAgent:
             - Independent and isolated
             - Deterministic and repeatable
             - Fast and efficient
-            """,
+            """ + result_block_instructions("tests"),
             llm_config=llm_config,
             human_input_mode="NEVER"
         )
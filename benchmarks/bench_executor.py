@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compare CodeExecutor.execute_python latency: fresh subprocess vs warm worker pool
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.code_executor import CodeExecutor
+from utils.worker_pool import PythonWorkerPool
+
+SNIPPETS = [
+    "print(sum(range(1000)))",
+    "import json\nprint(json.dumps({'a': 1}))",
+    "def divide(a, b):\n    return a / b\nprint(divide(10, 2))",
+    "raise ValueError('expected failure')",
+]
+
+
+def measure(executor: CodeExecutor, iterations: int):
+    """Return per-call latencies in milliseconds"""
+    latencies = []
+    for i in range(iterations):
+        code = SNIPPETS[i % len(SNIPPETS)]
+        start = time.perf_counter()
+        executor.execute_python(code)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{name:<12} mean={statistics.mean(ordered):7.1f}ms  "
+          f"p50={statistics.median(ordered):7.1f}ms  p95={p95:7.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=40)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    summarize("subprocess", measure(CodeExecutor(timeout=60), args.iterations))
+
+    pool = PythonWorkerPool(size=args.pool_size, timeout=60)
+    try:
+        # First call waits for the workers to finish booting
+        pool_executor = CodeExecutor(timeout=60, worker_pool=pool)
+        pool_executor.execute_python("pass")
+        summarize("worker pool", measure(pool_executor, args.iterations))
+        print(f"pool stats: {pool.stats}")
+    finally:
+        pool.close()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for BugFixingSystem against the local mock LLM
+
+Builds a corpus from create_sample_bug and the advanced_usage demo bugs, runs
+it through fix_bugs and reports bugs/hour, p50/p95/p99 latency per stage,
+token totals and peak RSS. Save a run with --output and compare a later one
+with --compare to spot regressions between versions:
+
+    python benchmarks/bench_pipeline.py --repeat 3 --output baseline.json
+    python benchmarks/bench_pipeline.py --repeat 3 --compare baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import resource
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm_server import MockLLMServer
+from utils.metrics import NO_LLM_PATHS
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def bench_config(work_dir: str) -> str:
+    """Copy of config/config.json pointed at scratch directories, with response caching off"""
+    with open(os.path.join(ROOT, "config", "config.json")) as f:
+        config = json.load(f)
+    config["code_execution_config"]["work_dir"] = os.path.join(work_dir, "workspace")
+    config["cache_config"] = dict(config.get("cache_config", {}), enabled=False)
+    config["metrics_config"] = {"jsonl_path": os.path.join(work_dir, "traces.jsonl"), "prometheus_port": None}
+    config["snapshot_config"] = {"store_dir": os.path.join(work_dir, "snapshots")}
+    config["transcript_config"] = {"enabled": True, "directory": os.path.join(work_dir, "transcripts")}
+    path = os.path.join(work_dir, "config.json")
+    with open(path, "w") as f:
+        json.dump(config, f)
+    return path
+
+
+def build_corpus(system, workspace: str, repeat: int) -> List[Dict[str, Any]]:
+    """Bug reports for the sample bug and the demo bugs, repeated under distinct file names"""
+    from examples.advanced_usage import multiple_bug_reports, performance_bug_report
+
+    reports = []
+    for i in range(repeat):
+        directory = os.path.join(workspace, f"round_{i}")
+        sample = system.create_sample_bug(os.path.join(directory, "sample_buggy.py"))
+        reports.append({'file_path': sample, 'error_message': 'ZeroDivisionError: division by zero',
+                        'test_input': 'divide_numbers(10, 0)'})
+        reports.extend(multiple_bug_reports(system, directory))
+        reports.append(performance_bug_report(system, directory))
+    return reports
+
+
+def stage_latencies(traces_path: str) -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99 per stage (span kind:name) in milliseconds from the exported traces"""
+    durations: Dict[str, List[float]] = {}
+    with open(traces_path) as f:
+        for line in f:
+            span = json.loads(line)
+            durations.setdefault(f"{span['kind']}:{span['name']}", []).append(span["duration"] * 1000)
+    return {
+        stage: {"count": len(values), "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95), "p99_ms": percentile(values, 99)}
+        for stage, values in sorted(durations.items())
+    }
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """Peak resident memory of this process and of its (reaped) child processes"""
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 / scale / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024 / scale / 1024,
+    }
+
+
+def run(args) -> Dict[str, Any]:
+    server = MockLLMServer(port=args.port, latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+                           tokens_per_second=args.tokens_per_second, error_rate=args.error_rate,
+                           seed=args.seed).start()
+    os.environ.update({
+        "AZURE_OPENAI_API_KEY": "mock",
+        "AZURE_OPENAI_ENDPOINT": server.url,
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "mock",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+    })
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        from main import BugFixingSystem
+
+        system = BugFixingSystem(bench_config(work_dir))
+        reports = build_corpus(system, os.path.join(work_dir, "workspace"), args.repeat)
+
+        print(f"🏁 Running {len(reports)} bugs (concurrency {args.concurrency}) against {server.url}")
+        started = time.perf_counter()
+        results = system.fix_bugs(reports, max_concurrency=args.concurrency)
+        elapsed = time.perf_counter() - started
+
+        tokens = {"prompt_tokens": 0, "completion_tokens": 0}
+        statuses: Dict[str, int] = {}
+        resolved_by: Dict[str, int] = {}
+        for result in results:
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+            path = result.get("resolved_by") or "unresolved"
+            resolved_by[path] = resolved_by.get(path, 0) + 1
+            for usage in result["metrics"].get("tokens", {}).values():
+                tokens["prompt_tokens"] += usage["prompt_tokens"]
+                tokens["completion_tokens"] += usage["completion_tokens"]
+        stages = stage_latencies(os.path.join(work_dir, "traces.jsonl"))
+        os.chdir(ROOT)
+
+    server.stop()
+    return {
+        "revision": git_revision(),
+        "label": args.label,
+        "params": {key: getattr(args, key) for key in
+                   ("repeat", "concurrency", "latency_ms", "latency_jitter_ms", "tokens_per_second",
+                    "error_rate", "seed")},
+        "bugs": len(results),
+        "statuses": statuses,
+        "wall_seconds": elapsed,
+        "bugs_per_hour": statuses.get("success", 0) / elapsed * 3600 if elapsed else 0.0,
+        "resolved_by": resolved_by,
+        "no_llm_fraction": sum(resolved_by.get(path, 0) for path in NO_LLM_PATHS) / len(results)
+        if results else 0.0,
+        "tokens": tokens,
+        "llm_requests": server.stats["requests"],
+        "errors_injected": server.stats["errors_injected"],
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def report(summary: Dict[str, Any]):
+    print(f"\n📊 {summary['bugs']} bugs in {summary['wall_seconds']:.1f}s -> "
+          f"{summary['bugs_per_hour']:.0f} bugs/hour  statuses={summary['statuses']}")
+    print(f"   resolved without LLM: {summary['no_llm_fraction']:.0%}  by path={summary['resolved_by']}")
+    print(f"   tokens: prompt={summary['tokens']['prompt_tokens']} completion={summary['tokens']['completion_tokens']}  "
+          f"LLM requests={summary['llm_requests']} (injected errors: {summary['errors_injected']})")
+    print(f"   peak RSS: self={summary['peak_rss_mb']['self']:.0f} MB  children={summary['peak_rss_mb']['children']:.0f} MB")
+    print(f"\n{'stage':<36}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in summary["stages"].items():
+        print(f"{stage:<36}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> bool:
+    """Print relative changes against a baseline run; returns False on a regression beyond tolerance"""
+    print(f"\n🔍 Compared with {baseline.get('revision')} ({baseline.get('label') or 'baseline'}):")
+    if baseline.get("params") != summary["params"]:
+        print(f"   ⚠️  parameters differ: {baseline.get('params')} vs {summary['params']}")
+
+    checks = [("bugs_per_hour", summary["bugs_per_hour"], baseline["bugs_per_hour"], True),
+              ("prompt_tokens", summary["tokens"]["prompt_tokens"], baseline["tokens"]["prompt_tokens"], False),
+              ("peak_rss_self_mb", summary["peak_rss_mb"]["self"], baseline["peak_rss_mb"]["self"], False)]
+    for stage, stats in summary["stages"].items():
+        # Sub-millisecond stages are dominated by noise
+        if stage in baseline["stages"] and baseline["stages"][stage]["p95_ms"] >= 5:
+            checks.append((f"{stage} p95", stats["p95_ms"], baseline["stages"][stage]["p95_ms"], False))
+
+    ok = True
+    for name, current, previous, higher_is_better in checks:
+        change = (current - previous) / previous if previous else 0.0
+        regressed = (change < -tolerance) if higher_is_better else (change > tolerance)
+        ok = ok and not regressed
+        marker = "❌" if regressed else "  "
+        print(f"{marker} {name:<40}{previous:>12.1f} -> {current:>12.1f}  ({change:+.1%})")
+    return ok
+
+
+if __name__ == "__main__":
+    # autogen logs every client it creates at INFO, which buries the report
+    logging.getLogger("autogen.oai.client").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2, help="copies of the 4-bug corpus")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--port", type=int, default=0, help="mock server port (0 picks a free one)")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help="write the summary as JSON")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --output")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative regression")
+    args = parser.parse_args()
+
+    summary = run(args)
+    report(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            if not compare(summary, json.load(f), args.tolerance):
+                sys.exit(1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Job queue throughput versus worker count against the local mock LLM
+
+Queues the bench_pipeline corpus and drains it with `worker.py run --drain`
+at each worker count, reporting jobs/hour and the speedup over one worker:
+
+    python benchmarks/bench_queue.py --workers 1 2 4 --repeat 2
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_llm_server import MockLLMServer
+from bench_pipeline import bench_config, build_corpus
+
+
+def drain(work_dir: str, processes: int, repeat: int, env) -> dict:
+    """Queue a fresh corpus under work_dir and time draining it with the given worker count"""
+    from main import BugFixingSystem
+    from worker import open_queue
+
+    config_path = bench_config(work_dir)
+    with open(config_path) as f:
+        config = json.load(f)
+    config["job_queue_config"] = {"db_path": os.path.join(work_dir, "queue.db"), "poll_interval": 0.2}
+    with open(config_path, "w") as f:
+        json.dump(config, f)
+
+    system = BugFixingSystem(config_path)
+    queue = open_queue(config)
+    for report in build_corpus(system, os.path.join(work_dir, "workspace"), repeat):
+        queue.submit(report)
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "worker.py"), "--config", config_path, "run",
+                    "--processes", str(processes), "--drain"], cwd=work_dir, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    elapsed = time.perf_counter() - started
+    stats = queue.stats()
+    return {"workers": processes, "jobs": sum(stats.values()), "done": stats["done"], "seconds": elapsed,
+            "jobs_per_hour": stats["done"] / elapsed * 3600 if elapsed else 0.0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=2, help="copies of the 4-bug corpus")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    args = parser.parse_args()
+
+    server = MockLLMServer(port=0, latency_ms=args.latency_ms, latency_jitter_ms=0,
+                           tokens_per_second=args.tokens_per_second).start()
+    env = dict(os.environ, PYTHONPATH=ROOT, AZURE_OPENAI_API_KEY="mock", AZURE_OPENAI_ENDPOINT=server.url,
+               AZURE_OPENAI_DEPLOYMENT_NAME="mock", AZURE_OPENAI_API_VERSION="2024-02-15-preview")
+    os.environ.update(env)
+
+    runs = []
+    for processes in args.workers:
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.chdir(work_dir)
+            runs.append(drain(work_dir, processes, args.repeat, env))
+            os.chdir(ROOT)
+    server.stop()
+
+    print(f"{'workers':>8}{'done':>8}{'seconds':>10}{'jobs/hour':>12}{'speedup':>10}")
+    for run in runs:
+        speedup = run["jobs_per_hour"] / runs[0]["jobs_per_hour"] if runs[0]["jobs_per_hour"] else 0.0
+        print(f"{run['workers']:>8}{run['done']:>5}/{run['jobs']:<2}{run['seconds']:>10.1f}"
+              f"{run['jobs_per_hour']:>12.0f}{speedup:>9.2f}x")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare workspace backups: per-file .backup copies vs the content-addressed snapshot store
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_handler import FileHandler
+from utils.snapshot_store import SnapshotStore
+
+
+def make_tree(root: str, files: int, size_kb: int):
+    """Synthetic source tree: files spread over 10 packages"""
+    body = ("x = 1  # padding\n" * (size_kb * 1024 // 17 + 1))[:size_kb * 1024]
+    for i in range(files):
+        package = os.path.join(root, f"pkg{i % 10}")
+        os.makedirs(package, exist_ok=True)
+        with open(os.path.join(package, f"module_{i}.py"), "w") as f:
+            f.write(f"# module {i}\n{body}")
+
+
+def touch_some(root: str, count: int, generation: int):
+    """Modify count files, as a fix attempt would"""
+    for i in range(count):
+        path = os.path.join(root, f"pkg{i % 10}", f"module_{i}.py")
+        with open(path, "a") as f:
+            f.write(f"# attempt {generation}\n")
+
+
+def disk_usage(path: str) -> int:
+    """Allocated bytes under path, counting hard-linked inodes once"""
+    seen, total = set(), 0
+    for directory, _, filenames in os.walk(path):
+        for name in filenames:
+            stat = os.lstat(os.path.join(directory, name))
+            if stat.st_ino not in seen:
+                seen.add(stat.st_ino)
+                total += stat.st_blocks * 512
+    return total
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--size-kb", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--changed", type=int, default=3, help="files modified per attempt")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work:
+        tree = os.path.join(work, "repo")
+        make_tree(tree, args.files, args.size_kb)
+        handler = FileHandler(tree)
+        files = handler.list_files(tree, [".py"])
+        print(f"tree: {len(files)} files, {disk_usage(tree) / 1e6:.1f} MB")
+
+        # Today's approach: one .backup copy per file, per attempt, one generation kept
+        copy_times = []
+        for attempt in range(args.attempts):
+            ms, _ = timed(lambda: [handler.backup_file(p) for p in files])
+            copy_times.append(ms)
+            touch_some(tree, args.changed, attempt)
+        backups = [f"{p}.backup" for p in files]
+        restore_copy_ms, _ = timed(lambda: [shutil.copy2(b, b[:-len(".backup")]) for b in backups])
+        backup_bytes = sum(os.stat(b).st_blocks * 512 for b in backups)
+        for b in backups:
+            os.remove(b)
+
+        # Snapshot store: one snapshot per attempt, every generation kept
+        store = SnapshotStore(os.path.join(work, "store"))
+        snapshot_times, snapshot_ids = [], []
+        for attempt in range(args.attempts):
+            ms, snapshot_id = timed(lambda: store.snapshot([tree], label=f"attempt {attempt}", base_dir=tree))
+            snapshot_times.append(ms)
+            snapshot_ids.append(snapshot_id)
+            touch_some(tree, args.changed, attempt + args.attempts)
+        restore_snapshot_ms, restored = timed(lambda: store.restore(snapshot_ids[0]))
+        view_ms, _ = timed(lambda: store.checkout(snapshot_ids[-1], os.path.join(work, "view"), read_only=True))
+
+        print(f"{'.backup copies':<18} first={copy_times[0]:8.1f}ms  repeat={copy_times[-1]:8.1f}ms  "
+              f"restore={restore_copy_ms:8.1f}ms  disk={backup_bytes / 1e6:6.1f} MB  generations=1")
+        print(f"{'snapshot store':<18} first={snapshot_times[0]:8.1f}ms  repeat={snapshot_times[-1]:8.1f}ms  "
+              f"restore={restore_snapshot_ms:8.1f}ms  disk={disk_usage(store.objects_dir) / 1e6:6.1f} MB  "
+              f"generations={len(snapshot_ids)}")
+        print(f"restored {len(restored)} changed file(s); read-only view of {len(files)} files in {view_ms:.1f}ms")
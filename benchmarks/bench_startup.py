@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Measure BugFixingSystem cold start in fresh interpreters: importing main,
+constructing the system, and building the agent team on first use
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+system = main.BugFixingSystem({config!r})
+constructed = time.perf_counter()
+lazy = "autogen" not in sys.modules
+system.group_chat_manager
+built = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "construct": constructed - imported,
+    "first_use": built - constructed,
+    "lazy": lazy,
+}}))
+"""
+
+
+def run_probe(source: str) -> str:
+    env = dict(os.environ)
+    env.setdefault("AZURE_OPENAI_API_KEY", "bench")
+    env.setdefault("AZURE_OPENAI_ENDPOINT", "http://127.0.0.1:9")
+    env.setdefault("AZURE_OPENAI_DEPLOYMENT_NAME", "bench")
+    env.setdefault("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
+    result = subprocess.run([sys.executable, "-c", source], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result.stdout.strip().splitlines()[-1]
+
+
+def summarize(name: str, seconds):
+    ordered = sorted(ms * 1000 for ms in seconds)
+    print(f"{name:<12} p50={statistics.median(ordered):7.1f}ms  "
+          f"min={ordered[0]:7.1f}ms  max={ordered[-1]:7.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--config", default="config/config.json")
+    args = parser.parse_args()
+
+    samples = [json.loads(run_probe(PROBE.format(config=args.config))) for _ in range(args.runs)]
+    for stage in ("import", "construct", "first_use"):
+        summarize(stage, [sample[stage] for sample in samples])
+    summarize("total", [sample["import"] + sample["construct"] + sample["first_use"] for sample in samples])
+    print(f"autogen deferred until first use: {'yes' if all(sample['lazy'] for sample in samples) else 'no'}")
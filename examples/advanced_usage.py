@@ -1,19 +1,12 @@
 from main import BugFixingSystem
 import json
+import logging
 
-class AdvancedBugFixingDemo:
-    def __init__(self):
-        self.bug_fixer = BugFixingSystem()
-    
-    def demo_multiple_bugs(self):
-        """Demo fixing multiple bugs in sequence"""
-        print("🔄 Demo: Multiple Bug Fixes")
-        
-        # Create multiple buggy files
-        bugs = [
-            {
-                'name': 'null_pointer',
-                'code': '''
+# Buggy programs used by the demos (and by benchmarks/bench_pipeline.py)
+MULTIPLE_BUGS = [
+    {
+        'name': 'null_pointer',
+        'code': '''
 def process_data(data):
     return data.upper().strip()  # Bug: No null check
 
@@ -21,11 +14,11 @@ def main():
     result = process_data(None)  # This will fail
     print(result)
 ''',
-                'error': 'AttributeError: NoneType object has no attribute upper'
-            },
-            {
-                'name': 'index_error',
-                'code': '''
+        'error': 'AttributeError: NoneType object has no attribute upper'
+    },
+    {
+        'name': 'index_error',
+        'code': '''
 def get_first_element(lst):
     return lst[0]  # Bug: No empty list check
 
@@ -33,37 +26,13 @@ def main():
     result = get_first_element([])  # This will fail
     print(result)
 ''',
-                'error': 'IndexError: list index out of range'
-            }
-        ]
-        
-        for bug in bugs:
-            print(f"\n🐛 Fixing bug: {bug['name']}")
-            
-            # Create buggy file
-            file_path = f"workspace/{bug['name']}.py"
-            self.bug_fixer.file_handler.write_file(file_path, bug['code'])
-            
-            # Fix the bug
-            bug_report = {
-                'file_path': file_path,
-                'error_message': bug['error'],
-                'test_input': 'main()',
-                'expected_output': 'Should handle edge cases gracefully'
-            }
-            
-            results = self.bug_fixer.fix_bug(bug_report)
-            
-            if results['status'] == 'success':
-                print(f"✅ Fixed {bug['name']}")
-            else:
-                print(f"❌ Failed to fix {bug['name']}: {results['error']}")
-    
-    def demo_performance_bug(self):
-        """Demo fixing performance-related bugs"""
-        print("\n⚡ Demo: Performance Bug Fix")
-        
-        slow_code = '''
+        'error': 'IndexError: list index out of range'
+    }
+]
+
+PERFORMANCE_BUG = {
+    'name': 'performance_bug',
+    'code': '''
 def find_duplicates(numbers):
     """Find duplicate numbers in list - SLOW VERSION"""
     duplicates = []
@@ -83,20 +52,72 @@ if __name__ == "__main__":
     # This will be very slow for large inputs
     large_list = list(range(1000)) * 2
     dupes = find_duplicates(large_list)
-    
+
     fib_30 = fibonacci_slow(30)  # This will take forever
-'''
+''',
+    'error': 'Performance issue: O(n²) complexity causing timeout',
+    'test_input': 'Large dataset processing',
+    'expected_output': 'Should complete in reasonable time',
+    'actual_output': 'Times out or takes too long'
+}
+
+
+def multiple_bug_reports(bug_fixer: BugFixingSystem, workspace: str = "workspace"):
+    """Write the MULTIPLE_BUGS files and return their bug reports"""
+    bug_reports = []
+    for bug in MULTIPLE_BUGS:
+        # Create buggy file
+        file_path = f"{workspace}/{bug['name']}.py"
+        bug_fixer.file_handler.write_file(file_path, bug['code'])
+
+        bug_reports.append({
+            'file_path': file_path,
+            'error_message': bug['error'],
+            'test_input': 'main()',
+            'expected_output': 'Should handle edge cases gracefully'
+        })
+    return bug_reports
+
+
+def performance_bug_report(bug_fixer: BugFixingSystem, workspace: str = "workspace"):
+    """Write the PERFORMANCE_BUG file and return its bug report"""
+    file_path = f"{workspace}/{PERFORMANCE_BUG['name']}.py"
+    bug_fixer.file_handler.write_file(file_path, PERFORMANCE_BUG['code'])
+
+    return {
+        'file_path': file_path,
+        'error_message': PERFORMANCE_BUG['error'],
+        'test_input': PERFORMANCE_BUG['test_input'],
+        'expected_output': PERFORMANCE_BUG['expected_output'],
+        'actual_output': PERFORMANCE_BUG['actual_output']
+    }
+
+
+class AdvancedBugFixingDemo:
+    def __init__(self):
+        self.bug_fixer = BugFixingSystem()
+    
+    def demo_multiple_bugs(self):
+        """Demo fixing multiple bugs in parallel"""
+        print("🔄 Demo: Multiple Bug Fixes")
         
-        file_path = "workspace/performance_bug.py"
-        self.bug_fixer.file_handler.write_file(file_path, slow_code)
+        bug_reports = multiple_bug_reports(self.bug_fixer)
         
-        bug_report = {
-            'file_path': file_path,
-            'error_message': 'Performance issue: O(n²) complexity causing timeout',
-            'test_input': 'Large dataset processing',
-            'expected_output': 'Should complete in reasonable time',
-            'actual_output': 'Times out or takes too long'
-        }
+        # Fix all bugs concurrently, reporting each one as it finishes
+        def report(index, results):
+            name = MULTIPLE_BUGS[index]['name']
+            if results['status'] == 'success':
+                print(f"✅ Fixed {name}")
+            else:
+                print(f"❌ Failed to fix {name}: {results['error']}")
+        
+        self.bug_fixer.fix_bugs(bug_reports, on_result=report)
+    
+    def demo_performance_bug(self):
+        """Demo fixing performance-related bugs"""
+        print("\n⚡ Demo: Performance Bug Fix")
+        
+        bug_report = performance_bug_report(self.bug_fixer)
         
         results = self.bug_fixer.fix_bug(bug_report)
         
@@ -106,6 +127,8 @@ if __name__ == "__main__":
             print(f"❌ Failed to fix performance bug: {results['error']}")
 
 if __name__ == "__main__":
+    # autogen logs every client it creates at INFO, which buries the demo output
+    logging.getLogger("autogen.oai.client").setLevel(logging.WARNING)
     demo = AdvancedBugFixingDemo()
     demo.demo_multiple_bugs()
     demo.demo_performance_bug()
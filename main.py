@@ -1,41 +1,154 @@
 import os
+import copy
 import json
-from typing import Dict, Any, List, Optional
+import uuid
+import hashlib
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator, TYPE_CHECKING
 from dotenv import load_dotenv
-import autogen
 from utils.file_handler import FileHandler, CodeAnalyzer
 from utils.code_executor import CodeExecutor
-from agents.bug_analyzer import BugAnalyzerAgent
-from agents.code_reviewer import CodeReviewerAgent
-from agents.tester import TesterAgent
-from agents.fixer import FixerAgent
+from utils.worker_pool import PythonWorkerPool
+from utils.context_slicer import ContextSlicer
+from utils.repo_scanner import RepoScanner
+from utils.fix_tournament import FixTournament
+from utils.snapshot_store import SnapshotStore
+from utils.response_cache import ResponseCache
+from utils.agent_hooks import TurnObserver, observe_turns
+from utils.streaming import EventStream, FixEvent, RESULT, ERROR
+from utils.metrics import NO_LLM_PATHS, MetricsRegistry, Tracer, TurnTracer, current_tracer, trace_span, use_tracer
+from utils.result_extractor import ResultExtractor, parse_message, result_block_instructions
+from utils.termination import TerminationController
+from utils.history_compactor import HistoryCompactor
+from utils.fix_result import FixResult, TranscriptLog
+from utils.chat_checkpoint import ChatCheckpointStore, ChatCheckpointer
+from utils.dag import DagExecutor
+from utils.project_index import ProjectIndex, project_root
+from utils.static_fixer import StaticFixer, faulting_functions, function_source, outer_functions, reproduction_test
+
+# autogen (and openai/httpx behind it) dominates import time, so it and the
+# agent modules are only imported once the agents are first needed
+if TYPE_CHECKING:
+    import autogen
+
+_config_cache: Dict[str, tuple] = {}
+_config_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load a JSON config, reusing the parsed file until it changes on disk"""
+    global _dotenv_loaded
+    stat = os.stat(config_path)
+    key = os.path.abspath(config_path)
+    with _config_lock:
+        if not _dotenv_loaded:
+            load_dotenv()
+            _dotenv_loaded = True
+        cached = _config_cache.get(key)
+        if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+            with open(config_path, 'r') as f:
+                cached = ((stat.st_mtime_ns, stat.st_size), json.load(f))
+            _config_cache[key] = cached
+    return copy.deepcopy(cached[1])
+
 
 class BugFixingSystem:
+    # Built by _build_agents the first time one of them is accessed
+    _AGENT_ATTRIBUTES = frozenset({
+        "bug_analyzer", "code_reviewer", "tester", "fixer", "coordinator", "user_proxy", "agents",
+        "speaker_selector", "group_chat", "termination", "group_chat_manager", "history_compactor"
+    })
+    
     def __init__(self, config_path: str = "config/config.json"):
-        # Load environment variables
-        load_dotenv()
-        
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        # Load environment variables and configuration (cached per process)
+        self.config = load_config(config_path)
+        self._lazy_lock = threading.RLock()
+        # Agent teams from finished fix_bugs runs, reused by later runs
+        self._idle_workers: List["BugFixingSystem"] = []
         
         # Setup Azure OpenAI configuration
         self.llm_config = self._setup_llm_config()
         
         # Initialize utilities
         self.file_handler = FileHandler(self.config['code_execution_config']['work_dir'])
-        self.code_executor = CodeExecutor(self.config['code_execution_config']['timeout'])
+        self.snapshots = SnapshotStore(self.config.get('snapshot_config', {}).get('store_dir', '.cache/snapshots'))
+        self.code_executor = CodeExecutor(
+            self.config['code_execution_config']['timeout'],
+            # Warm workers start on the first code execution, not with the system
+            pool_factory=self._setup_worker_pool
+        )
         self.code_analyzer = CodeAnalyzer()
+        context_config = self.config.get('context_config', {})
+        self.context_slicer = ContextSlicer(
+            max_full_file_lines=context_config.get('max_full_file_lines', 200),
+            include_callers=context_config.get('include_callers', True),
+            include_callees=context_config.get('include_callees', True)
+        )
         
-        # Initialize agents
-        self._initialize_agents()
+        # Observers notified around every agent turn during fix_bug
+        self.turn_observers: List[TurnObserver] = []
         
-        # Setup group chat
-        self._setup_group_chat()
+        # Finished conversations are spilled here instead of kept in results
+        transcript_config = self.config.get('transcript_config', {})
+        self.transcripts = None
+        if transcript_config.get('enabled', True):
+            self.transcripts = TranscriptLog(transcript_config.get('directory', 'logs/transcripts'))
+        
+        # Group chat state saved after every round so failed runs can resume
+        checkpoint_config = self.config.get('chat_checkpoint_config', {})
+        self.chat_checkpoints = None
+        if checkpoint_config.get('enabled', True):
+            self.chat_checkpoints = ChatCheckpointStore(checkpoint_config.get('directory', '.cache/chat_checkpoints'))
+        
+        # One slot per LLM conversation in flight (a group chat or a pipeline stage),
+        # shared by every copy of the system so fix_bugs honours max_concurrency
+        self.llm_slots = threading.BoundedSemaphore(
+            self.config.get('batch_config', {}).get('max_concurrency', 4)
+        )
+        
+        # Import graph and symbol indexes of the projects bugs come from, by root
+        self._project_indexes: Dict[str, ProjectIndex] = {}
+        self._project_lock = threading.Lock()
+        
+        # Latency and token metrics aggregated over all runs
+        self.metrics = MetricsRegistry()
+        prometheus_port = self.config.get('metrics_config', {}).get('prometheus_port')
+        if prometheus_port:
+            self.metrics.serve(prometheus_port)
+        
+        # Agents and the group chat are created on first use (see __getattr__)
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not set yet
+        if name in BugFixingSystem._AGENT_ATTRIBUTES:
+            self._build_agents()
+        elif name == "llm_transport":
+            self._setup_llm_transport()
+        elif name == "fix_memory":
+            self._setup_fix_memory()
+        else:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.__dict__[name]
+    
+    def _build_agents(self):
+        """Initialize the agents and group chat unless another thread already did"""
+        with self._lazy_lock:
+            if not self.__dict__.get("_agents_built"):
+                self._initialize_agents()
+                self._setup_group_chat()
+                self._agents_built = True
+    
+    def _reset_agents(self):
+        """Forget the agent team so the next access builds a fresh one"""
+        for name in BugFixingSystem._AGENT_ATTRIBUTES | {"_agents_built"}:
+            self.__dict__.pop(name, None)
     
     def _setup_llm_config(self) -> Dict[str, Any]:
         """Setup Azure OpenAI configuration"""
-        return {
+        llm_config = {
             "model": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
             "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
             "base_url": os.getenv("AZURE_OPENAI_ENDPOINT"),
@@ -45,9 +158,97 @@ class BugFixingSystem:
             "max_tokens": self.config['llm_config']['max_tokens'],
             "timeout": self.config['llm_config']['timeout']
         }
+        
+        # Shared on-disk response cache, keyed on the full request
+        # (model, temperature, system message and message history)
+        cache_config = self.config.get('cache_config', {})
+        self.response_cache = None
+        if cache_config.get('enabled', False):
+            self.response_cache = ResponseCache(
+                cache_dir=cache_config.get('cache_dir', '.cache/llm_responses'),
+                max_entries=cache_config.get('max_entries', 10000),
+                max_size_mb=cache_config.get('max_size_mb', 256),
+                ttl_seconds=cache_config.get('ttl_seconds')
+            )
+            llm_config["cache"] = self.response_cache
+        
+        # One pooled, rate-limited async client shared by every agent and the
+        # chat manager (created with the agents, see _setup_llm_transport)
+        if self.config.get('llm_client_config', {}).get('enabled', False):
+            llm_config["model_client_cls"] = "SharedLLMClient"
+        
+        return llm_config
+    
+    def _setup_llm_transport(self):
+        """Start the shared LLM transport if llm_client_config enables it"""
+        with self._lazy_lock:
+            if "llm_transport" in self.__dict__:
+                return
+            client_config = self.config.get('llm_client_config', {})
+            if not client_config.get('enabled', False):
+                self.llm_transport = None
+                return
+            from utils.llm_client import LLMTransport
+            
+            self.llm_transport = LLMTransport(
+                self.llm_config,
+                max_connections=client_config.get('max_connections', 20),
+                max_keepalive_connections=client_config.get('max_keepalive_connections', 10),
+                keepalive_expiry=client_config.get('keepalive_expiry', 60.0),
+                connect_timeout=client_config.get('connect_timeout', 10.0),
+                requests_per_minute=client_config.get('requests_per_minute'),
+                tokens_per_minute=client_config.get('tokens_per_minute'),
+                max_retries=client_config.get('max_retries', 4),
+                backoff_base=client_config.get('backoff_base', 0.5),
+                backoff_max=client_config.get('backoff_max', 20.0),
+                retry_budget_ratio=client_config.get('retry_budget_ratio', 0.2),
+                hedge_after_seconds=client_config.get('hedge_after_seconds')
+            )
+    
+    def _setup_fix_memory(self):
+        """Open the fix-pattern store if fix_memory_config enables it"""
+        with self._lazy_lock:
+            if "fix_memory" in self.__dict__:
+                return
+            memory_config = self.config.get('fix_memory_config', {})
+            if not memory_config.get('enabled', False):
+                self.fix_memory = None
+                return
+            from utils.fix_memory import FixPatternMemory
+            
+            self.fix_memory = FixPatternMemory(
+                db_path=memory_config.get('db_path', '.cache/fix_patterns/patterns.db'),
+                dimensions=memory_config.get('dimensions', 2048)
+            )
+    
+    def _register_llm_client(self, agent: "autogen.ConversableAgent"):
+        """Attach the shared LLM transport to an agent created with self.llm_config"""
+        if self.llm_transport is not None and agent.llm_config:
+            from utils.llm_client import SharedLLMClient
+            
+            agent.register_model_client(SharedLLMClient, transport=self.llm_transport)
+    
+    def _setup_worker_pool(self) -> Optional[PythonWorkerPool]:
+        """Start warm Python workers for CodeExecutor if configured"""
+        executor_config = self.config.get('executor_config', {})
+        if executor_config.get('backend', 'subprocess') != 'pool':
+            return None
+        return PythonWorkerPool(
+            size=executor_config.get('pool_size', 2),
+            timeout=self.config['code_execution_config']['timeout'],
+            max_jobs_per_worker=executor_config.get('max_jobs_per_worker', 50),
+            max_rss_mb=executor_config.get('max_rss_mb', 512),
+            preload=executor_config.get('preload', [])
+        )
     
     def _initialize_agents(self):
         """Initialize all specialized agents"""
+        import autogen
+        from agents.bug_analyzer import BugAnalyzerAgent
+        from agents.code_reviewer import CodeReviewerAgent
+        from agents.tester import TesterAgent
+        from agents.fixer import FixerAgent
+        
         self.bug_analyzer = BugAnalyzerAgent(self.llm_config)
         self.code_reviewer = CodeReviewerAgent(self.llm_config)
         self.tester = TesterAgent(self.llm_config)
@@ -72,7 +273,7 @@ class BugFixingSystem:
             5. Final validation and testing
             
             Always ensure each step is completed before moving to the next.
-            """,
+            """ + result_block_instructions("validation"),
             llm_config=self.llm_config,
             human_input_mode="NEVER"
         )
@@ -88,6 +289,9 @@ class BugFixingSystem:
     
     def _setup_group_chat(self):
         """Setup group chat for agent collaboration"""
+        import autogen
+        from utils.speaker_selector import WorkflowGroupChat, WorkflowSpeakerSelector
+        
         self.agents = [
             self.coordinator,
             self.bug_analyzer.agent,
@@ -97,19 +301,55 @@ class BugFixingSystem:
             self.user_proxy
         ]
         
-        self.group_chat = autogen.GroupChat(
+        group_chat_config = self.config.get('group_chat_config', {})
+        
+        # Follow the Coordinator's workflow deterministically and only ask the
+        # LLM to pick a speaker when the next step is ambiguous
+        self.speaker_selector = None
+        if group_chat_config.get('speaker_selection', 'workflow') == 'workflow':
+            self.speaker_selector = WorkflowSpeakerSelector()
+        
+        self.group_chat = WorkflowGroupChat(
             agents=self.agents,
             messages=[],
-            max_round=20,
-            speaker_selection_method="auto"
+            max_round=group_chat_config.get('max_round', 20),
+            speaker_selection_method="auto",
+            speaker_selector=self.speaker_selector
+        )
+        
+        # Stop as soon as the fix is validated, on loops, or when over budget
+        termination_config = self.config.get('termination_config', {})
+        self.termination = TerminationController(
+            self.code_executor,
+            validate_fix=termination_config.get('validate_fix', True),
+            max_tokens=termination_config.get('max_tokens'),
+            max_seconds=termination_config.get('max_seconds'),
+            duplicate_threshold=termination_config.get('duplicate_threshold', 0.95),
+            duplicate_window=termination_config.get('duplicate_window', 4)
         )
         
         self.group_chat_manager = autogen.GroupChatManager(
             groupchat=self.group_chat,
-            llm_config=self.llm_config
+            llm_config=self.llm_config,
+            is_termination_msg=self.termination
         )
+        for agent in self.agents + [self.group_chat_manager]:
+            self._register_llm_client(agent)
+        
+        # Dedupe repeated code and summarize old turns before each agent replies
+        compaction_config = self.config.get('compaction_config', {})
+        self.history_compactor = None
+        if compaction_config.get('enabled', True):
+            self.history_compactor = HistoryCompactor(
+                max_tokens=compaction_config.get('max_tokens', 6000),
+                keep_recent=compaction_config.get('keep_recent', 4),
+                summary_chars=compaction_config.get('summary_chars', 300)
+            )
+            for agent in self.agents:
+                if agent.llm_config:
+                    agent.register_hook("process_all_messages_before_reply", self.history_compactor)
     
-    def fix_bug(self, bug_report: Dict[str, Any]) -> Dict[str, Any]:
+    def fix_bug(self, bug_report: Dict[str, Any], checkpoints: Optional[Any] = None) -> FixResult:
         """
         Main bug fixing workflow
         
@@ -120,27 +360,106 @@ class BugFixingSystem:
                 - stack_trace: Stack trace (optional)
                 - test_input: Input that caused the bug (optional)
                 - expected_output: Expected result (optional)
+                - full_context: Send the whole file instead of a slice (optional)
+                - project_root: Directory the project is imported from, for
+                  cross-module context (optional; found from the packages above file_path)
+            checkpoints: Optional stage store with ``load()`` and ``save(stage, data)``
+                (e.g. utils.job_queue.StageCheckpoints). Stages saved by an
+                earlier, interrupted attempt are skipped.
         
         Returns:
-            Dictionary with fix results and analysis
+            FixResult with the extracted sections, a per-stage latency and
+            token breakdown under "metrics", and the path of the compressed
+            conversation transcript
         """
+        tracer = Tracer(run_id=uuid.uuid4().hex)
+        return self._traced(tracer, "fix_bug", lambda: self._run_fix(bug_report, tracer, checkpoints))
+    
+    def _traced(self, tracer: Tracer, name: str, run: Callable[[], FixResult]) -> FixResult:
+        """Run a fix under tracer, then attach and export its metrics"""
+        with use_tracer(tracer):
+            with tracer.span(name, "run"):
+                result = run()
+        
+        result["metrics"] = tracer.breakdown()
+        self.metrics.observe(tracer, result.get("status", "error"), result.get("resolved_by"))
+        jsonl_path = self.config.get('metrics_config', {}).get('jsonl_path')
+        if jsonl_path:
+            tracer.export_jsonl(jsonl_path)
+        return result
+    
+    def _run_fix(self, bug_report: Dict[str, Any], tracer: Tracer, checkpoints: Optional[Any] = None) -> FixResult:
+        """Run the bug fixing workflow for fix_bug, recording spans on tracer"""
         print("🐛 Starting Bug Fixing Process...")
+        stages = checkpoints.load() if checkpoints is not None else {}
+        
+        def save(stage: str, data: Any):
+            if checkpoints is not None:
+                checkpoints.save(stage, data)
+        
+        if 'snapshot' in stages:
+            # Resuming: put the file back the way the first attempt found it
+            snapshot_id = stages['snapshot']
+            self.snapshots.restore(snapshot_id, [bug_report['file_path']])
+            print(f"⏯️  Resuming after {', '.join(stages)} from snapshot {snapshot_id}")
         
         # Read the buggy file
         file_content = self.file_handler.read_file(bug_report['file_path'])
         if not file_content or "Error reading file" in file_content:
-            return {"error": f"Could not read file: {bug_report['file_path']}"}
+            return FixResult(tracer.run_id, error=f"Could not read file: {bug_report['file_path']}")
+        
+        if 'snapshot' not in stages:
+            # Snapshot the file so any attempt can be rolled back
+            with tracer.span("snapshot", "prepare"):
+                snapshot_id = self.snapshots.snapshot([bug_report['file_path']], label=f"before fix_bug: {bug_report['file_path']}")
+            save('snapshot', snapshot_id)
+            print(f"📁 Created snapshot: {snapshot_id}")
+        
+        # Fast paths that skip the agents entirely when their fix validates:
+        # rule-based guards for mechanical bugs, then remembered fixes
+        fast_result = stages.get('fast_paths', {}).get('fields')
+        if 'fast_paths' not in stages:
+            for fast_path in (self._apply_static_fix, self._apply_fix_memory):
+                fast_result = fast_path(bug_report, file_content, tracer)
+                if fast_result is not None:
+                    break
+            save('fast_paths', {'fields': fast_result})
+        if fast_result is not None:
+            return FixResult(tracer.run_id, status="success", snapshot_id=snapshot_id, **fast_result)
         
-        # Create backup
-        backup_path = self.file_handler.backup_file(bug_report['file_path'])
-        print(f"📁 Created backup: {backup_path}")
+        # Only ship the code on the stack trace path unless the full file is requested
+        if 'slice_context' in stages:
+            code_context = stages['slice_context']
+        else:
+            if bug_report.get('full_context'):
+                code_context = {'context': file_content, 'functions': [], 'sliced': False, 'reason': "requested"}
+            else:
+                with tracer.span("slice_context", "prepare"):
+                    code_context = self.context_slicer.slice(
+                        file_content,
+                        bug_report['file_path'],
+                        bug_report.get('stack_trace', ''),
+                        hints=[bug_report.get('error_message', ''), bug_report.get('test_input', '')]
+                    )
+            # The agents only see this file, so add what the bug runs through elsewhere
+            self._add_related_definitions(bug_report, file_content, code_context, tracer)
+            save('slice_context', code_context)
+        
+        if code_context['sliced']:
+            print(f"✂️  Sliced context to: {', '.join(code_context['functions'])}")
+            context_header = (
+                f"Relevant code (sliced from the full file; if you need the rest, "
+                f"ask UserProxy to run `print(open({os.path.abspath(bug_report['file_path'])!r}).read())`):"
+            )
+        else:
+            context_header = "File content:"
         
         # Prepare bug information
         bug_info = {
             'file_path': bug_report['file_path'],
             'error_message': bug_report.get('error_message', ''),
             'stack_trace': bug_report.get('stack_trace', ''),
-            'code_snippet': file_content,
+            'code_snippet': code_context['context'],
             'input_data': bug_report.get('test_input', ''),
             'expected_output': bug_report.get('expected_output', ''),
             'actual_output': bug_report.get('actual_output', '')
@@ -159,66 +478,751 @@ class BugFixingSystem:
         4. Implement a proper fix
         5. Validate the solution
         
-        File content:
+        {context_header}
         ```
-        {file_content}
+        {code_context['context']}
         ```
         """
         
+        # Analysis, review and test generation do not depend on each other, so
+        # they run concurrently and feed a single fix step; the group chat only
+        # runs when that fix does not pass the generated tests
+        pipeline_config = self.config.get('pipeline_config', {})
+        if pipeline_config.get('enabled', True) and 'chat' not in stages:
+            result = self._run_pipeline(tracer, bug_info, file_content, snapshot_id, stages.get('pipeline', {}),
+                                        on_complete=lambda outputs: save('pipeline', outputs))
+            if result['status'] == 'success' or not pipeline_config.get('fallback_to_chat', True):
+                return result
+            print(f"↩️  {result['error']}; falling back to the group chat")
+        
+        # A retried queue job carries on with the chat its previous attempt checkpointed
+        chat_id = stages.get('chat')
+        if chat_id and self.chat_checkpoints is not None and self.chat_checkpoints.exists(chat_id):
+            return self._resume_chat(chat_id, tracer)
+        save('chat', tracer.run_id)
+        
+        context = {'bug_report': bug_report, 'file_content': file_content, 'snapshot_id': snapshot_id}
+        return self._run_chat(tracer, tracer.run_id, context, initial_message=initial_message)
+    
+    def _run_pipeline(self, tracer: Tracer, bug_info: Dict[str, Any], file_content: str, snapshot_id: str,
+                      completed: Dict[str, Any], on_complete: Callable[[Dict[str, Any]], None]) -> FixResult:
+        """Run analysis, review and tests concurrently, then the fix and its validation"""
+        module_name = os.path.splitext(os.path.basename(bug_info['file_path']))[0]
+        code = bug_info['code_snippet']
+        bug_context = (
+            f"Error: {bug_info['error_message'] or 'No error message provided'}\n"
+            f"Input: {bug_info['input_data']}\n"
+            f"Expected: {bug_info['expected_output']}"
+        )
+        
+        def last_code(reply: str) -> str:
+            blocks = parse_message(reply or "")["code"]
+            return blocks[-1] if blocks else ""
+        
+        def ask(agent, prompt: str) -> str:
+            # Stages count against the same LLM call limit as group chats
+            with self.llm_slots:
+                return self._ask_reply(agent, prompt)
+        
+        def analysis(inputs):
+            return ask(self.bug_analyzer.agent, self.bug_analyzer.create_analysis_prompt(bug_info))
+        
+        def review(inputs):
+            return ask(self.code_reviewer.agent, self.code_reviewer.create_review_prompt(code, bug_context))
+        
+        def tests(inputs):
+            prompt = self.tester.create_test_prompt(
+                code, f"{bug_context}\nThe module is importable as `{module_name}`."
+            )
+            return ask(self.tester.agent, prompt)
+        
+        def fix(inputs):
+            bug_analysis = f"{inputs['analysis']}\n\n**Code Review:**\n{inputs['review']}"
+            prompt = self.fixer.create_fix_prompt(bug_analysis, file_content, last_code(inputs['tests']))
+            prompt += "\nReturn the complete fixed module in a single ```python block."
+            return ask(self.fixer.agent, prompt)
+        
+        def validate(inputs):
+            fixed_code = last_code(inputs['fix'])
+            if not fixed_code:
+                raise ValueError("the fix reply has no code block")
+            tournament = FixTournament(self.code_executor, max_workers=1)
+            return tournament.run(file_content, [fixed_code], module_name, last_code(inputs['tests']))["best"]
+        
+        pipeline_config = self.config.get('pipeline_config', {})
+        dag = DagExecutor(max_workers=pipeline_config.get('max_workers', 3))
+        dag.add("analysis", analysis).add("review", review).add("tests", tests)
+        dag.add("fix", fix, deps=("analysis", "review", "tests"))
+        dag.add("validate", validate, deps=("fix", "tests"))
+        
+        print("🔀 Running analysis, review and test generation in parallel")
+        saved = dict(completed)
+        
+        def stage_done(name: str, output: Any):
+            saved[name] = output
+            on_complete(saved)
+        
+        # Stages call the agents directly on DAG threads, outside the group chat, so
+        # observers (e.g. fix_bug_stream's EventStream) are hooked in here
+        with observe_turns(self.agents, self.turn_observers):
+            outputs = dag.run(completed, on_complete=stage_done)
+        report = dag.report()
+        print(f"⏱️  Pipeline took {report['wall_seconds']:.1f}s "
+              f"(stages back to back: {report['sequential_seconds']:.1f}s)")
+        
+        extractor = ResultExtractor()
+        for stage, agent in (("analysis", self.bug_analyzer.agent), ("review", self.code_reviewer.agent),
+                             ("tests", self.tester.agent), ("fix", self.fixer.agent)):
+            if outputs.get(stage):
+                extractor.feed({"name": agent.name, "content": outputs[stage]})
+        sections = extractor.results()
+        
+        best = outputs.get("validate")
+        validated = bool(best and best["tests_passed"])
+        recorded = 0
+        if best:
+            sections["validation"] = (
+                f"Generated tests {'passed' if validated else 'failed'}.\n{best.get('output', '')}"
+            )
+            if validated and self.fix_memory is not None:
+                recorded = self.fix_memory.record(bug_info['error_message'], file_content, best["code"])
+        
+        error = None
+        if not validated:
+            error = "; ".join(f"{stage}: {message}" for stage, message in dag.errors.items()) or \
+                    "pipeline fix did not pass the generated tests"
+        return FixResult(
+            tracer.run_id,
+            status="success" if validated else "error",
+            error=error,
+            snapshot_id=snapshot_id,
+            sections=sections,
+            structured_results=extractor.structured(),
+            result_errors=extractor.errors,
+            pipeline=report,
+            cache=self.response_cache.stats() if self.response_cache else {},
+            llm_client=dict(self.llm_transport.stats) if self.llm_transport else {},
+            fix_memory={"used": False, "recorded": recorded},
+            resolved_by="pipeline" if validated else None
+        )
+    
+    def _run_chat(self, tracer: Tracer, checkpoint_id: str, context: Dict[str, Any],
+                  initial_message: Optional[str] = None,
+                  resume_state: Optional[Dict[str, Any]] = None) -> FixResult:
+        """Run the group chat (or continue a checkpointed one) and collect its results"""
+        bug_report = context['bug_report']
+        checkpointer = None
         try:
-            # Start group chat
-            self.user_proxy.initiate_chat(
-                self.group_chat_manager,
-                message=initial_message,
-                clear_history=True
+            # Start group chat, timing every round and attributing tokens per role
+            turn_tracer = TurnTracer(tracer, executor_name=self.user_proxy.name)
+            turn_tracer.track(self.group_chat_manager)
+            # Result sections are parsed once per message as the chat runs
+            extractor = ResultExtractor()
+            # Tokens spent before a resume still count against the budget
+            prior_tokens = resume_state['termination']['tokens'] if resume_state else 0
+            self.termination.start(
+                module_name=os.path.splitext(os.path.basename(bug_report['file_path']))[0],
+                token_counter=lambda: prior_tokens + sum(usage['total_tokens'] for usage in tracer.tokens.values())
             )
+            observers = self.turn_observers + [turn_tracer, extractor]
+            if self.chat_checkpoints is not None:
+                checkpoint_config = self.config.get('chat_checkpoint_config', {})
+                checkpointer = ChatCheckpointer(
+                    self.chat_checkpoints, checkpoint_id, self.group_chat, context, self.termination,
+                    snapshots=self.snapshots if checkpoint_config.get('snapshot_files', True) else None,
+                    paths=[bug_report['file_path']]
+                )
+                observers.append(checkpointer)
+            with self.llm_slots, observe_turns(self.agents, observers):
+                if resume_state is None:
+                    if checkpointer is not None:
+                        checkpointer.start(self.user_proxy.name, initial_message)
+                    self.user_proxy.initiate_chat(
+                        self.group_chat_manager,
+                        message=initial_message,
+                        clear_history=True
+                    )
+                else:
+                    self._continue_chat(resume_state, extractor, checkpointer)
+            turn_tracer.finish()
+            if checkpointer is not None:
+                checkpointer.finish()
             
-            # Process the conversation and extract results
-            results = self._process_results(bug_report['file_path'])
+            recorded = 0
+            if self.fix_memory is not None and self.termination.validated_code:
+                recorded = self.fix_memory.record(
+                    bug_report.get('error_message', ''), context['file_content'], self.termination.validated_code
+                )
             
-            return {
-                "status": "success",
-                "backup_path": backup_path,
-                "results": results,
-                "conversation_history": self.group_chat.messages
-            }
+            return FixResult(
+                tracer.run_id,
+                status="success",
+                snapshot_id=context['snapshot_id'],
+                sections=extractor.results(),
+                structured_results=extractor.structured(),
+                result_errors=extractor.errors,
+                termination=self.termination.report(),
+                speaker_selection=self.speaker_selector.stats() if self.speaker_selector else {},
+                cache=self.response_cache.stats() if self.response_cache else {},
+                llm_client=dict(self.llm_transport.stats) if self.llm_transport else {},
+                compaction=dict(self.history_compactor.stats) if self.history_compactor else {},
+                fix_memory={"used": False, "recorded": recorded},
+                resolved_by="agents",
+                transcript_path=self._spill_transcript(tracer.run_id)
+            )
             
         except Exception as e:
             print(f"❌ Error during bug fixing: {str(e)}")
-            return {
-                "status": "error",
-                "error": str(e),
-                "backup_path": backup_path
-            }
+            checkpoint_path = None
+            if checkpointer is not None and self.chat_checkpoints.exists(checkpoint_id):
+                checkpoint_path = checkpointer.path
+                print(f"💾 Checkpointed up to round {checkpointer.written + 1}; "
+                      f"continue with resume({checkpoint_id!r})")
+            return FixResult(
+                tracer.run_id,
+                error=str(e),
+                snapshot_id=context['snapshot_id'],
+                termination=self.termination.report(),
+                transcript_path=self._spill_transcript(tracer.run_id),
+                checkpoint_path=checkpoint_path
+            )
+    
+    def resume(self, run_id: str) -> FixResult:
+        """
+        Continue a failed fix_bug run from its last completed round
+        
+        The group chat messages, speaker and termination state and the
+        buggy file are restored from the run's checkpoint, so rounds that
+        already finished are not paid for again.
+        
+        Args:
+            run_id: run_id of the failed FixResult (see chat_checkpoints.list_runs())
+        
+        Returns:
+            FixResult, as from fix_bug
+        """
+        if self.chat_checkpoints is None or not self.chat_checkpoints.exists(run_id):
+            return FixResult(run_id, error=f"No checkpoint for run {run_id}")
+        tracer = Tracer(run_id=run_id)
+        return self._traced(tracer, "resume", lambda: self._resume_chat(run_id, tracer))
+    
+    def _resume_chat(self, checkpoint_id: str, tracer: Tracer) -> FixResult:
+        state = self.chat_checkpoints.load(checkpoint_id)
+        print(f"⏯️  Resuming chat {checkpoint_id} at round {state['round']}")
+        if state['files_snapshot']:
+            with tracer.span("restore_files", "prepare"):
+                self.snapshots.restore(state['files_snapshot'], [state['bug_report']['file_path']])
+        context = {key: state[key] for key in ('bug_report', 'file_content', 'snapshot_id')}
+        return self._run_chat(tracer, checkpoint_id, context, resume_state=state)
     
-    def _process_results(self, file_path: str) -> Dict[str, Any]:
-        """Process conversation results and extract key information"""
-        messages = self.group_chat.messages
+    def _continue_chat(self, state: Dict[str, Any], extractor: ResultExtractor,
+                       checkpointer: Optional[ChatCheckpointer]):
+        """Replay a checkpoint into the agents, post its pending reply and let the chat carry on"""
+        manager = self.group_chat_manager
+        self.group_chat.messages.clear()
+        for agent in self.agents + [manager]:
+            agent.clear_history()
         
-        results = {
-            "analysis": "",
-            "review": "",
-            "tests": "",
-            "fix": "",
-            "validation": ""
+        # Same bookkeeping as GroupChatManager.run_chat: each message is sent to
+        # the manager, appended to the group chat and broadcast to the others
+        for message in state['messages']:
+            speaker = self.group_chat.agent_by_name(message['name'])
+            speaker.send(message['content'], manager, request_reply=False, silent=True)
+            posted = manager.last_message(speaker)
+            self.group_chat.append(posted, speaker)
+            for agent in self.group_chat.agents:
+                if agent != speaker:
+                    manager.send(posted, agent, request_reply=False, silent=True)
+        
+        if self.speaker_selector is not None and state.get('selector'):
+            self.speaker_selector.set_state(state['selector'])
+        self.termination.set_state(state['termination'])
+        # The opening message is not an agent turn, so the extractor never sees it
+        extractor.feed_all((state['messages'] + [state['pending']])[1:])
+        
+        pending = state['pending']
+        speaker = self.group_chat.agent_by_name(pending['name'])
+        if checkpointer is not None:
+            checkpointer.files_snapshot = state['files_snapshot']
+            checkpointer.start(speaker.name, pending['content'])
+        speaker.send(pending['content'], manager, request_reply=False, silent=True)
+        
+        max_round = self.group_chat.max_round
+        self.group_chat.max_round = max(1, max_round - len(state['messages']))
+        try:
+            manager.run_chat(messages=[manager.last_message(speaker)], sender=speaker, config=self.group_chat)
+        finally:
+            self.group_chat.max_round = max_round
+    
+    def _apply_static_fix(self, bug_report: Dict[str, Any], file_content: str,
+                          tracer: Tracer) -> Optional[Dict[str, Any]]:
+        """Validate rule-based guard fixes; FixResult fields for the first that passes"""
+        static_config = self.config.get('static_fix_config', {})
+        if not static_config.get('enabled', True):
+            return None
+        with tracer.span("rules", "static_fix"):
+            matches = StaticFixer().candidates(bug_report, file_content,
+                                               limit=static_config.get('max_candidates', 4))
+        best = self._validate_fast_path(bug_report, file_content, [match["code"] for match in matches],
+                                        "static_fix", f"{len(matches)} static guard fix(es)")
+        if best is None:
+            return None
+        
+        match = matches[best["index"]]
+        summary = f"Added a guard ({match['rule']}) to {match['function']}"
+        print(f"⚡ {summary}, no LLM calls needed")
+        return self._fast_path_fields(best, summary, match["function"], resolved_by="static",
+                                      static_fix={"rule": match["rule"], "function": match["function"],
+                                                  "guard": match["guard"], "candidates": len(matches)})
+    
+    def project_index(self, root: str) -> ProjectIndex:
+        """
+        Import graph and symbol index of the project under root, brought up to date
+        
+        Indexes live for the life of the system and are persisted under
+        project_index_config.index_dir, so each call only re-parses the files
+        changed since the last one.
+        
+        Args:
+            root: Directory the project's modules are imported from
+        
+        Returns:
+            The ProjectIndex for root
+        """
+        project_config = self.config.get('project_index_config', {})
+        root = os.path.abspath(root)
+        with self._project_lock:
+            index = self._project_indexes.get(root)
+            if index is None:
+                db_name = hashlib.sha256(root.encode('utf-8')).hexdigest()[:16] + ".db"
+                index = ProjectIndex(
+                    self.file_handler, root,
+                    os.path.join(project_config.get('index_dir', '.cache/project_index'), db_name),
+                    rescan_seconds=project_config.get('rescan_seconds', 30)
+                )
+                self._project_indexes[root] = index
+            index.update()
+        return index
+    
+    def _add_related_definitions(self, bug_report: Dict[str, Any], file_content: str,
+                                 code_context: Dict[str, Any], tracer: Tracer):
+        """Append definitions from other project modules on the bug's traceback path to code_context"""
+        project_config = self.config.get('project_index_config', {})
+        if not project_config.get('enabled', True):
+            return
+        root = bug_report.get('project_root') or project_config.get('root') or project_root(bug_report['file_path'])
+        with tracer.span("project_index", "prepare"):
+            related = self.project_index(root).related_definitions(
+                bug_report['file_path'],
+                file_content,
+                bug_report.get('stack_trace', ''),
+                roots=code_context['functions'],
+                limit=project_config.get('max_definitions', 8)
+            )
+        if not related:
+            return
+        
+        code_context['related'] = [f"{definition['path']}:{definition['qualname']}" for definition in related]
+        blocks = [
+            f"# {definition['path']}:{definition['line_start']}-{definition['line_end']} "
+            f"{definition['qualname']} ({definition['reason']})\n{definition['code']}"
+            for definition in related
+        ]
+        code_context['context'] += "\n\n# Related definitions from other project modules\n" + "\n\n".join(blocks)
+        print(f"🔗 Pulled in {len(related)} definitions from other modules: {', '.join(code_context['related'])}")
+    
+    def _apply_fix_memory(self, bug_report: Dict[str, Any], file_content: str,
+                          tracer: Tracer) -> Optional[Dict[str, Any]]:
+        """Validate remembered fixes for the faulting functions; FixResult fields for the first that passes"""
+        if self.fix_memory is None or not len(self.fix_memory):
+            return None
+        
+        file_path = bug_report['file_path']
+        error_message = bug_report.get('error_message', '')
+        memory_config = self.config.get('fix_memory_config', {})
+        candidates, matches = [], []
+        with tracer.span("lookup", "fix_memory"):
+            functions = faulting_functions(file_content, file_path, bug_report.get('stack_trace', ''),
+                                           hints=[error_message, bug_report.get('test_input', '')])
+            symbols = {symbol.qualname: symbol for symbol in outer_functions(file_content)}
+            for function_name in functions:
+                source = function_source(file_content, symbols[function_name])
+                for pattern in self.fix_memory.lookup(error_message, source,
+                                                      top_k=memory_config.get('top_k', 3),
+                                                      min_similarity=memory_config.get('min_similarity', 0.75)):
+                    code = self.fix_memory.apply(pattern, file_content, function_name)
+                    if code and code not in candidates:
+                        candidates.append(code)
+                        matches.append((pattern, function_name))
+        candidates = candidates[:memory_config.get('max_candidates', 4)]
+        best = self._validate_fast_path(bug_report, file_content, candidates,
+                                        "fix_memory", f"{len(candidates)} remembered fix(es)")
+        if best is None:
+            return None
+        
+        pattern, function_name = matches[best["index"]]
+        self.fix_memory.mark_applied(pattern["id"])
+        summary = f"Re-applied remembered fix pattern #{pattern['id']} to {function_name}"
+        print(f"✅ {summary} (similarity {pattern['similarity']:.2f}), no LLM calls needed")
+        return self._fast_path_fields(best, summary, function_name, resolved_by="fix_memory",
+                                      fix_memory={"used": True, "pattern_id": pattern["id"],
+                                                  "similarity": pattern["similarity"],
+                                                  "function": function_name, "candidates": len(candidates)})
+    
+    def _validate_fast_path(self, bug_report: Dict[str, Any], file_content: str, candidates: List[str],
+                            span_name: str, description: str) -> Optional[Dict[str, Any]]:
+        """Run the reproduction test against candidate fixes; the best passing candidate or None"""
+        if not candidates:
+            return None
+        module_name = os.path.splitext(os.path.basename(bug_report['file_path']))[0]
+        # Without a reproduction there is nothing to validate against, so the agents handle it
+        test_code = reproduction_test(module_name, bug_report.get('test_input', ''),
+                                      bug_report.get('error_message', ''))
+        if not test_code:
+            return None
+        
+        print(f"🧪 Validating {description}")
+        tournament = FixTournament(self.code_executor, max_workers=len(candidates))
+        with trace_span(span_name, "validate"):
+            best = tournament.run(file_content, candidates, module_name, test_code)["best"]
+        if best is None or not best["tests_passed"]:
+            print(f"❌ No {span_name.replace('_', ' ')} candidate passed validation")
+            return None
+        best["test_code"] = test_code
+        return best
+    
+    @staticmethod
+    def _fast_path_fields(best: Dict[str, Any], summary: str, function_name: str,
+                          **fields: Any) -> Dict[str, Any]:
+        """FixResult fields for a fix validated without the agents"""
+        return {
+            "sections": {
+                "fix": f"{summary}:\n```python\n{best['code']}```",
+                "tests": f"```python\n{best['test_code']}```",
+                "validation": f"Reproduction test passed.\n{best['output']}"
+            },
+            "structured_results": {
+                "fix": {"result": {"section": "fix", "change_summary": summary,
+                                   "functions_changed": [function_name]}, "code": best["code"]}
+            },
+            **fields
         }
+    
+    def _spill_transcript(self, run_id: str) -> Optional[str]:
+        """Write the finished conversation to disk and drop it from the agents' memory"""
+        path = None
+        if self.transcripts is not None and self.group_chat.messages:
+            path = self.transcripts.write(run_id, self.group_chat.messages)
+        self.group_chat.messages.clear()
+        for agent in self.agents + [self.group_chat_manager]:
+            agent.clear_history()
+        return path
+    
+    def fix_bug_candidates(self, bug_report: Dict[str, Any], num_candidates: Optional[int] = None,
+                           apply: bool = False) -> Dict[str, Any]:
+        """
+        Generate several candidate fixes at once and keep the one that validates best
         
-        # Extract information from conversation
-        for message in messages:
-            sender = message.get("name", "")
-            content = message.get("content", "")
+        Instead of iterating in the group chat, K fixer requests (each at a
+        different temperature) and, if needed, one test generation request run
+        concurrently. The candidates are then tested and linted in parallel in
+        scratch directories and ranked by tests passed, diff size and lint issues.
+        
+        Args:
+            bug_report: Bug report dictionary (see fix_bug). Optional keys:
+                - analysis: Bug analysis to base the fixes on
+                - test_code: Pytest source to validate against (generated if missing)
+            num_candidates: Number of candidate fixes to request
+            apply: Write the winning fix to file_path (after a snapshot)
+        
+        Returns:
+            Dictionary with the best fix and every candidate's validation result
+        """
+        tracer = Tracer()
+        with use_tracer(tracer):
+            with tracer.span("fix_bug_candidates", "run"):
+                result = self._run_candidates(bug_report, num_candidates, apply, tracer)
+        
+        result["metrics"] = tracer.breakdown()
+        self.metrics.observe(tracer, result.get("status", "error"))
+        return result
+    
+    def _run_candidates(self, bug_report: Dict[str, Any], num_candidates: Optional[int],
+                        apply: bool, tracer: Tracer) -> Dict[str, Any]:
+        """Generate and rank candidate fixes for fix_bug_candidates"""
+        candidate_config = self.config.get('candidate_config', {})
+        if num_candidates is None:
+            num_candidates = candidate_config.get('num_candidates', 4)
+        
+        file_path = bug_report['file_path']
+        file_content = self.file_handler.read_file(file_path)
+        if not file_content or "Error reading file" in file_content:
+            return {"status": "error", "error": f"Could not read file: {file_path}"}
+        module_name = os.path.splitext(os.path.basename(file_path))[0]
+        
+        bug_analysis = bug_report.get('analysis') or (
+            f"Error: {bug_report.get('error_message', 'No error message provided')}\n"
+            f"Stack trace:\n{bug_report.get('stack_trace', '')}\n"
+            f"Input: {bug_report.get('test_input', '')}\n"
+            f"Expected: {bug_report.get('expected_output', '')}"
+        )
+        test_code = bug_report.get('test_code', '')
+        
+        # Spread temperatures so candidates differ (and do not share cache entries)
+        base_temperature = self.llm_config.get('temperature', 0.1)
+        step = candidate_config.get('temperature_step', 0.2)
+        temperatures = [round(min(1.0, base_temperature + step * i), 2) for i in range(num_candidates)]
+        print(f"🎯 Generating {num_candidates} candidate fixes (temperatures: {temperatures})")
+        
+        from agents.tester import TesterAgent
+        from agents.fixer import FixerAgent
+        
+        with ThreadPoolExecutor(max_workers=num_candidates + 1) as pool:
+            tests_future = None
+            if not test_code:
+                tester = TesterAgent(self.llm_config)
+                self._register_llm_client(tester.agent)
+                tests_prompt = tester.create_test_prompt(
+                    file_content, f"{bug_analysis}\nThe module is importable as `{module_name}`."
+                )
+                tests_future = pool.submit(contextvars.copy_context().run, self._ask, tester.agent, tests_prompt)
             
-            if sender == "BugAnalyzer" and "analysis" in content.lower():
-                results["analysis"] = content
-            elif sender == "CodeReviewer" and "review" in content.lower():
-                results["review"] = content
-            elif sender == "Tester" and ("test" in content.lower() or "pytest" in content.lower()):
-                results["tests"] = content
-            elif sender == "BugFixer" and "fix" in content.lower():
-                results["fix"] = content
+            fix_futures = []
+            for temperature in temperatures:
+                fixer = FixerAgent({**self.llm_config, "temperature": temperature})
+                self._register_llm_client(fixer.agent)
+                prompt = fixer.create_fix_prompt(bug_analysis, file_content, test_code)
+                prompt += "\nReturn the complete fixed module in a single ```python block."
+                fix_futures.append(pool.submit(contextvars.copy_context().run, self._ask, fixer.agent, prompt))
+            
+            candidates = [future.result() for future in fix_futures]
+            if tests_future is not None:
+                test_code = tests_future.result() or ""
+        
+        tournament = FixTournament(self.code_executor, max_workers=candidate_config.get('max_workers', num_candidates))
+        with tracer.span("tournament", "validate"):
+            outcome = tournament.run(file_content, candidates, module_name, test_code)
+        best = outcome["best"]
+        
+        if best is None:
+            print("❌ No candidate produced a usable fix")
+        else:
+            print(f"🏆 Candidate {best['index']} wins (tests passed: {best['tests_passed']}, "
+                  f"diff: {best['diff_size']} lines, lint issues: {best['lint_issues']})")
+        
+        if self.fix_memory is not None and best is not None and best["tests_passed"]:
+            self.fix_memory.record(bug_report.get('error_message', ''), file_content, best["code"])
+        
+        snapshot_id = None
+        if apply and best is not None and best["tests_passed"]:
+            snapshot_id = self.snapshots.snapshot([file_path], label=f"before candidate {best['index']}")
+            self.file_handler.write_file(file_path, best["code"])
+            print(f"✅ Applied candidate {best['index']} to {file_path} (snapshot: {snapshot_id})")
+        
+        return {
+            "status": "success" if best is not None and best["tests_passed"] else "no_passing_candidate",
+            "best": best,
+            "candidates": outcome["candidates"],
+            "test_code": test_code,
+            "temperatures": temperatures,
+            "snapshot_id": snapshot_id
+        }
+    
+    @staticmethod
+    def _ask_reply(agent: "autogen.ConversableAgent", prompt: str) -> str:
+        """Single-turn request to an agent, returning its reply text"""
+        before = TurnTracer.usage(agent)
+        with trace_span(agent.name, "llm"):
+            reply = agent.generate_reply(messages=[{"role": "user", "content": prompt}])
+        tracer = current_tracer()
+        if tracer is not None:
+            after = TurnTracer.usage(agent)
+            tracer.add_tokens(agent.name, after[0] - before[0], after[1] - before[1])
+        content = reply.get("content") if isinstance(reply, dict) else reply
+        return content or ""
+    
+    @staticmethod
+    def _ask(agent: "autogen.ConversableAgent", prompt: str) -> Optional[str]:
+        """Single-turn request to an agent, returning the last python block of its reply"""
+        code = parse_message(BugFixingSystem._ask_reply(agent, prompt))["code"]
+        return code[-1] if code else None
+    
+    def rollback(self, snapshot_id: str, paths: Optional[List[str]] = None) -> List[str]:
+        """
+        Restore files to the state recorded in a snapshot (e.g. result["snapshot_id"])
+        
+        Returns:
+            Paths that were rewritten
+        """
+        restored = self.snapshots.restore(snapshot_id, paths)
+        print(f"⏪ Restored {len(restored)} file(s) from snapshot {snapshot_id}")
+        return restored
+    
+    def fix_bugs(self, bug_reports: List[Dict[str, Any]], max_concurrency: Optional[int] = None,
+                 on_result: Optional[Callable[[int, FixResult], None]] = None) -> List[FixResult]:
+        """
+        Fix several independent bug reports concurrently
+        
+        Each report runs in its own copy of the agent team and group chat, so
+        conversations never share state. At most ``max_concurrency`` reports
+        are processed at once, and at most ``batch_config.max_concurrency`` LLM
+        calls (group chats or pipeline stages, across all reports) are in
+        flight at any time.
+        
+        Args:
+            bug_reports: List of bug report dictionaries (see fix_bug)
+            max_concurrency: Maximum number of reports processed in parallel
+            on_result: Optional callback invoked as ``on_result(index, result)``
+                as soon as each report finishes
         
+        Returns:
+            List of fix results in the same order as bug_reports
+        """
+        if max_concurrency is None:
+            max_concurrency = self.config.get('batch_config', {}).get('max_concurrency', 4)
+        max_concurrency = max(1, min(max_concurrency, len(bug_reports) or 1))
+        
+        results: List[Optional[FixResult]] = [None] * len(bug_reports)
+        print(f"📦 Fixing {len(bug_reports)} bug reports (max concurrency: {max_concurrency})")
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = {
+                pool.submit(self._fix_bug_isolated, report): index
+                for index, report in enumerate(bug_reports)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = FixResult(error=str(e))
+                results[index] = result
+                if on_result:
+                    on_result(index, result)
+        
+        without_llm = [r for r in results if r.get('resolved_by') in NO_LLM_PATHS]
+        if results:
+            print(f"⚡ Resolved {len(without_llm)}/{len(results)} reports without LLM calls "
+                  f"({len(without_llm) / len(results):.0%})")
         return results
     
+    def scan_repository(self, root: str, fix: bool = False, max_files_to_fix: Optional[int] = None,
+                        max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Triage a whole source tree without the LLM, optionally fixing the worst files
+        
+        Every Python file is executed and linted; files unchanged since the
+        last scan are skipped using the scan manifest. Only failing files are
+        handed to the agents, worst first.
+        
+        Args:
+            root: Directory to scan
+            fix: Send failing files to fix_bugs after scanning
+            max_files_to_fix: Cap on the number of failing files sent to the agents
+            max_concurrency: Passed through to fix_bugs
+        
+        Returns:
+            Scan summary with ranked failing files and, if fix is set, fix results
+        """
+        scan_config = self.config.get('scan_config', {})
+        scanner = RepoScanner(
+            self.file_handler,
+            self.code_executor,
+            manifest_path=scan_config.get('manifest_path', '.cache/scan_manifest.json'),
+            run_modules=scan_config.get('run_modules', True),
+            lint=scan_config.get('lint', True),
+            max_workers=scan_config.get('max_workers', 4)
+        )
+        
+        print(f"🔎 Scanning {root}...")
+        summary = scanner.scan(root)
+        print(f"📊 {summary['scanned']} checked, {summary['skipped']} unchanged, "
+              f"{summary['failing']} failing")
+        
+        if fix and summary['failing_files']:
+            if max_files_to_fix is None:
+                max_files_to_fix = scan_config.get('max_files_to_fix')
+            targets = summary['failing_files'][:max_files_to_fix]
+            summary['fix_results'] = self.fix_bugs(
+                [RepoScanner.to_bug_report(record) for record in targets],
+                max_concurrency=max_concurrency
+            )
+        
+        return summary
+    
+    def _fix_bug_isolated(self, bug_report: Dict[str, Any]) -> FixResult:
+        """Run fix_bug on a private agent team so concurrent runs do not interfere"""
+        # Teams are cleared after every run, so finished ones are reused
+        # instead of rebuilding five agents and a chat manager per report
+        with self._lazy_lock:
+            worker = self._idle_workers.pop() if self._idle_workers else None
+        if worker is None:
+            worker = self._clone_for_run()
+        worker.turn_observers = list(self.turn_observers)
+        try:
+            return worker.fix_bug(bug_report)
+        finally:
+            with self._lazy_lock:
+                self._idle_workers.append(worker)
+    
+    async def fix_bug_stream(self, bug_report: Dict[str, Any]) -> AsyncIterator[FixEvent]:
+        """
+        Run fix_bug and yield progress events as they happen
+        
+        Events cover agent turns starting and finishing, streamed token chunks,
+        code execution by UserProxy and each extracted result section. The last
+        event is always RESULT (carrying the fix_bug result) or ERROR.
+        
+        Args:
+            bug_report: Bug report dictionary (see fix_bug)
+        
+        Yields:
+            FixEvent objects in the order they occurred
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def emit(event: Optional[FixEvent]):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        
+        def run():
+            try:
+                worker = self._clone_for_run(stream=True)
+                stream = EventStream(emit, executor_name=worker.user_proxy.name)
+                worker.turn_observers.append(stream)
+                with stream.capture_stdout():
+                    result = worker.fix_bug(bug_report)
+                emit(FixEvent(RESULT, data=result))
+            except Exception as e:
+                emit(FixEvent(ERROR, data={"error": str(e)}))
+            finally:
+                emit(None)
+        
+        runner = loop.run_in_executor(None, run)
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        await runner
+    
+    def _clone_for_run(self, **llm_overrides: Any) -> "BugFixingSystem":
+        """Copy the system, sharing config and utilities but not agents or chat state"""
+        # Start the shared transport and fix memory first so every copy uses the same ones
+        self._setup_llm_transport()
+        self._setup_fix_memory()
+        worker = copy.copy(self)
+        if llm_overrides:
+            worker.llm_config = {**self.llm_config, **llm_overrides}
+        worker.turn_observers = list(self.turn_observers)
+        worker._lazy_lock = threading.RLock()
+        worker._idle_workers = []
+        worker._reset_agents()
+        worker._build_agents()
+        return worker
+    
     def create_sample_bug(self, file_path: str = "workspace/sample_buggy.py"):
         """Create a sample buggy file for testing"""
         buggy_code = '''
@@ -310,7 +1314,7 @@ ZeroDivisionError: division by zero''',
     
     if results['status'] == 'success':
         print("✅ Bug fixing completed successfully!")
-        print(f"📁 Backup created at: {results['backup_path']}")
+        print(f"📁 Snapshot created: {results['snapshot_id']}")
         
         print("\n🔍 ANALYSIS:")
         print("-" * 40)
@@ -13,7 +13,8 @@ setup(
         "autopep8>=2.0.4",
         "flake8>=6.1.0",
         "pytest>=7.4.3",
-        "black>=23.12.1"
+        "black>=23.12.1",
+        "numpy>=1.24"
     ],
     author="Your Name",
     author_email="your.email@example.com",
@@ -26,5 +27,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 )
@@ -0,0 +1,82 @@
+from utils.ast_index import ASTCache, ModuleIndex
+from utils.file_handler import CodeAnalyzer
+
+SOURCE = '''import asyncio
+
+
+def outer(x):
+    def inner(y):
+        return y * 2
+
+    value = inner(x)
+    return value
+
+
+class Account:
+    rate = 0.1
+
+    def interest(self, amount):
+        return amount * self.rate
+
+    async def refresh(self):
+        await asyncio.sleep(0)
+
+
+async def fetch(url):
+    return url
+'''
+
+
+def qualname_at(index, line, **kwargs):
+    symbol = index.symbol_at_line(line, **kwargs)
+    return symbol.qualname if symbol is not None else None
+
+
+def test_nested_function_lookup_returns_the_innermost_symbol():
+    index = ModuleIndex(SOURCE)
+    assert qualname_at(index, 4) == "outer"
+    assert qualname_at(index, 6) == "outer.inner"
+    # Lines after the nested definition belong to the enclosing function again
+    assert qualname_at(index, 8) == "outer"
+    assert qualname_at(index, 1) is None and qualname_at(index, 11) is None
+
+
+def test_method_and_async_lookups():
+    index = ModuleIndex(SOURCE)
+    assert index.symbol_at_line(16).kind == "method"
+    assert qualname_at(index, 16) == "Account.interest"
+    assert qualname_at(index, 19) == "Account.refresh"
+    # Class bodies outside methods only match when classes are asked for
+    assert qualname_at(index, 13) is None
+    assert qualname_at(index, 13, kinds=("class",)) == "Account"
+    assert index.symbol_at_line(23).kind == "async_function"
+    assert CodeAnalyzer.function_at_line(SOURCE, 23).qualname == "fetch"
+
+
+def test_unparsable_source_has_no_symbols():
+    index = ModuleIndex("def broken(:\n")
+    assert index.error and index.symbols == []
+    assert index.symbol_at_line(1) is None
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = ASTCache(max_entries=2)
+    first, second = cache.get("a = 1\n"), cache.get("b = 2\n")
+    assert cache.get("a = 1\n") is first
+    cache.get("c = 3\n")
+
+    assert cache.stats() == {"hits": 1, "misses": 3, "entries": 2}
+    assert cache.get("a = 1\n") is first
+    assert cache.get("b = 2\n") is not second
+
+
+def test_changed_content_gets_a_fresh_index():
+    cache = ASTCache()
+    before = cache.get(SOURCE)
+    edited = SOURCE.replace("return url", "return url.strip()")
+    after = cache.get(edited)
+
+    assert after is not before
+    assert "strip" in after.symbol_at_line(23).code
+    assert "strip" not in before.symbol_at_line(23).code
+    assert cache.stats()["misses"] == 2
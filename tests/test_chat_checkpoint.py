@@ -0,0 +1,74 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils.chat_checkpoint import ChatCheckpointStore, ChatCheckpointer
+from utils.snapshot_store import SnapshotStore
+
+
+class FakeTermination:
+    def get_state(self):
+        return {"rounds": 0}
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "workspace").mkdir()
+    (tmp_path / "workspace" / "buggy.py").write_text("x = 1\n")
+    (tmp_path / "workspace" / "other.py").write_text("y = 1\n")
+    return tmp_path / "workspace"
+
+
+def make_checkpointer(tmp_path, snapshots):
+    chat = SimpleNamespace(messages=[{"name": "User", "content": "fix it"}])
+    context = {"bug_report": {"file_path": "workspace/buggy.py"}, "file_content": "x = 1\n", "snapshot_id": None}
+    return ChatCheckpointer(ChatCheckpointStore(str(tmp_path / "checkpoints")), "run-1", chat, context,
+                            FakeTermination(), snapshots=snapshots, paths=["workspace/buggy.py"])
+
+
+def test_only_the_run_files_are_snapshotted(tmp_path, workspace):
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    checkpointer = make_checkpointer(tmp_path, snapshots)
+    checkpointer.start("User", "fix it")
+
+    state = checkpointer.store.load("run-1")
+    manifest = snapshots.load(state["files_snapshot"])
+    assert list(manifest["files"]) == [os.path.join("workspace", "buggy.py")]
+    assert state["messages"] == [{"name": "User", "content": "fix it"}]
+
+
+def test_restore_leaves_other_files_alone(tmp_path, workspace):
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    checkpointer = make_checkpointer(tmp_path, snapshots)
+    checkpointer.start("User", "fix it")
+    (workspace / "buggy.py").write_text("x = 2\n")
+    (workspace / "other.py").write_text("y = 2\n")
+    (workspace / "new.py").write_text("z = 1\n")
+
+    state = checkpointer.store.load("run-1")
+    snapshots.restore(state["files_snapshot"], ["workspace/buggy.py"])
+
+    assert (workspace / "buggy.py").read_text() == "x = 1\n"
+    assert (workspace / "other.py").read_text() == "y = 2\n"
+    assert (workspace / "new.py").exists()
+
+
+def test_pruned_snapshots_are_garbage_collected(tmp_path, workspace, monkeypatch):
+    snapshots = SnapshotStore(str(tmp_path / "snapshots"))
+    collected = []
+    monkeypatch.setattr(snapshots, "gc", lambda min_age=60.0: collected.append(min_age) or 0)
+    checkpointer = make_checkpointer(tmp_path, snapshots)
+    checkpointer.gc_interval = 0.0
+
+    checkpointer.start("User", "fix it")
+    (workspace / "buggy.py").write_text("x = 2\n")
+    checkpointer.save("BugFixer", "patched")
+    assert len(snapshots.list_snapshots()) == 1
+    assert len(collected) == 1
+
+    checkpointer.finish()
+    assert snapshots.list_snapshots() == []
+    assert len(collected) == 2
+    assert not checkpointer.store.exists("run-1")
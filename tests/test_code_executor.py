@@ -0,0 +1,16 @@
+from utils.code_executor import CodeExecutor
+
+
+def test_pool_factory_runs_once_on_first_use():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return None
+
+    executor = CodeExecutor(timeout=30, pool_factory=factory)
+    assert calls == []
+    assert executor.execute_python("print('hi')") == (True, "hi\n", "")
+    assert executor.execute_python("print('again')")[1] == "again\n"
+    assert calls == [1]
+    assert executor.worker_pool is None
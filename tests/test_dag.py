@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from utils.dag import DagExecutor
+
+
+def test_runs_stages_in_dependency_order_and_passes_inputs():
+    dag = DagExecutor(max_workers=2)
+    dag.add("a", lambda inputs: 1).add("b", lambda inputs: 2)
+    dag.add("sum", lambda inputs: inputs["a"] + inputs["b"], deps=("a", "b"))
+    dag.add("double", lambda inputs: inputs["sum"] * 2, deps=("sum",))
+
+    assert dag.run() == {"a": 1, "b": 2, "sum": 3, "double": 6}
+    assert dag.errors == {}
+    assert set(dag.report()["stages"]) == {"a", "b", "sum", "double"}
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def stage(inputs):
+        barrier.wait()
+        return True
+
+    dag = DagExecutor(max_workers=3)
+    for name in ("analysis", "review", "tests"):
+        dag.add(name, stage)
+    # Would raise BrokenBarrierError if the three stages ran one after another
+    assert dag.run() == {"analysis": True, "review": True, "tests": True}
+
+
+def test_failed_stage_skips_its_dependents_only():
+    def broken(inputs):
+        raise ValueError("boom")
+
+    dag = DagExecutor()
+    dag.add("ok", lambda inputs: "fine").add("broken", broken)
+    dag.add("after_broken", lambda inputs: "never", deps=("broken",))
+    dag.add("after_ok", lambda inputs: inputs["ok"].upper(), deps=("ok",))
+
+    assert dag.run() == {"ok": "fine", "after_ok": "FINE"}
+    assert dag.errors == {"broken": "ValueError: boom", "after_broken": "skipped: broken failed"}
+
+
+def test_completed_stages_are_reused_and_on_complete_reports_new_ones():
+    calls = []
+    dag = DagExecutor()
+    dag.add("a", lambda inputs: calls.append("a") or "recomputed")
+    dag.add("b", lambda inputs: inputs["a"] + "!", deps=("a",))
+
+    done = {}
+    results = dag.run(completed={"a": "saved", "stale": 1}, on_complete=done.__setitem__)
+    assert results == {"a": "saved", "b": "saved!"}
+    assert calls == []
+    assert done == {"b": "saved!"}
+
+
+def test_add_rejects_unknown_dependencies_and_duplicates():
+    dag = DagExecutor()
+    with pytest.raises(ValueError, match="unknown stage"):
+        dag.add("fix", lambda inputs: None, deps=("analysis",))
+    dag.add("analysis", lambda inputs: None)
+    with pytest.raises(ValueError, match="Duplicate"):
+        dag.add("analysis", lambda inputs: None)
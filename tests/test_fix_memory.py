@@ -0,0 +1,80 @@
+import ast
+
+import pytest
+
+from utils.fix_memory import FixPatternMemory, canonicalize
+
+ERROR = "ZeroDivisionError: division by zero"
+BUGGY = '''def average(numbers):
+    """Mean of numbers"""
+    total = sum(numbers)
+    return total / len(numbers)
+'''
+FIXED = '''def average(numbers):
+    """Mean of numbers"""
+    if not numbers:
+        return 0
+    total = sum(numbers)
+    return total / len(numbers)
+'''
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = FixPatternMemory(str(tmp_path / "patterns.db"))
+    yield memory
+    memory.close()
+
+
+def canonical_text(source):
+    return ast.unparse(canonicalize(source)[0])
+
+
+def test_canonical_form_ignores_names_and_docstrings():
+    renamed = "def mean(values):\n    s = sum(values)\n    return s / len(values)\n"
+    assert canonicalize(BUGGY)[0].name == "_v0"
+    assert canonical_text(BUGGY) == canonical_text(renamed)
+
+
+def test_record_then_match_with_renamed_variables(memory):
+    assert memory.record(ERROR, BUGGY, FIXED) == 1
+
+    code = "def mean(values):\n    s = sum(values)\n    return s / len(values)\n"
+    matches = memory.lookup("ZeroDivisionError: float division by zero", code)
+    assert len(matches) == 1 and matches[0]["similarity"] > 0.75
+    assert matches[0]["guard"] == "if not _v1:\n    return 0"
+
+    fixed = memory.apply(matches[0], code, "mean")
+    assert fixed == "def mean(values):\n    if not values:\n        return 0\n    s = sum(values)\n    return s / len(values)\n"
+
+
+def test_unrelated_bug_is_not_matched(memory):
+    memory.record(ERROR, BUGGY, FIXED)
+    code = "def lookup(table, key):\n    for row in table:\n        if row.key == key:\n            return row\n"
+    assert memory.lookup("KeyError: 'missing'", code) == []
+
+
+def test_guard_is_transplanted_onto_a_different_function(memory):
+    memory.record(ERROR, BUGGY, FIXED)
+    pattern = memory.lookup(ERROR, BUGGY)[0]
+    code = "def share(items, weight):\n    count = len(items)\n    return weight / count\n"
+
+    assert memory.apply(pattern, code, "share") == (
+        "def share(items, weight):\n    if not items:\n        return 0\n    count = len(items)\n    return weight / count\n"
+    )
+    assert memory.apply(pattern, code, "missing") is None
+
+
+def test_patterns_persist_across_instances(tmp_path):
+    path = str(tmp_path / "patterns.db")
+    first = FixPatternMemory(path)
+    first.record(ERROR, BUGGY, FIXED)
+    assert first.record(ERROR, BUGGY, FIXED) == 0
+    first.close()
+
+    second = FixPatternMemory(path)
+    try:
+        assert len(second) == 1
+        assert second.lookup(ERROR, BUGGY)[0]["after"].startswith("def _v0(_v1):\n    if not _v1:")
+    finally:
+        second.close()
@@ -0,0 +1,57 @@
+import pytest
+
+from utils.code_executor import CodeExecutor
+from utils.fix_tournament import FixTournament, diff_size
+
+ORIGINAL = "def divide(a, b):\n    return a / b\n"
+TESTS = "from calc import divide\n\n\ndef test_zero():\n    assert divide(1, 0) is None\n\n\n" \
+        "def test_regular():\n    assert divide(6, 3) == 2\n"
+SMALL_FIX = "def divide(a, b):\n    if b == 0:\n        return None\n    return a / b\n"
+BIG_FIX = "def divide(a, b):\n    # Guard against zero\n    if b == 0:\n        return None\n" \
+          "    result = a / b\n    return result\n"
+LINTY_FIX = "def divide(a, b):\n    if b==0:\n        return None\n    return a / b\n"
+WRONG_FIX = "def divide(a, b):\n    return a // b if b else 0\n"
+
+
+def test_diff_size_counts_changed_lines():
+    assert diff_size(ORIGINAL, ORIGINAL) == 0
+    assert diff_size(ORIGINAL, SMALL_FIX) == 2
+
+
+def test_passing_tests_beat_a_smaller_diff_and_smaller_diff_wins_among_passing():
+    outcome = FixTournament(CodeExecutor(timeout=60)).run(ORIGINAL, [WRONG_FIX, BIG_FIX, SMALL_FIX], "calc", TESTS)
+    assert outcome["best"]["index"] == 2
+    assert [c["tests_passed"] for c in outcome["candidates"]] == [False, True, True]
+
+
+def test_lint_issues_break_ties_then_candidate_order():
+    tournament = FixTournament(CodeExecutor(timeout=60))
+    assert tournament.run(ORIGINAL, [LINTY_FIX, SMALL_FIX], "calc", TESTS)["best"]["index"] == 1
+    assert tournament.run(ORIGINAL, [SMALL_FIX, SMALL_FIX], "calc", TESTS)["best"]["index"] == 0
+
+
+def test_all_candidates_failing():
+    outcome = FixTournament(CodeExecutor(timeout=60)).run(ORIGINAL, [None, WRONG_FIX, ORIGINAL], "calc", TESTS)
+    assert outcome["best"]["tests_passed"] is False
+    assert outcome["candidates"][0] == {"index": 0, "code": None, "tests_passed": False,
+                                        "error": "no code block in reply"}
+    assert not any(c["tests_passed"] for c in outcome["candidates"])
+    assert FixTournament(CodeExecutor()).run(ORIGINAL, [None], "calc", TESTS)["best"] is None
+
+
+HELPER_ORIGINAL = "def total(values):\n    return sum(values)\n\n\ndef average(values):\n" \
+                  "    return total(values) / len(values)\n"
+HELPER_TESTS = "from stats import average\n\n\ndef test_average():\n    assert average([2, 4]) == 3\n\n\n" \
+               "def test_empty():\n    assert average([]) is None\n"
+GOOD_FIX = HELPER_ORIGINAL.replace("    return total(values) / len(values)",
+                                   "    if not values:\n        return None\n    return total(values) / len(values)")
+BROKEN_HELPER = GOOD_FIX.replace("return sum(values)", "return sum(values) + 1")
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_helper_change_does_not_reuse_another_candidates_result(max_workers):
+    outcome = FixTournament(CodeExecutor(timeout=60), max_workers=max_workers).run(
+        HELPER_ORIGINAL, [GOOD_FIX, BROKEN_HELPER], "stats", HELPER_TESTS
+    )
+    assert [c["tests_passed"] for c in outcome["candidates"]] == [True, False]
+    assert outcome["best"]["index"] == 0
@@ -0,0 +1,31 @@
+from utils.history_compactor import HistoryCompactor
+
+CODE = "```python\n" + "\n".join(f"x{i} = {i}" for i in range(20)) + "\n```"
+RESULT = "<result>\n" + '{"root_cause": "division by zero in ratio()", "confidence": "high"}' + "\n</result>"
+
+
+def turn(name, content):
+    return {"role": "user", "name": name, "content": content}
+
+
+def test_only_the_latest_copy_of_repeated_code_stays_verbatim():
+    messages = [turn("User", "fix it"), turn("BugFixer", f"v1\n{CODE}\n{RESULT}"),
+                turn("Coordinator", f"again\n{CODE}\n{RESULT}")]
+    compacted = HistoryCompactor(max_tokens=100000)(messages)
+
+    assert "[code #" in compacted[1]["content"] and "repeated verbatim later by Coordinator" in compacted[1]["content"]
+    assert CODE in compacted[2]["content"]
+    # Result blocks are not code and are never deduplicated
+    assert RESULT in compacted[1]["content"] and RESULT in compacted[2]["content"]
+    assert messages[1]["content"].startswith("v1\n```python")
+
+
+def test_long_histories_are_summarized():
+    messages = [turn("User", "fix it")] + [turn(f"Agent{i}", f"turn {i} " + "word " * 400) for i in range(8)]
+    compactor = HistoryCompactor(max_tokens=500, keep_recent=2)
+    compacted = compactor(messages)
+
+    assert len(compacted) == 4
+    assert compacted[1]["content"].startswith("Summary of earlier turns")
+    assert compacted[-2:] == messages[-2:]
+    assert compactor.stats["compactions"] == 1
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from utils.job_queue import JobQueue, StageCheckpoints, DEAD, DONE, QUEUED, RUNNING
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "queue.db"), max_attempts=2, backoff_base=0.0, backoff_max=0.0)
+    yield queue
+    queue.close()
+
+
+def report(name="buggy.py"):
+    return {"file_path": name, "description": "crashes"}
+
+
+def test_submit_deduplicates_by_key(queue):
+    first = queue.submit(report(), key="same")
+    assert queue.submit(report("other.py"), key="same") == first
+    assert queue.submit(report("other.py")) != first
+    assert queue.stats()[QUEUED] == 2
+
+
+def test_claim_leases_a_job_once(queue):
+    job_id = queue.submit(report())
+    job = queue.claim("w1", visibility_timeout=60)
+
+    assert job["id"] == job_id
+    assert job["status"] == RUNNING and job["attempts"] == 1
+    assert job["payload"] == report()
+    assert queue.claim("w2", visibility_timeout=60) is None
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_is_rejected(queue):
+    job_id = queue.submit(report())
+    queue.claim("w1", visibility_timeout=0.01)
+    time.sleep(0.02)
+
+    job = queue.claim("w2", visibility_timeout=60)
+    assert job["id"] == job_id and job["lease_owner"] == "w2" and job["attempts"] == 2
+    assert not queue.heartbeat(job_id, "w1", 60)
+    assert not queue.complete(job_id, "w1", {"status": "success"})
+    assert queue.complete(job_id, "w2", {"status": "success"})
+    assert queue.get(job_id)["status"] == DONE
+    assert queue.get(job_id)["result"] == {"status": "success"}
+
+
+def test_failures_retry_until_dead_then_retry_requeues(queue):
+    job_id = queue.submit(report())
+    queue.claim("w1", visibility_timeout=60)
+    assert queue.fail(job_id, "w1", "boom") == QUEUED
+
+    queue.claim("w1", visibility_timeout=60)
+    assert queue.fail(job_id, "w1", "boom again") == DEAD
+    assert queue.claim("w1", visibility_timeout=60) is None
+    assert queue.get(job_id)["error"] == "boom again"
+
+    assert queue.retry(job_id)
+    assert queue.claim("w1", visibility_timeout=60)["attempts"] == 1
+
+
+def test_checkpoints_require_the_lease(queue):
+    job_id = queue.submit(report())
+    queue.claim("w1", visibility_timeout=60)
+
+    StageCheckpoints(queue, job_id, "w1").save("analysis", {"cause": "off by one"})
+    assert not queue.save_checkpoint(job_id, "w2", "fix", {"code": "x"})
+    assert StageCheckpoints(queue, job_id, "w2").load() == {"analysis": {"cause": "off by one"}}
@@ -0,0 +1,23 @@
+from utils.metrics import MetricsRegistry, Tracer
+
+
+def test_no_llm_fraction_counts_only_llm_free_paths():
+    registry = MetricsRegistry()
+    for resolved_by in ("static", "fix_memory", "pipeline", "agents", None):
+        registry.observe(Tracer(), "success" if resolved_by else "error", resolved_by)
+    assert registry.no_llm_fraction() == 2 / 5
+
+
+def test_observe_aggregates_spans_and_tokens():
+    registry = MetricsRegistry()
+    tracer = Tracer(run_id="run")
+    with tracer.span("analysis", "stage"):
+        pass
+    tracer.add_tokens("BugAnalyzer", 10, 5)
+    registry.observe(tracer, "success", "pipeline")
+
+    assert registry.span_seconds[("stage", "analysis")][0] == 1
+    assert registry.tokens[("BugAnalyzer", "prompt")] == 10
+    text = registry.prometheus_text()
+    assert 'bugfix_runs_resolved_total{path="pipeline"} 1' in text
+    assert 'bugfix_tokens_total{role="BugAnalyzer",type="completion"} 5' in text
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from utils.file_handler import FileHandler
+from utils.project_index import ProjectIndex, module_name, resolve_relative
+
+
+def write(root, relpath, source):
+    path = root / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return path
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    write(root, "pkg/__init__.py", "from .helpers import shout\n\ndef version():\n    return 1\n")
+    write(root, "pkg/helpers.py", "def shout(text):\n    return text.upper()\n")
+    write(root, "pkg/sub/__init__.py", "")
+    write(root, "pkg/sub/deep.py", "class Parser:\n    def parse(self):\n        return 1\n\ndef f():\n    return 2\n")
+    write(root, "app.py", "\n".join([
+        "import pkg.sub.deep",
+        "import pkg.sub.deep as d",
+        "from pkg import shout as yell",
+        "from pkg.sub import deep",
+        "from pkg.sub.deep import Parser as P",
+        "",
+        "def main():",
+        "    return yell('hi')",
+        "",
+    ]))
+    return root
+
+
+@pytest.fixture
+def index(tmp_path, project):
+    index = ProjectIndex(FileHandler(str(project)), str(project), str(tmp_path / "index.db"))
+    index.update(force=True)
+    yield index
+    index.close()
+
+
+def test_module_names():
+    assert module_name(os.path.join("pkg", "sub", "deep.py")) == "pkg.sub.deep"
+    assert module_name(os.path.join("pkg", "__init__.py")) == "pkg"
+    assert resolve_relative("pkg.sub.deep", False, "..helpers") == "pkg.helpers"
+    assert resolve_relative("pkg", True, ".helpers") == "pkg.helpers"
+
+
+@pytest.mark.parametrize("name, path, qualname", [
+    ("pkg.sub.deep.f", "pkg/sub/deep.py", "f"),
+    ("d.f", "pkg/sub/deep.py", "f"),
+    ("d.Parser.parse", "pkg/sub/deep.py", "Parser.parse"),
+    ("deep.f", "pkg/sub/deep.py", "f"),
+    ("P.parse", "pkg/sub/deep.py", "Parser.parse"),
+    ("yell", "pkg/helpers.py", "shout"),
+    ("pkg.version", "pkg/__init__.py", "version"),
+    ("main", "app.py", "main"),
+])
+def test_resolve_follows_aliases_and_dotted_modules(index, name, path, qualname):
+    found = index.resolve(name, "app.py")
+    assert (found["path"], found["qualname"]) == (os.path.normpath(path), qualname)
+
+
+def test_import_graph(index):
+    helpers = os.path.join("pkg", "helpers.py")
+    assert index.imports_of(os.path.join("pkg", "__init__.py")) == [helpers]
+    assert os.path.join("pkg", "sub", "deep.py") in index.imports_of("app.py")
+    assert index.importers_of(helpers) == [os.path.join("pkg", "__init__.py")]
+
+
+def test_update_reindexes_only_changed_files(index, project):
+    assert index.update(force=True) == {"unchanged": 5, "indexed": 0, "removed": 0}
+
+    write(project, "pkg/helpers.py", "def shout(text):\n    return text.upper() + '!'\n\ndef whisper(text):\n"
+                                     "    return text.lower()\n")
+    os.remove(project / "pkg" / "sub" / "deep.py")
+    assert index.update(force=True) == {"unchanged": 3, "indexed": 1, "removed": 1}
+    assert index.definitions("whisper")[0]["path"] == os.path.join("pkg", "helpers.py")
+    assert index.resolve("d.f", "app.py") is None
+
+
+def test_related_definitions_include_callees_in_other_files(index, project):
+    code = (project / "app.py").read_text()
+    related = index.related_definitions(str(project / "app.py"), code, roots=["main"])
+    assert [(d["qualname"], d["reason"]) for d in related] == [("shout", "called by main")]
+    assert "text.upper()" in related[0]["code"]
+
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from utils.code_executor import CodeExecutor
+from utils.file_handler import FileHandler
+from utils.repo_scanner import RepoScanner
+
+
+def write(root, relpath, source):
+    path = root / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    write(root, "app/__init__.py", "from .config import LIMIT\n")
+    write(root, "app/config.py", "LIMIT = 3\n")
+    write(root, "app/core.py", "from . import config\nfrom app.config import LIMIT\n\nprint(config.LIMIT + LIMIT)\n")
+    write(root, "app/broken.py", "def ratio(a, b):\n    return a / b\n\n\nprint(ratio(1, 0))\n")
+    write(root, "script.py", "import app\n\nprint(app.LIMIT)\n")
+    return root
+
+
+def make_scanner(tmp_path, **kwargs):
+    return RepoScanner(FileHandler(str(tmp_path / "workspace")), CodeExecutor(timeout=60),
+                       manifest_path=str(tmp_path / "manifest.json"), lint=False, max_workers=2, **kwargs)
+
+
+def test_package_imports_are_not_reported_as_failures(tmp_path, tree):
+    summary = make_scanner(tmp_path).scan(str(tree))
+
+    assert summary["scanned"] == 5
+    assert [record["path"] for record in summary["failing_files"]] == [str(tree / "app" / "broken.py")]
+    assert summary["failing_files"][0]["error_message"] == "ZeroDivisionError: division by zero"
+    assert summary["healthy"] == 4
+
+
+def test_rescan_from_another_directory_uses_the_manifest(tmp_path, tree, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_scanner(tmp_path).scan("repo")
+
+    monkeypatch.chdir(tree)
+    summary = make_scanner(tmp_path).scan(".")
+    assert (summary["scanned"], summary["skipped"]) == (0, 5)
+    assert [record["path"] for record in summary["failing_files"]] == [os.path.join("app", "broken.py")]
+
+
+def test_to_bug_report_points_at_the_file(tmp_path, tree):
+    record = make_scanner(tmp_path).scan(str(tree))["failing_files"][0]
+    report = RepoScanner.to_bug_report(record)
+    assert report["file_path"] == str(tree / "app" / "broken.py")
+    assert "Traceback" in report["stack_trace"]
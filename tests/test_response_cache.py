@@ -0,0 +1,75 @@
+import copy
+import itertools
+
+import pytest
+
+from utils import response_cache
+from utils.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Strictly increasing timestamps so LRU order never depends on clock resolution
+    ticks = itertools.count(1000.0)
+    monkeypatch.setattr(response_cache.time, "time", lambda: next(ticks))
+    return ticks
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResponseCache(str(tmp_path / "cache"), **kwargs)
+
+
+def test_round_trip_and_persistence(tmp_path):
+    request = {"model": "gpt-4", "messages": [{"role": "user", "content": "fix"}]}
+    with make_cache(tmp_path) as cache:
+        assert cache.get(request, "missing") == "missing"
+        cache.set(request, {"choices": ["patched"]})
+        assert cache.get(request) == {"choices": ["patched"]}
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get(request) == {"choices": ["patched"]}
+    reopened.close()
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+
+def test_size_budget_keeps_at_least_one_entry(tmp_path):
+    cache = make_cache(tmp_path, max_size_mb=0.001)
+    cache.set("small", "x")
+    cache.set("large", "y" * 4096)
+    assert cache.get("small") is None
+    assert cache.get("large") == "y" * 4096
+    cache.close()
+
+
+def test_expired_entries_are_dropped(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=10)
+    cache.set("old", 1)
+    for _ in range(20):
+        next(clock)
+
+    assert cache.get("old", "expired") == "expired"
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_copies_share_the_cache(tmp_path):
+    cache = make_cache(tmp_path)
+    config = {"cache": cache}
+    assert copy.deepcopy(config)["cache"] is cache
+    assert copy.copy(cache) is cache
+    cache.close()
@@ -0,0 +1,73 @@
+import json
+
+from autogen.code_utils import UNKNOWN, extract_code
+
+from utils.result_extractor import ResultExtractor, parse_message, result_block_instructions, validate_result
+
+
+def result_block(section, **fields):
+    return "<result>\n" + json.dumps(dict(section=section, **fields)) + "\n</result>"
+
+
+FIX_RESULT = result_block("fix", change_summary="Guard against b == 0", functions_changed=["divide"])
+
+
+def test_parse_message_reads_result_and_code_blocks():
+    parsed = parse_message("Fixed it.\n```python\ndef divide(a, b):\n    return a / b\n```\n" + FIX_RESULT)
+    assert parsed["errors"] == []
+    assert parsed["results"] == [
+        {"section": "fix", "change_summary": "Guard against b == 0", "functions_changed": ["divide"]}
+    ]
+    assert parsed["code"] == ["def divide(a, b):\n    return a / b\n"]
+
+
+def test_result_blocks_are_not_executable_code():
+    # UserProxy runs whatever extract_code returns; a result block must not fail the turn
+    reply = "```python\nprint('ok')\n```\n" + FIX_RESULT
+    assert extract_code(reply) == [("python", "print('ok')")]
+    assert extract_code("Looks good.\n" + FIX_RESULT)[0][0] == UNKNOWN
+
+
+def test_instructions_do_not_ask_for_a_fenced_block():
+    instructions = result_block_instructions("analysis")
+    assert "<result>" in instructions
+    assert "```result" not in instructions
+    assert all(language != "result" for language, _ in extract_code(instructions))
+
+
+def test_parse_message_reports_invalid_blocks():
+    parsed = parse_message("<result>{not json}</result>\n" + result_block("tests", summary="two tests"))
+    assert parsed["results"] == []
+    assert parsed["errors"][0].startswith("invalid JSON in result block")
+    assert parsed["errors"][1] == "missing field: test_count"
+
+
+def test_validate_result_checks_types():
+    assert validate_result([]) == "result block is not a JSON object"
+    assert validate_result({"section": "nope"}) == "unknown section: 'nope'"
+    data = {"section": "tests", "summary": "s", "test_count": True}
+    assert validate_result(data) == "field test_count should be int"
+    assert validate_result(dict(data, test_count=2)) is None
+
+
+def test_extractor_prefers_structured_result_over_role_fallback():
+    extractor = ResultExtractor()
+    extractor.feed({"name": "BugFixer", "content": "first draft without a result block"})
+    assert extractor.results()["fix"] == "first draft without a result block"
+
+    extractor.feed({"name": "BugFixer", "content": "final\n```python\nx = 1\n```\n" + FIX_RESULT})
+    extractor.feed({"name": "BugFixer", "content": "afterthought"})
+    structured = extractor.structured()["fix"]
+    assert structured["result"]["functions_changed"] == ["divide"]
+    assert structured["code"] == "x = 1\n"
+    assert extractor.results()["fix"].startswith("final")
+
+
+def test_extractor_collects_errors_by_sender():
+    extractor = ResultExtractor()
+    extractor.feed_all([
+        {"name": "Tester", "content": result_block("tests", summary="s")},
+        {"name": "UserProxy", "content": "exitcode: 0"},
+    ])
+    assert extractor.errors == ["Tester: missing field: test_count"]
+    assert extractor.results()["analysis"] == ""
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from utils.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "store"))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "pkg").mkdir(parents=True)
+    (root / "main.py").write_text("print('v1')\n")
+    (root / "pkg" / "util.py").write_text("X = 1\n")
+    return root
+
+
+def test_restore_rewrites_changed_files_only(store, workspace):
+    snapshot_id = store.snapshot([str(workspace)], base_dir=str(workspace))
+    (workspace / "main.py").write_text("print('v2')\n")
+
+    assert store.restore(snapshot_id) == [str(workspace / "main.py")]
+    assert (workspace / "main.py").read_text() == "print('v1')\n"
+    assert store.restore(snapshot_id) == []
+
+
+def test_restore_removes_files_created_after_the_snapshot(store, workspace):
+    snapshot_id = store.snapshot([str(workspace)], base_dir=str(workspace))
+    (workspace / "pkg" / "new.py").write_text("NEW = True\n")
+    (workspace / "pkg" / "util.py").unlink()
+
+    restored = store.restore(snapshot_id)
+    assert sorted(restored) == sorted([str(workspace / "pkg" / "util.py"), str(workspace / "pkg" / "new.py")])
+    assert not (workspace / "pkg" / "new.py").exists()
+    assert (workspace / "pkg" / "util.py").read_text() == "X = 1\n"
+
+
+def test_restore_leaves_files_outside_the_snapshot_alone(store, workspace):
+    snapshot_id = store.snapshot([str(workspace / "main.py")], base_dir=str(workspace))
+    (workspace / "other.py").write_text("OTHER = 1\n")
+    (workspace / "main.py").write_text("print('v2')\n")
+
+    assert store.restore(snapshot_id) == [str(workspace / "main.py")]
+    assert (workspace / "other.py").exists()
+
+
+def test_restore_of_a_path_missing_at_snapshot_time_removes_it(store, workspace):
+    created = workspace / "created.py"
+    snapshot_id = store.snapshot([str(created)], base_dir=str(workspace))
+    created.write_text("x = 1\n")
+
+    assert store.restore(snapshot_id, [str(created)]) == [str(created)]
+    assert not created.exists()
+
+
+def test_checkout_and_diff(store, workspace, tmp_path):
+    first = store.snapshot([str(workspace)], base_dir=str(workspace))
+    (workspace / "main.py").write_text("print('v2')\n")
+    (workspace / "added.py").write_text("")
+    second = store.snapshot([str(workspace)], base_dir=str(workspace))
+
+    assert store.diff(first, second) == {"added": ["added.py"], "removed": [], "modified": ["main.py"]}
+    view = store.checkout(first, str(tmp_path / "view"), read_only=True)
+    assert open(os.path.join(view, "main.py")).read() == "print('v1')\n"
+
+
+def test_gc_removes_unreferenced_blobs_past_the_grace_period(store, workspace):
+    keep = store.snapshot([str(workspace / "pkg")], base_dir=str(workspace))
+    drop = store.snapshot([str(workspace / "main.py")], base_dir=str(workspace))
+    assert store.stats()["blobs"] == 2
+
+    store.delete(drop)
+    assert store.gc() == 0
+    assert store.gc(min_age=0) == 1
+    assert store.stats() == {"snapshots": 1, "blobs": 1, "blob_bytes": len("X = 1\n")}
+    assert store.restore(keep) == []
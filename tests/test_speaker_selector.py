@@ -0,0 +1,53 @@
+import pytest
+
+from utils.speaker_selector import WorkflowSpeakerSelector, DEFAULT_WORKFLOW
+
+
+def message(content):
+    return {"content": content}
+
+
+def test_follows_the_workflow_without_llm():
+    selector = WorkflowSpeakerSelector()
+    speaker = "Coordinator"
+    for expected in DEFAULT_WORKFLOW[:4]:
+        name = selector.next_speaker_name(speaker, message("```python\nprint(1)\n```"))
+        assert name == expected
+        selector.record(name, used_llm=False)
+        speaker = name
+    assert selector.stats()["deterministic_selections"] == 4
+
+
+@pytest.mark.parametrize("output", [
+    "exitcode: 1 (execution failed)\nCode output: Traceback",
+    "exitcode: 2 (execution failed)\nCode output: usage error",
+    "exitcode: 124 (execution failed)\nCode output: Timeout",
+    "exitcode: -9 (execution failed)\nCode output: killed",
+])
+def test_any_nonzero_exitcode_returns_to_the_fixer(output):
+    selector = WorkflowSpeakerSelector()
+    selector.record("UserProxy", used_llm=False)
+    assert selector.next_speaker_name("UserProxy", message(output)) == "BugFixer"
+
+
+def test_successful_execution_continues_the_workflow():
+    selector = WorkflowSpeakerSelector()
+    selector.record("UserProxy", used_llm=False)
+    output = "exitcode: 0 (execution succeeded)\nCode output: 10"
+    assert selector.next_speaker_name("UserProxy", message(output)) == "Coordinator"
+
+
+def test_executor_is_skipped_without_code():
+    selector = WorkflowSpeakerSelector()
+    selector.record("BugFixer", used_llm=False)
+    assert selector.next_speaker_name("BugFixer", message("No change needed.")) == "Coordinator"
+
+
+def test_end_of_workflow_is_ambiguous_and_state_round_trips():
+    selector = WorkflowSpeakerSelector()
+    selector.record("Coordinator", used_llm=True)
+    assert selector.next_speaker_name("Coordinator", message("done")) is None
+
+    restored = WorkflowSpeakerSelector()
+    restored.set_state(selector.get_state())
+    assert restored.get_state() == selector.get_state()
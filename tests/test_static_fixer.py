@@ -0,0 +1,80 @@
+import pytest
+
+from utils.static_fixer import StaticFixer, error_signature, exception_type, faulting_functions, reproduction_test
+
+AVERAGE = '''def average(numbers):
+    """Mean of numbers"""
+    total = sum(numbers)
+    return total / len(numbers)
+
+
+def report(values):
+    return f"avg={average(values)}"
+'''
+
+
+def bug(code_error, stack_trace="", test_input=""):
+    return {"file_path": "workspace/stats.py", "error_message": code_error, "stack_trace": stack_trace,
+            "test_input": test_input}
+
+
+def run(code, call):
+    namespace = {}
+    exec(code, namespace)
+    return eval(call, namespace)
+
+
+def test_error_signature_normalizes_literals():
+    first = error_signature('Traceback...\n  File "/tmp/a.py", line 3\nKeyError: \'user_42\' at 0x7f3a')
+    second = error_signature("KeyError: 'admin' at 0x1b")
+    assert first == second == "KeyError: <str> at <num>"
+    assert exception_type("ZeroDivisionError: division by zero") == "ZeroDivisionError"
+    assert exception_type("CustomError: nope") is None
+
+
+def test_faulting_functions_prefers_the_innermost_frame():
+    trace = ('Traceback (most recent call last):\n'
+             '  File "/work/stats.py", line 8, in report\n'
+             '  File "/work/stats.py", line 4, in average\n'
+             'ZeroDivisionError: division by zero')
+    assert faulting_functions(AVERAGE, "stats.py", trace) == ["average", "report"]
+    assert faulting_functions(AVERAGE, "stats.py", hints=["report([])"]) == ["report", "average"]
+
+
+def test_zero_division_guard_returns_none_for_empty_input():
+    candidates = StaticFixer().candidates(bug("ZeroDivisionError: division by zero", test_input="average([])"),
+                                          AVERAGE)
+    assert candidates[0]["rule"] == "zero_division"
+    assert candidates[0]["function"] == "average"
+    fixed = candidates[0]["code"]
+    # Guard goes after the docstring
+    assert fixed.index('"""Mean of numbers"""') < fixed.index("if not numbers:")
+    assert run(fixed, "average([])") is None
+    assert run(fixed, "average([2, 4])") == 3
+
+
+@pytest.mark.parametrize("error, code, call", [
+    ("IndexError: list index out of range", "def first(items):\n    return items[0]\n", "first([])"),
+    ("AttributeError: 'NoneType' object has no attribute 'upper'",
+     "def shout(text):\n    return text.upper()\n", "shout(None)"),
+    ("TypeError: 'NoneType' object is not iterable",
+     "def total(values):\n    return sum(v for v in values)\n", "total(None)"),
+])
+def test_guards_for_mechanical_errors(error, code, call):
+    candidates = StaticFixer().candidates(bug(error, test_input=call), code)
+    assert candidates
+    assert run(candidates[0]["code"], call) is None
+
+
+def test_unsupported_errors_have_no_candidates():
+    assert StaticFixer().candidates(bug("KeyError: 'x'"), AVERAGE) == []
+    assert StaticFixer().candidates(bug("ZeroDivisionError: division by zero"), "def f():\n    return 1 / 0\n") == []
+
+
+def test_reproduction_test_needs_runnable_input_and_builtin_error():
+    source = reproduction_test("stats", "average([])", "ZeroDivisionError: division by zero")
+    assert "from stats import *" in source
+    assert "except ZeroDivisionError as e:" in source
+    compile(source, "test_stats.py", "exec")
+    assert reproduction_test("stats", "average([", "ZeroDivisionError: division by zero") == ""
+    assert reproduction_test("stats", "average([])", "CustomError: nope") == ""
@@ -0,0 +1,75 @@
+import time
+
+from utils.code_executor import CodeExecutor
+from utils.termination import TerminationController
+
+FIXED = "def divide(a, b):\n    if b == 0:\n        return None\n    return a / b\n"
+BUGGY = "def divide(a, b):\n    return a / b\n\n\ndivide(1, 0)\n"
+TESTS = "from calc import divide\n\n\ndef test_zero():\n    assert divide(1, 0) is None\n"
+
+
+def fenced(code):
+    return f"Here you go:\n```python\n{code}```"
+
+
+def controller(**kwargs):
+    termination = TerminationController(CodeExecutor(timeout=60), **kwargs)
+    termination.start(module_name="calc")
+    return termination
+
+
+def test_stops_once_the_fix_passes_the_latest_tests():
+    termination = controller()
+    assert not termination({"name": "Tester", "content": fenced(TESTS)})
+    assert termination({"name": "BugFixer", "content": fenced(FIXED)})
+
+    report = termination.report()
+    assert report["reason"] == "validated"
+    assert report["validation"]["code_runs"] and report["validation"]["tests_passed"]
+    assert termination.validated_code == FIXED
+    # Stays stopped for every later message
+    assert termination({"name": "Coordinator", "content": "ok"})
+
+
+def test_failing_fix_keeps_the_chat_going():
+    termination = controller()
+    termination({"name": "Tester", "content": fenced(TESTS)})
+    assert not termination({"name": "BugFixer", "content": fenced(BUGGY)})
+    assert termination.validation["code_runs"] is False
+    assert termination.stop_reason is None and termination.validated_code is None
+
+
+def test_near_duplicate_messages_stop_the_chat():
+    termination = controller(validate_fix=False)
+    message = "I think the problem is in the divide function, which never checks b."
+    assert not termination({"name": "BugAnalyzer", "content": message})
+    assert not termination({"name": "Coordinator", "content": "Please propose a fix for the divide function now."})
+    assert termination({"name": "BugAnalyzer", "content": message + "!"})
+    assert termination.report()["reason"] == "loop_detected"
+
+
+def test_token_budget():
+    termination = controller(validate_fix=False, max_tokens=50)
+    assert not termination({"name": "BugAnalyzer", "content": "short analysis of the failing division"})
+    assert termination({"name": "CodeReviewer", "content": "review " * 40})
+    assert termination.report()["reason"] == "token_budget_exceeded"
+
+
+def test_token_budget_uses_the_counter_when_given():
+    termination = TerminationController(CodeExecutor(), validate_fix=False, max_tokens=1000)
+    termination.start(token_counter=lambda: 1000)
+    assert termination({"name": "BugAnalyzer", "content": "hi"})
+    assert termination.stop_reason == "token_budget_exceeded"
+
+
+def test_time_budget_survives_a_state_round_trip():
+    termination = controller(validate_fix=False, max_seconds=60)
+    assert not termination({"name": "BugAnalyzer", "content": "looking"})
+    state = termination.get_state()
+    state["elapsed_seconds"] = 61
+
+    resumed = controller(validate_fix=False, max_seconds=60)
+    resumed.set_state(state)
+    assert resumed({"name": "CodeReviewer", "content": "still looking"})
+    assert resumed.report()["reason"] == "time_budget_exceeded"
+    assert resumed.started < time.monotonic() - 60
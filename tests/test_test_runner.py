@@ -0,0 +1,120 @@
+from utils.test_runner import IncrementalTestRunner, parse_junit
+
+MODULE = "LIMIT = 10\n\n\ndef add(a, b):\n    return a - b\n\n\ndef mul(a, b):\n    return a * b\n"
+TESTS = """from calc import add, mul
+
+
+def test_add():
+    assert add(1, 2) == 3
+
+
+def test_mul():
+    assert mul(2, 3) == 6
+
+
+class TestBoth:
+    def test_both(self):
+        assert add(mul(1, 1), 1) == 2
+"""
+
+
+def write_tests(tmp_path, source=TESTS):
+    path = tmp_path / "test_calc.py"
+    path.write_text(source)
+    return str(path)
+
+
+def result(test, outcome="passed"):
+    return {"nodeid": f"old::{test}", "test": test, "outcome": outcome, "duration": 0.0, "message": ""}
+
+
+def test_changes_reports_functions_or_none_for_module_level_edits():
+    fixed = MODULE.replace("a - b", "a + b")
+    assert IncrementalTestRunner.changes(MODULE, fixed) == ["add"]
+    assert IncrementalTestRunner.changes(fixed, fixed.replace("LIMIT = 10", "LIMIT = 11")) is None
+
+
+def test_plan_runs_everything_without_an_earlier_run(tmp_path):
+    test_file = write_tests(tmp_path)
+    plan = IncrementalTestRunner().plan(test_file, module_code=MODULE)
+    assert sorted(plan["run"]) == sorted(f"{test_file}::{t}" for t in ("test_add", "test_mul", "TestBoth::test_both"))
+    assert plan["reused"] == [] and plan["total"] == 3
+
+
+def test_plan_reuses_results_of_tests_that_reach_no_changed_function(tmp_path):
+    runner = IncrementalTestRunner()
+    first = write_tests(tmp_path)
+    runner.remember(first, MODULE, [result("test_add", "failed"), result("test_mul"),
+                                    result("TestBoth::test_both", "failed")])
+
+    # A later validation in another scratch directory with the same tests
+    other = tmp_path / "other"
+    other.mkdir()
+    test_file = write_tests(other)
+    plan = runner.plan(test_file, module_code=MODULE.replace("a - b", "a + b"))
+    assert sorted(plan["run"]) == [f"{test_file}::TestBoth::test_both", f"{test_file}::test_add"]
+    assert [(r["test"], r["nodeid"]) for r in plan["reused"]] == [("test_mul", f"{test_file}::test_mul")]
+
+
+def test_plan_does_not_reuse_results_for_other_tests_or_module_level_changes(tmp_path):
+    runner = IncrementalTestRunner()
+    test_file = write_tests(tmp_path)
+    runner.remember(test_file, MODULE, [result("test_add"), result("test_mul"), result("TestBoth::test_both")])
+
+    assert runner.plan(test_file, module_code=MODULE.replace("LIMIT = 10", "LIMIT = 1"))["reused"] == []
+    changed_tests = write_tests(tmp_path, TESTS + "\n\ndef test_new():\n    assert mul(0, 1) == 0\n")
+    assert runner.plan(changed_tests, module_code=MODULE)["reused"] == []
+
+
+def test_plan_runs_the_whole_file_when_nothing_is_collected(tmp_path):
+    test_file = write_tests(tmp_path, "def test_broken(:\n")
+    assert IncrementalTestRunner().plan(test_file)["run"] == [test_file]
+
+
+def test_parse_junit(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(
+        '<testsuites><testsuite name="pytest">'
+        '<testcase classname="test_calc" name="test_add" time="0.01"><failure message="assert 1 == 3">trace</failure></testcase>'
+        '<testcase classname="test_calc.TestBoth" name="test_both[1]" time="0.02"/>'
+        '</testsuite></testsuites>'
+    )
+    results = parse_junit(str(report), "/scratch/test_calc.py")
+    assert [(r["nodeid"], r["outcome"]) for r in results] == [
+        ("/scratch/test_calc.py::test_add", "failed"),
+        ("/scratch/test_calc.py::TestBoth::test_both[1]", "passed"),
+    ]
+    assert results[0]["message"] == "assert 1 == 3\ntrace"
+    assert parse_junit(str(tmp_path / "missing.xml"), "x.py") == []
+
+
+HELPER_MODULE = "def total(values):\n    return sum(values)\n\n\ndef average(values):\n    return total(values) / len(values)\n"
+HELPER_TESTS = "from stats import average\n\n\ndef test_average():\n    assert average([2, 4]) == 3\n"
+
+
+def test_plan_reruns_tests_of_callers_of_a_changed_helper(tmp_path):
+    runner = IncrementalTestRunner()
+    test_file = write_tests(tmp_path, HELPER_TESTS)
+    runner.remember(test_file, HELPER_MODULE, [result("test_average")])
+
+    broken = HELPER_MODULE.replace("sum(values)", "sum(values) + 1")
+    plan = runner.plan(test_file, module_code=broken)
+    assert plan["run"] == [f"{test_file}::test_average"]
+    assert plan["reused"] == []
+    assert runner.plan(test_file, changed_functions=["total"])["run"] == [f"{test_file}::test_average"]
+
+
+def test_broken_helper_fails_incremental_validation(tmp_path):
+    from utils.code_executor import CodeExecutor
+
+    executor = CodeExecutor(timeout=60)
+    module = tmp_path / "stats.py"
+    test_file = write_tests(tmp_path, HELPER_TESTS)
+    module.write_text(HELPER_MODULE)
+    assert executor.run_tests_incremental(test_file, module_code=HELPER_MODULE)["success"]
+
+    broken = HELPER_MODULE.replace("sum(values)", "sum(values) + 1")
+    module.write_text(broken)
+    outcome = executor.run_tests_incremental(test_file, module_code=broken)
+    assert not outcome["success"]
+    assert (outcome["selected"], outcome["reused"]) == (1, 0)
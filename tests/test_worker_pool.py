@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from utils import worker_pool
+from utils.worker_pool import PythonWorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(size=1, timeout=20)
+    yield pool
+    pool.close()
+
+
+def write(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(source)
+    return str(path)
+
+
+def test_environment_and_cwd_are_reset_between_jobs(pool, tmp_path):
+    mutate = write(tmp_path, "mutate.py", "import os\nos.environ['LEAKED'] = '1'\nos.chdir('/')\n")
+    check = write(tmp_path, "check.py", "import os\nprint(os.environ.get('LEAKED'), os.getcwd())\n")
+
+    assert pool.run_file(mutate)[0]
+    ok, stdout, _ = pool.run_file(check)
+    assert ok
+    assert stdout.split()[0] == "None"
+    assert stdout.split()[1] != "/"
+    assert pool.stats["recycled"] == 0
+
+
+def test_worker_left_with_running_threads_is_replaced(pool, tmp_path):
+    script = write(tmp_path, "thread.py", "import threading, time\nthreading.Thread(target=time.sleep, args=(30,), daemon=True).start()\n")
+    assert pool.run_file(script)[0]
+    assert pool.stats["recycled"] == 1
+    assert pool.run_file(write(tmp_path, "ok.py", "print('ok')\n")) == (True, "ok\n", "")
+
+
+def test_timeout_replaces_the_worker(tmp_path):
+    pool = PythonWorkerPool(size=1, timeout=1)
+    try:
+        ok, _, stderr = pool.run_file(write(tmp_path, "slow.py", "import time\ntime.sleep(30)\n"))
+        assert not ok and stderr == "Execution timeout"
+        assert pool.stats["timeouts"] == 1
+        assert pool.run_file(write(tmp_path, "ok.py", "print('ok')\n"))[0]
+    finally:
+        pool.close()
+
+
+def test_acquire_times_out_with_a_clear_error(tmp_path):
+    pool = PythonWorkerPool(size=1, timeout=20, acquire_timeout=0.2)
+    try:
+        slow = write(tmp_path, "slow.py", "import time\ntime.sleep(2)\n")
+        busy = threading.Thread(target=pool.run_file, args=(slow,))
+        busy.start()
+        threading.Event().wait(0.5)
+        with pytest.raises(RuntimeError, match="No idle worker"):
+            pool.run_file(slow)
+        busy.join()
+    finally:
+        pool.close()
+
+
+def test_failed_respawn_is_retried_before_the_next_job(tmp_path, monkeypatch):
+    pool = PythonWorkerPool(size=1, timeout=20, max_jobs_per_worker=1, spawn_attempts=2)
+    try:
+        real_worker = worker_pool._Worker
+
+        def broken(preload):
+            raise OSError("no more processes")
+
+        monkeypatch.setattr(worker_pool, "_Worker", broken)
+        monkeypatch.setattr(worker_pool.time, "sleep", lambda seconds: None)
+        script = write(tmp_path, "ok.py", "print('ok')\n")
+        # The job succeeds; recycling its worker fails and leaves the slot missing
+        assert pool.run_file(script)[0]
+        assert pool.stats["spawn_failures"] == 2
+        with pytest.raises(RuntimeError, match="Could not start any pool worker"):
+            pool.run_file(script)
+
+        monkeypatch.setattr(worker_pool, "_Worker", real_worker)
+        assert pool.run_file(script)[0]
+    finally:
+        pool.close()
@@ -0,0 +1,66 @@
+import contextlib
+from typing import Any, List, Optional
+
+
+class TurnObserver:
+    """Base class for objects notified around each group chat turn.
+
+    ``on_turn_start`` runs right before a participant generates its reply and
+    ``on_turn_end`` right after, on the thread that runs the chat.
+    """
+
+    def on_turn_start(self, agent: Any, sender: Any, messages: Optional[List[dict]]):
+        pass
+
+    def on_turn_end(self, agent: Any, reply: Any, error: Optional[BaseException]):
+        pass
+
+
+@contextlib.contextmanager
+def observe_turns(agents: List[Any], observers: List[TurnObserver]):
+    """Wrap each agent's generate_reply so observers see every turn.
+
+    The GroupChatManager calls ``speaker.generate_reply(sender=manager)`` once
+    per round, so wrapping the participants (not the manager) yields exactly one
+    start/end pair per turn. The original methods are restored on exit.
+    """
+    if not observers:
+        yield
+        return
+
+    saved = []
+    for agent in agents:
+        had_override = "generate_reply" in agent.__dict__
+        original = agent.generate_reply
+        saved.append((agent, had_override, original))
+        agent.generate_reply = _wrap(agent, original, observers)
+
+    try:
+        yield
+    finally:
+        for agent, had_override, original in saved:
+            if had_override:
+                agent.generate_reply = original
+            else:
+                del agent.generate_reply
+
+
+def _wrap(agent: Any, original: Any, observers: List[TurnObserver]):
+    def generate_reply(messages=None, sender=None, **kwargs):
+        if messages is None and sender is not None:
+            history = agent.chat_messages.get(sender)
+        else:
+            history = messages
+        for observer in observers:
+            observer.on_turn_start(agent, sender, history)
+        try:
+            reply = original(messages=messages, sender=sender, **kwargs)
+        except BaseException as e:
+            for observer in observers:
+                observer.on_turn_end(agent, None, e)
+            raise
+        for observer in observers:
+            observer.on_turn_end(agent, reply, None)
+        return reply
+
+    return generate_reply
@@ -0,0 +1,209 @@
+import ast
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+FUNCTION_KINDS = ("function", "async_function", "method")
+
+
+class Symbol:
+    """A function, async function, method or class definition"""
+
+    __slots__ = ("name", "qualname", "kind", "line_start", "line_end", "args", "code", "parent")
+
+    def __init__(self, name: str, qualname: str, kind: str, line_start: int, line_end: int,
+                 args: Tuple[str, ...], code: str, parent: Optional["Symbol"]):
+        self.name = name
+        self.qualname = qualname
+        self.kind = kind
+        self.line_start = line_start
+        self.line_end = line_end
+        self.args = args
+        self.code = code
+        self.parent = parent
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Record in the shape returned by CodeAnalyzer.extract_functions"""
+        return {
+            'name': self.name,
+            'line_start': self.line_start,
+            'line_end': self.line_end,
+            'code': self.code,
+            'args': list(self.args)
+        }
+
+    def __repr__(self):
+        return f"Symbol({self.kind} {self.qualname} {self.line_start}-{self.line_end})"
+
+
+class ModuleIndex:
+    """Parsed tree and symbol table for one version of a source file"""
+
+    def __init__(self, source: str):
+        self.tree: Optional[ast.Module] = None
+        self.error: Optional[str] = None
+        self.symbols: List[Symbol] = []
+        self.imports: List[str] = []
+        # (module, imported name or None for `import module`, local alias or None)
+        self.import_names: List[Tuple[str, Optional[str], Optional[str]]] = []
+        self.calls: Dict[str, List[str]] = {}
+        self._line_indexes: Dict[Tuple[str, ...], Tuple[List[int], List[Optional[Symbol]]]] = {}
+
+        try:
+            self.tree = ast.parse(source)
+        except (SyntaxError, ValueError) as e:
+            self.error = str(e)
+            return
+
+        self._lines = source.splitlines(keepends=True)
+        self._visit(self.tree, None)
+        del self._lines
+
+    def _visit(self, node: ast.AST, parent: Optional[Symbol]):
+        """Single pass collecting definitions, imports and call names"""
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                symbol = self._symbol(child, parent)
+                self.symbols.append(symbol)
+                self._visit(child, symbol)
+                continue
+
+            if isinstance(child, ast.Import):
+                self.imports.extend(f"import {alias.name}" for alias in child.names)
+                self.import_names.extend((alias.name, None, alias.asname) for alias in child.names)
+            elif isinstance(child, ast.ImportFrom):
+                module = '.' * child.level + (child.module or '')
+                self.imports.extend(f"from {module} import {alias.name}" for alias in child.names)
+                self.import_names.extend((module, alias.name, alias.asname) for alias in child.names)
+            elif isinstance(child, ast.Call):
+                self._record_call(child, parent)
+            self._visit(child, parent)
+
+    def _record_call(self, call: ast.Call, parent: Optional[Symbol]):
+        if isinstance(call.func, ast.Name):
+            name = call.func.id
+        elif isinstance(call.func, ast.Attribute):
+            name = call.func.attr
+        else:
+            return
+        # A call counts for every enclosing function, as with nested ast.walk
+        while parent is not None:
+            if parent.kind != "class":
+                called = self.calls[parent.name]
+                if name not in called:
+                    called.append(name)
+            parent = parent.parent
+
+    def _symbol(self, node: ast.AST, parent: Optional[Symbol]) -> Symbol:
+        if isinstance(node, ast.ClassDef):
+            kind, args = "class", ()
+        else:
+            if parent is not None and parent.kind == "class":
+                kind = "method"
+            else:
+                kind = "async_function" if isinstance(node, ast.AsyncFunctionDef) else "function"
+            args = tuple(arg.arg for arg in node.args.args)
+            self.calls.setdefault(node.name, [])
+
+        qualname = f"{parent.qualname}.{node.name}" if parent is not None else node.name
+        line_end = node.end_lineno or node.lineno
+        return Symbol(node.name, qualname, kind, node.lineno, line_end, args,
+                      self._segment(node), parent)
+
+    def _segment(self, node: ast.AST) -> str:
+        """Source text of node (same result as ast.get_source_segment, without re-splitting)"""
+        if node.end_lineno is None or node.end_col_offset is None:
+            return ''
+        lines = self._lines[node.lineno - 1:node.end_lineno]
+        if not lines:
+            return ''
+        first = lines[0].encode('utf-8')
+        if len(lines) == 1:
+            return first[node.col_offset:node.end_col_offset].decode('utf-8')
+        last = lines[-1].encode('utf-8')[:node.end_col_offset].decode('utf-8')
+        return first[node.col_offset:].decode('utf-8') + ''.join(lines[1:-1]) + last
+
+    def functions(self) -> List[Symbol]:
+        """Functions, async functions and methods, nested ones included"""
+        return [symbol for symbol in self.symbols if symbol.kind in FUNCTION_KINDS]
+
+    def symbol_at_line(self, line: int, kinds: Tuple[str, ...] = FUNCTION_KINDS) -> Optional[Symbol]:
+        """Innermost symbol of one of kinds whose line range contains line"""
+        starts, owners = self._line_index(kinds)
+        position = bisect.bisect_right(starts, line) - 1
+        return owners[position] if position >= 0 else None
+
+    def _line_index(self, kinds: Tuple[str, ...]) -> Tuple[List[int], List[Optional[Symbol]]]:
+        """Split the file into line segments, each owned by its innermost symbol
+
+        Definitions nest properly, so a stack sweep over symbols sorted by start
+        gives a flat list of segment start lines that bisect can search.
+        """
+        index = self._line_indexes.get(kinds)
+        if index is not None:
+            return index
+
+        starts: List[int] = []
+        owners: List[Optional[Symbol]] = []
+
+        def mark(line: int, owner: Optional[Symbol]):
+            if starts and starts[-1] == line:
+                owners[-1] = owner
+            else:
+                starts.append(line)
+                owners.append(owner)
+
+        stack: List[Symbol] = []
+        candidates = sorted((s for s in self.symbols if s.kind in kinds), key=lambda s: (s.line_start, -s.line_end))
+        for symbol in candidates:
+            while stack and stack[-1].line_end < symbol.line_start:
+                closed = stack.pop()
+                mark(closed.line_end + 1, stack[-1] if stack else None)
+            stack.append(symbol)
+            mark(symbol.line_start, symbol)
+        while stack:
+            closed = stack.pop()
+            mark(closed.line_end + 1, stack[-1] if stack else None)
+
+        index = (starts, owners)
+        self._line_indexes[kinds] = index
+        return index
+
+
+class ASTCache:
+    """Size-bounded LRU cache of ModuleIndex objects keyed by source hash"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ModuleIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source: str) -> ModuleIndex:
+        key = hashlib.sha256(source.encode('utf-8', 'surrogatepass')).hexdigest()
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = ModuleIndex(source)
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -0,0 +1,164 @@
+import os
+import gzip
+import json
+import time
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+from utils.agent_hooks import TurnObserver
+from utils.snapshot_store import SnapshotStore
+
+
+class ChatCheckpointStore:
+    """Per-run group chat checkpoints on disk.
+
+    Each run gets a directory with the chat messages as gzip-compressed JSONL,
+    appended to as rounds complete (one gzip member per write), and a small
+    ``state.json`` that is replaced atomically after every round. Only the
+    first ``message_count`` messages recorded in the state are trusted, so a
+    crash between the two writes never yields a torn checkpoint.
+    """
+
+    def __init__(self, directory: str = ".cache/chat_checkpoints"):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path_for(self, run_id: str) -> str:
+        return os.path.join(self.directory, run_id)
+
+    def exists(self, run_id: str) -> bool:
+        return os.path.exists(os.path.join(self.path_for(run_id), "state.json"))
+
+    def write_messages(self, run_id: str, messages: List[Dict[str, Any]], append: bool = True):
+        """Append messages to the run's log (or replace the log when append is False)"""
+        path = self.path_for(run_id)
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+        if not messages and append:
+            return
+        with gzip.open(os.path.join(path, "messages.jsonl.gz"), "at" if append else "wt", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, default=str) + "\n")
+
+    def write_state(self, run_id: str, state: Dict[str, Any]):
+        path = self.path_for(run_id)
+        temp_path = os.path.join(path, f".state.{threading.get_ident()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, default=str)
+        os.replace(temp_path, os.path.join(path, "state.json"))
+
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """State of the last completed round, with its messages under "messages" """
+        path = self.path_for(run_id)
+        with open(os.path.join(path, "state.json"), "r", encoding="utf-8") as f:
+            state = json.load(f)
+        messages = []
+        log_path = os.path.join(path, "messages.jsonl.gz")
+        if state["message_count"] and os.path.exists(log_path):
+            with gzip.open(log_path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if len(messages) == state["message_count"]:
+                        break
+                    messages.append(json.loads(line))
+        state["messages"] = messages
+        return state
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Resumable runs, most recently updated first"""
+        runs = []
+        if os.path.isdir(self.directory):
+            for run_id in os.listdir(self.directory):
+                if self.exists(run_id):
+                    with open(os.path.join(self.path_for(run_id), "state.json"), "r", encoding="utf-8") as f:
+                        state = json.load(f)
+                    runs.append({"run_id": run_id, "round": state["round"], "updated": state["updated"],
+                                 "file_path": state["bug_report"].get("file_path")})
+        return sorted(runs, key=lambda run: run["updated"], reverse=True)
+
+    def delete(self, run_id: str):
+        shutil.rmtree(self.path_for(run_id), ignore_errors=True)
+
+
+class ChatCheckpointer(TurnObserver):
+    """Checkpoints the group chat after every agent turn.
+
+    When a turn ends, every message already in the group chat has been
+    through termination and speaker selection, and the reply just produced
+    is about to be posted. The checkpoint stores those messages, the
+    pending reply, the speaker selector and termination state and
+    (optionally) a snapshot of the run's own files, which is everything
+    BugFixingSystem.resume needs to post the reply and carry on. Only
+    those files are snapshotted, since other runs may be changing the rest
+    of a shared workspace at the same time.
+    """
+
+    # Minimum seconds between snapshot gc passes while a chat is running
+    gc_interval = 60.0
+
+    def __init__(self, store: ChatCheckpointStore, run_id: str, group_chat: Any, context: Dict[str, Any],
+                 termination: Any, snapshots: Optional[SnapshotStore] = None, paths: Optional[List[str]] = None):
+        self.store = store
+        self.run_id = run_id
+        self.group_chat = group_chat
+        self.context = context
+        self.termination = termination
+        self.snapshots = snapshots
+        self.paths = list(paths or [])
+        self.written = 0
+        self.rounds_saved = 0
+        self.files_snapshot: Optional[str] = None
+        self._last_gc = time.monotonic()
+
+    @property
+    def path(self) -> str:
+        return self.store.path_for(self.run_id)
+
+    def start(self, speaker_name: str, content: str):
+        """Checkpoint the message that opens (or reopens) the chat"""
+        self.store.write_messages(self.run_id, self.group_chat.messages, append=False)
+        self.written = len(self.group_chat.messages)
+        self.save(speaker_name, content)
+
+    def on_turn_end(self, agent, reply, error):
+        if error is None and reply is not None:
+            self.save(agent.name, reply.get("content") if isinstance(reply, dict) else reply)
+
+    def save(self, speaker_name: str, content: Any):
+        messages = self.group_chat.messages
+        self.store.write_messages(self.run_id, messages[self.written:])
+        self.written = len(messages)
+
+        previous = self.files_snapshot
+        if self.snapshots is not None and self.paths:
+            self.files_snapshot = self.snapshots.snapshot(
+                self.paths, label=f"chat checkpoint {self.run_id} round {self.written + 1}"
+            )
+        selector = getattr(self.group_chat, "speaker_selector", None)
+        self.store.write_state(self.run_id, dict(
+            self.context,
+            round=self.written + 1,
+            message_count=self.written,
+            pending={"name": speaker_name, "content": content},
+            selector=selector.get_state() if selector is not None else None,
+            termination=self.termination.get_state(),
+            files_snapshot=self.files_snapshot,
+            updated=time.time()
+        ))
+        self.rounds_saved += 1
+        # Only the latest round's files are needed to resume
+        if previous and previous != self.files_snapshot:
+            self.snapshots.delete(previous)
+            if time.monotonic() - self._last_gc >= self.gc_interval:
+                self._collect()
+
+    def finish(self):
+        """Drop the checkpoint once the chat has ended normally"""
+        if self.files_snapshot:
+            self.snapshots.delete(self.files_snapshot)
+            self._collect()
+        self.store.delete(self.run_id)
+
+    def _collect(self):
+        """Remove snapshot blobs that pruned checkpoints no longer refer to"""
+        self._last_gc = time.monotonic()
+        self.snapshots.gc()
@@ -1,11 +1,32 @@
 import subprocess
 import tempfile
 import os
-from typing import Tuple, Dict, Any
+import time
+import threading
+from typing import Tuple, Dict, Any, List, Optional, Callable
+from utils.worker_pool import PythonWorkerPool
+from utils.test_runner import IncrementalTestRunner, parse_junit
+from utils.metrics import trace_span
 
 class CodeExecutor:
-    def __init__(self, timeout: int = 60):
+    def __init__(self, timeout: int = 60, worker_pool: Optional[PythonWorkerPool] = None,
+                 pool_factory: Optional[Callable[[], Optional[PythonWorkerPool]]] = None):
         self.timeout = timeout
+        # Optional pool of warm interpreters, given directly or started by
+        # pool_factory on first use; None keeps the fresh-subprocess path
+        self._worker_pool = worker_pool
+        self._pool_factory = pool_factory
+        self._pool_lock = threading.Lock()
+        self.test_runner = IncrementalTestRunner()
+    
+    @property
+    def worker_pool(self) -> Optional[PythonWorkerPool]:
+        if self._pool_factory is not None:
+            with self._pool_lock:
+                if self._pool_factory is not None:
+                    self._worker_pool = self._pool_factory()
+                    self._pool_factory = None
+        return self._worker_pool
     
     def execute_python(self, code: str, file_path: str = None) -> Tuple[bool, str, str]:
         """Execute Python code and return success, stdout, stderr"""
@@ -29,6 +50,14 @@ class CodeExecutor:
     
     def _execute_file(self, file_path: str) -> Tuple[bool, str, str]:
         """Execute Python file"""
+        with trace_span("execute_python", "executor", backend="pool" if self.worker_pool is not None else "subprocess"):
+            return self._run_file(file_path)
+    
+    def _run_file(self, file_path: str) -> Tuple[bool, str, str]:
+        """Run a Python file on the configured backend"""
+        if self.worker_pool is not None:
+            return self.worker_pool.run_file(file_path, timeout=self.timeout)
+        
         try:
             result = subprocess.run(
                 ['python', file_path],
@@ -45,11 +74,44 @@ class CodeExecutor:
         except Exception as e:
             return False, "", str(e)
     
+    def execute_module(self, module: str, cwd: str) -> Tuple[bool, str, str]:
+        """Run ``python -m module`` from cwd and return success, stdout, stderr"""
+        with trace_span("execute_module", "executor", backend="pool" if self.worker_pool is not None else "subprocess"):
+            if self.worker_pool is not None:
+                returncode, stdout, stderr = self.worker_pool.run_module(module, cwd=cwd, timeout=self.timeout)
+                return returncode == 0, stdout, stderr
+            
+            try:
+                result = subprocess.run(
+                    ['python', '-m', module],
+                    capture_output=True,
+                    text=True,
+                    cwd=cwd,
+                    timeout=self.timeout
+                )
+                
+                success = result.returncode == 0
+                return success, result.stdout, result.stderr
+                
+            except subprocess.TimeoutExpired:
+                return False, "", "Execution timeout"
+            except Exception as e:
+                return False, "", str(e)
+    
     def run_tests(self, test_file: str) -> Tuple[bool, str]:
         """Run pytest on test file"""
+        with trace_span("run_tests", "executor"):
+            return self._run_pytest([test_file, '-v'])
+    
+    def _run_pytest(self, args: List[str]) -> Tuple[bool, str]:
+        """Run pytest on the configured backend"""
+        if self.worker_pool is not None:
+            returncode, stdout, stderr = self.worker_pool.run_module('pytest', args, timeout=self.timeout)
+            return returncode == 0, stdout + stderr
+        
         try:
             result = subprocess.run(
-                ['pytest', test_file, '-v'],
+                ['pytest'] + args,
                 capture_output=True,
                 text=True,
                 timeout=self.timeout
@@ -64,8 +126,78 @@ class CodeExecutor:
         except Exception as e:
             return False, str(e)
     
+    def run_tests_incremental(self, test_file: str, changed_functions: Optional[List[str]] = None,
+                              module_code: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run only the tests affected by a change and return per-test results
+        
+        Tests run on the same backend (and under the same timeout) as run_tests.
+        When module_code is given and these tests already ran against an earlier
+        version of it, tests that reach none of the functions changed since
+        keep their earlier result.
+        
+        Args:
+            test_file: Pytest file
+            changed_functions: Functions known to have changed
+            module_code: Source of the module under test
+        
+        Returns:
+            Dictionary with overall success, per-test results, how many tests ran,
+            were reused and exist in total, and the pytest output
+        """
+        try:
+            with trace_span("run_tests_incremental", "executor"):
+                return self._run_tests_incremental(test_file, changed_functions, module_code)
+        except Exception as e:
+            return {'success': False, 'tests': [], 'selected': 0, 'reused': 0, 'total': 0, 'duration': 0.0,
+                    'output': str(e)}
+    
+    def _run_tests_incremental(self, test_file: str, changed_functions: Optional[List[str]],
+                               module_code: Optional[str]) -> Dict[str, Any]:
+        plan = self.test_runner.plan(test_file, changed_functions, module_code)
+        start = time.perf_counter()
+        fresh, output, completed = [], "", True
+        if plan['run']:
+            with tempfile.TemporaryDirectory() as report_dir:
+                report_path = os.path.join(report_dir, "report.xml")
+                _, output = self._run_pytest(
+                    plan['run'] + ['-q', '-p', 'no:cacheprovider', f'--junitxml={report_path}']
+                )
+                # No report means pytest never finished (timeout or crash)
+                completed = os.path.exists(report_path)
+                fresh = parse_junit(report_path, test_file)
+        
+        results = fresh + plan['reused']
+        if plan['reused']:
+            output += f"\n{len(plan['reused'])} test(s) reach no changed function and kept their earlier result"
+            output += "".join(f"\n{r['test']}: {r['outcome']}" for r in plan['reused']
+                              if r['outcome'] not in ('passed', 'skipped'))
+        success = completed and bool(results) and all(r['outcome'] in ('passed', 'skipped') for r in results)
+        if completed and module_code is not None:
+            self.test_runner.remember(test_file, module_code, results)
+        return {
+            'success': success,
+            'tests': results,
+            'selected': len(plan['run']),
+            'reused': len(plan['reused']),
+            'total': plan['total'],
+            'duration': time.perf_counter() - start,
+            'output': output
+        }
+    
     def lint_code(self, file_path: str) -> Tuple[bool, str]:
         """Run flake8 linting on code"""
+        with trace_span("lint_code", "executor"):
+            return self._run_flake8(file_path)
+    
+    def _run_flake8(self, file_path: str) -> Tuple[bool, str]:
+        """Run flake8 on the configured backend"""
+        if self.worker_pool is not None:
+            returncode, stdout, _ = self.worker_pool.run_module(
+                'flake8', [file_path, '--max-line-length=88', '--ignore=E203,W503'], timeout=self.timeout
+            )
+            return returncode == 0, stdout
+        
         try:
             result = subprocess.run(
                 ['flake8', file_path, '--max-line-length=88', '--ignore=E203,W503'],
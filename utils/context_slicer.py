@@ -0,0 +1,153 @@
+import os
+import re
+from typing import Dict, Any, List, Optional
+from utils.file_handler import CodeAnalyzer
+
+FRAME_PATTERN = re.compile(r'File "(?P<file>[^"]+)", line (?P<line>\d+), in (?P<function>\S+)')
+
+
+def parse_stack_trace(stack_trace: str) -> List[Dict[str, Any]]:
+    """Extract (file, line, function) frames from a Python traceback"""
+    frames = []
+    for match in FRAME_PATTERN.finditer(stack_trace or ""):
+        frames.append({
+            'file': match.group('file'),
+            'line': int(match.group('line')),
+            'function': match.group('function')
+        })
+    return frames
+
+
+def same_file(frame_file: str, file_path: str) -> bool:
+    """Check whether a traceback path refers to file_path"""
+    frame_file = os.path.normpath(frame_file)
+    file_path = os.path.normpath(file_path)
+    if frame_file == file_path:
+        return True
+    if os.path.isabs(frame_file) != os.path.isabs(file_path):
+        shorter, longer = sorted([frame_file, file_path], key=len)
+        return longer.endswith(os.sep + shorter)
+    return os.path.abspath(frame_file) == os.path.abspath(file_path)
+
+
+class ContextSlicer:
+    """Build a compact code context for a bug report.
+
+    Instead of the whole file, the context contains the imports plus the
+    functions on the stack trace and their direct callers and callees. Small
+    files, or reports where nothing can be located, fall back to the full file.
+    """
+
+    def __init__(self, max_full_file_lines: int = 200, include_callers: bool = True,
+                 include_callees: bool = True, module_context_lines: int = 3):
+        self.max_full_file_lines = max_full_file_lines
+        self.include_callers = include_callers
+        self.include_callees = include_callees
+        self.module_context_lines = module_context_lines
+        self.code_analyzer = CodeAnalyzer()
+
+    def slice(self, code: str, file_path: str, stack_trace: str = "",
+              hints: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Slice code down to the parts relevant to a bug
+
+        Args:
+            code: Full source of the buggy file
+            file_path: Path of the buggy file, used to match traceback frames
+            stack_trace: Traceback text from the bug report
+            hints: Extra text (error message, test input) scanned for function names
+
+        Returns:
+            Dictionary with the context text, the selected function names and
+            whether the context was sliced
+        """
+        lines = code.splitlines()
+        if len(lines) <= self.max_full_file_lines:
+            return self._full(code, "file is small")
+
+        functions = self.code_analyzer.extract_functions(code)
+        if not functions:
+            return self._full(code, "no functions found")
+        by_name = {}
+        for func in functions:
+            by_name.setdefault(func['name'], func)
+
+        selected: Dict[str, str] = {}
+        module_lines: List[int] = []
+
+        for frame in parse_stack_trace(stack_trace):
+            if not same_file(frame['file'], file_path):
+                continue
+            if frame['function'] == '<module>':
+                module_lines.append(frame['line'])
+                continue
+            func = self.code_analyzer.function_at_line(code, frame['line'])
+            if func is not None and func.name == frame['function']:
+                selected.setdefault(func.name, "stack trace")
+            elif frame['function'] in by_name:
+                # Line numbers may be stale; trust the function name
+                selected.setdefault(frame['function'], "stack trace")
+            elif func is not None:
+                selected.setdefault(func.name, "stack trace")
+            else:
+                module_lines.append(frame['line'])
+
+        for text in hints or []:
+            for name in by_name:
+                if re.search(rf"\b{re.escape(name)}\b", text or ""):
+                    selected.setdefault(name, "bug report")
+
+        if not selected:
+            return self._full(code, "no frames matched")
+
+        calls = self.code_analyzer.extract_calls(code)
+        roots = list(selected)
+        if self.include_callees:
+            for name in roots:
+                for callee in calls.get(name, []):
+                    if callee in by_name:
+                        selected.setdefault(callee, f"called by {name}")
+        if self.include_callers:
+            for caller, callees in calls.items():
+                for name in roots:
+                    if name in callees and caller in by_name:
+                        selected.setdefault(caller, f"calls {name}")
+
+        return {
+            'context': self._render(code, lines, by_name, selected, module_lines),
+            'functions': list(selected),
+            'sliced': True,
+            'reason': "sliced around stack trace"
+        }
+
+    def _render(self, code: str, lines: List[str], by_name: Dict[str, Dict],
+                selected: Dict[str, str], module_lines: List[int]) -> str:
+        """Assemble imports and selected slices in file order"""
+        spans = []
+        for name, reason in selected.items():
+            func = by_name[name]
+            spans.append((func['line_start'], func['line_end'] or func['line_start'], f"{name} ({reason})"))
+        for line in module_lines:
+            start = max(1, line - self.module_context_lines)
+            end = min(len(lines), line + self.module_context_lines)
+            spans.append((start, end, "module level code"))
+
+        # Drop spans nested inside another selected span
+        spans.sort(key=lambda span: (span[0], -span[1]))
+        merged = []
+        for span in spans:
+            if merged and span[1] <= merged[-1][1]:
+                continue
+            merged.append(span)
+
+        parts = []
+        imports = self.code_analyzer.get_imports(code)
+        if imports:
+            parts.append("# Imports\n" + "\n".join(imports))
+        for start, end, label in merged:
+            parts.append(f"# Lines {start}-{end}: {label}\n" + "\n".join(lines[start - 1:end]))
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _full(code: str, reason: str) -> Dict[str, Any]:
+        return {'context': code, 'functions': [], 'sliced': False, 'reason': reason}
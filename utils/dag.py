@@ -0,0 +1,101 @@
+import time
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+from utils.metrics import trace_span
+
+
+class DagExecutor:
+    """Runs a DAG of stages, each one as soon as all of its dependencies are done.
+
+    A stage is a callable taking ``{dependency: result}``. Stages must be added
+    after their dependencies, which rules out cycles. Independent stages run
+    concurrently on a thread pool (with the caller's context, so spans land on
+    the active tracer). When a stage raises, the stages depending on it are
+    skipped; the error is kept in ``errors`` and the rest of the graph still
+    runs. Results passed in as ``completed`` are reused instead of recomputed.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.stages: Dict[str, tuple] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.elapsed = 0.0
+
+    def add(self, name: str, run: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> "DagExecutor":
+        deps = tuple(deps)
+        unknown = [dep for dep in deps if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {name!r} depends on unknown stage(s): {', '.join(unknown)}")
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage {name!r}")
+        self.stages[name] = (run, deps)
+        return self
+
+    def run(self, completed: Optional[Dict[str, Any]] = None,
+            on_complete: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Execute every stage not already in completed
+
+        Args:
+            completed: Results of stages finished earlier (e.g. by an interrupted attempt)
+            on_complete: Called as ``on_complete(name, result)`` after each stage succeeds
+
+        Returns:
+            Stage name -> result for every stage that succeeded
+        """
+        results = {name: value for name, value in (completed or {}).items() if name in self.stages}
+        pending = [name for name in self.stages if name not in results]
+        self.errors = {}
+        self.timings = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            running = {}
+            while pending or running:
+                for name in list(pending):
+                    run, deps = self.stages[name]
+                    failed = [dep for dep in deps if dep in self.errors]
+                    if failed:
+                        self.errors[name] = f"skipped: {', '.join(failed)} failed"
+                        pending.remove(name)
+                    elif all(dep in results for dep in deps):
+                        inputs = {dep: results[dep] for dep in deps}
+                        future = pool.submit(contextvars.copy_context().run, self._run_stage, name, run, inputs,
+                                             started)
+                        running[future] = name
+                        pending.remove(name)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        self.errors[name] = f"{type(e).__name__}: {e}"
+                        continue
+                    if on_complete is not None:
+                        on_complete(name, results[name])
+
+        self.elapsed = time.perf_counter() - started
+        return results
+
+    def _run_stage(self, name: str, run: Callable[[Dict[str, Any]], Any], inputs: Dict[str, Any],
+                   started: float) -> Any:
+        begin = time.perf_counter()
+        try:
+            with trace_span(name, "stage"):
+                return run(inputs)
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = {"start": begin - started, "seconds": end - begin}
+
+    def report(self) -> Dict[str, Any]:
+        """Per-stage timings, wall time versus running the same stages one after another, and errors"""
+        return {
+            "stages": self.timings,
+            "wall_seconds": self.elapsed,
+            "sequential_seconds": sum(timing["seconds"] for timing in self.timings.values()),
+            "errors": self.errors,
+        }
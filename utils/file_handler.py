@@ -1,7 +1,11 @@
 import os
 import shutil
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Iterator
 import json
+from utils.ast_index import ASTCache, ModuleIndex, Symbol
+
+# Directories never worth scanning for source files
+DEFAULT_EXCLUDE_DIRS = ('.git', '__pycache__', '.venv', 'venv', 'node_modules', '.tox', '.cache', '.mypy_cache', '.pytest_cache')
 
 class FileHandler:
     def __init__(self, workspace_dir: str = "workspace"):
@@ -35,15 +39,32 @@ class FileHandler:
     
     def list_files(self, directory: str, extensions: List[str] = None) -> List[str]:
         """List files in directory with optional extension filter"""
-        files = []
+        return [entry.path for entry in self.iter_files(directory, extensions, exclude_dirs=())]
+    
+    def iter_files(self, directory: str, extensions: List[str] = None,
+                   exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS) -> Iterator[os.DirEntry]:
+        """Lazily walk directory with os.scandir, yielding matching file entries
+        
+        Entries carry cached stat results, so callers can check mtime and size
+        without another system call per file.
+        """
         if not os.path.exists(directory):
-            return files
+            return
         
-        for root, dirs, filenames in os.walk(directory):
-            for filename in filenames:
-                if extensions is None or any(filename.endswith(ext) for ext in extensions):
-                    files.append(os.path.join(root, filename))
-        return files
+        exclude = set(exclude_dirs)
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude:
+                                stack.append(entry.path)
+                        elif entry.is_file() and (extensions is None or any(entry.name.endswith(ext) for ext in extensions)):
+                            yield entry
+            except OSError:
+                continue
     
     def backup_file(self, file_path: str) -> str:
         """Create backup of file"""
@@ -55,47 +76,49 @@ class FileHandler:
             return f"Error creating backup: {str(e)}"
 
 class CodeAnalyzer:
-    @staticmethod
-    def extract_functions(code: str) -> List[Dict]:
+    """Symbol lookups over Python source.
+
+    Parsing goes through a shared content-hash keyed cache, so repeated calls
+    on the same source (agents, slicing, test selection) only parse it once.
+    """
+    
+    cache = ASTCache(max_entries=256)
+    
+    @classmethod
+    def index(cls, code: str) -> ModuleIndex:
+        """Cached parse tree and symbol table for code"""
+        return cls.cache.get(code)
+    
+    @classmethod
+    def extract_functions(cls, code: str) -> List[Dict]:
         """Extract function definitions from code"""
-        import ast
-        import inspect
-        
-        functions = []
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    func_code = ast.get_source_segment(code, node)
-                    functions.append({
-                        'name': node.name,
-                        'line_start': node.lineno,
-                        'line_end': node.end_lineno,
-                        'code': func_code or '',
-                        'args': [arg.arg for arg in node.args.args]
-                    })
-        except Exception as e:
-            print(f"Error parsing code: {str(e)}")
-        
-        return functions
+        index = cls.index(code)
+        if index.error:
+            print(f"Error parsing code: {index.error}")
+        return [symbol.to_dict() for symbol in index.functions()]
     
-    @staticmethod
-    def get_imports(code: str) -> List[str]:
+    @classmethod
+    def get_imports(cls, code: str) -> List[str]:
         """Extract import statements from code"""
-        import ast
-        
-        imports = []
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(f"import {alias.name}")
-                elif isinstance(node, ast.ImportFrom):
-                    module = node.module or ''
-                    for alias in node.names:
-                        imports.append(f"from {module} import {alias.name}")
-        except Exception as e:
-            print(f"Error extracting imports: {str(e)}")
-        
-        return imports
+        index = cls.index(code)
+        if index.error:
+            print(f"Error extracting imports: {index.error}")
+        return list(index.imports)
+    
+    @classmethod
+    def extract_calls(cls, code: str) -> Dict[str, List[str]]:
+        """Map each function name to the names of the functions it calls"""
+        index = cls.index(code)
+        if index.error:
+            print(f"Error extracting calls: {index.error}")
+        return {name: list(called) for name, called in index.calls.items()}
+    
+    @classmethod
+    def symbols(cls, code: str) -> List[Symbol]:
+        """All functions, async functions, methods and classes, nested ones included"""
+        return list(cls.index(code).symbols)
+    
+    @classmethod
+    def function_at_line(cls, code: str, line: int) -> Optional[Symbol]:
+        """Innermost function or method containing line, if any"""
+        return cls.index(code).symbol_at_line(line)
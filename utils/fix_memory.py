@@ -0,0 +1,346 @@
+import os
+import re
+import ast
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from utils.static_fixer import error_signature, function_source, insert_guard, outer_functions
+
+PLACEHOLDER_PATTERN = re.compile(r"^_v\d+$")
+
+
+class _Canonicalizer(ast.NodeTransformer):
+    """Rename a function's own names (function name, arguments, locals) to _v0, _v1, ...
+
+    Names are numbered in order of first appearance, so the function name is
+    _v0 and the arguments follow in declaration order. Globals, builtins and
+    attribute names are kept. ``seed`` continues an existing numbering, which
+    keeps the fixed version of a function aligned with the buggy one.
+    """
+
+    def __init__(self, local_names: set, seed: Optional[Dict[str, str]] = None):
+        self.local_names = local_names
+        self.mapping: Dict[str, str] = dict(seed or {})
+
+    def _rename(self, name: str) -> str:
+        if name not in self.local_names:
+            return name
+        if name not in self.mapping:
+            self.mapping[name] = f"_v{len(self.mapping)}"
+        return self.mapping[name]
+
+    def visit_FunctionDef(self, node):
+        node.name = self._rename(node.name)
+        return self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_arg(self, node):
+        node.arg = self._rename(node.arg)
+        node.annotation = None
+        return node
+
+    def visit_Name(self, node):
+        node.id = self._rename(node.id)
+        return node
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            node.name = self._rename(node.name)
+        return self.generic_visit(node)
+
+
+def _local_names(function: ast.AST) -> set:
+    names = {function.name}
+    for node in ast.walk(function):
+        if isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+    return names
+
+
+def _strip_docstring(function: ast.AST) -> Optional[ast.stmt]:
+    body = function.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        function.body = body[1:] or [ast.Pass()]
+        return body[0]
+    return None
+
+
+def canonicalize(source: str, seed: Optional[Dict[str, str]] = None) -> Optional[Tuple[ast.AST, Dict[str, str]]]:
+    """Parse one function's source into its canonical (renamed, docstring-free) form"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    if not tree.body or not isinstance(tree.body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return None
+    function = tree.body[0]
+    function.decorator_list = []
+    function.returns = None
+    _strip_docstring(function)
+    local_names = _local_names(function) | set(seed or {})
+    canonicalizer = _Canonicalizer(local_names, seed)
+    canonicalizer.visit(function)
+    return function, canonicalizer.mapping
+
+
+def shape_tokens(function: ast.AST) -> List[str]:
+    """Preorder node types of a function, the identifier-free 'shape' of its code"""
+    tokens = []
+
+    def visit(node):
+        tokens.append(type(node).__name__)
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    for statement in function.body:
+        visit(statement)
+    return tokens
+
+
+class FixPatternMemory:
+    """Local store of past successful fixes, retrieved by similarity.
+
+    Every function changed by a validated fix is stored as a pattern: the
+    normalized error signature, the canonical buggy and fixed versions of the
+    function (own names replaced by _v0, _v1, ...) and, when the fix only added
+    statements at the top of the function, those guard statements. Patterns
+    are indexed by a hashed n-gram vector of the error signature and the AST
+    shape of the buggy function; all vectors live in one NumPy matrix so a
+    lookup is a single matrix-vector product.
+
+    A retrieved pattern is re-applied to a new function either verbatim (same
+    canonical code) or by inserting its guard statements, mapped onto the new
+    function's argument names.
+    """
+
+    def __init__(self, db_path: str = ".cache/fix_patterns/patterns.db", dimensions: int = 2048):
+        self.db_path = db_path
+        self.dimensions = dimensions
+        self.stats = {"lookups": 0, "hits": 0, "recorded": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS patterns (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                error_signature TEXT NOT NULL,
+                shape TEXT NOT NULL,
+                before TEXT NOT NULL,
+                after TEXT NOT NULL,
+                guard TEXT,
+                arg_count INTEGER NOT NULL,
+                names TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created REAL NOT NULL,
+                applied INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        self._conn.commit()
+        self._load_matrix()
+
+    def _load_matrix(self):
+        rows = self._conn.execute("SELECT id, vector FROM patterns ORDER BY id").fetchall()
+        self._ids = [row[0] for row in rows]
+        self._matrix = np.zeros((len(rows), self.dimensions), dtype=np.float32)
+        for i, (_, vector) in enumerate(rows):
+            stored = np.frombuffer(vector, dtype=np.float32)
+            if stored.shape[0] == self.dimensions:
+                self._matrix[i] = stored
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def vectorize(self, signature: str, shape: List[str]) -> np.ndarray:
+        """Hashed, L2-normalized n-gram features of an error signature and an AST shape"""
+        features: List[Tuple[str, float]] = []
+        words = signature.replace(":", " : ").split()
+        if words:
+            features.append(("type=" + words[0], 3.0))
+        features.extend(("w=" + word, 1.0) for word in words[1:])
+        features.extend((f"w2={a} {b}", 1.0) for a, b in zip(words, words[1:]))
+        features.extend((f"s2={a} {b}", 0.5) for a, b in zip(shape, shape[1:]))
+        features.extend((f"s3={a} {b} {c}", 0.5) for a, b, c in zip(shape, shape[1:], shape[2:]))
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in features:
+            vector[zlib.crc32(feature.encode("utf-8")) % self.dimensions] += weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def record(self, error_message: str, original_code: str, fixed_code: str) -> int:
+        """Store a pattern for every top-level function or method the fix changed"""
+        signature = error_signature(error_message)
+        fixed_by_name = {symbol.qualname: symbol for symbol in outer_functions(fixed_code)}
+        recorded = 0
+        for symbol in outer_functions(original_code):
+            fixed = fixed_by_name.get(symbol.qualname)
+            if fixed is None or fixed.code.strip() == symbol.code.strip():
+                continue
+            if self._record_function(signature, function_source(original_code, symbol),
+                                     function_source(fixed_code, fixed)):
+                recorded += 1
+        return recorded
+
+    def _record_function(self, signature: str, before_source: str, after_source: str) -> bool:
+        before = canonicalize(before_source)
+        if before is None:
+            return False
+        before_function, mapping = before
+        after = canonicalize(after_source, seed=mapping)
+        if after is None:
+            return False
+        after_function, after_mapping = after
+
+        before_text = ast.unparse(before_function)
+        after_text = ast.unparse(after_function)
+        if before_text == after_text:
+            return False
+        arg_count = len(before_function.args.posonlyargs) + len(before_function.args.args)
+        guard = self._guard(before_function, after_function, arg_count, mapping)
+        # Names the fix introduced keep their original spelling when re-applied
+        new_names = {placeholder: name for name, placeholder in after_mapping.items() if name not in mapping}
+        vector = self.vectorize(signature, shape_tokens(before_function))
+        key = hashlib.sha256(f"{signature}\0{before_text}\0{after_text}".encode("utf-8")).hexdigest()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO patterns (key, error_signature, shape, before, after, guard, arg_count, "
+                "names, vector, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, signature, hashlib.sha1(before_text.encode("utf-8")).hexdigest(), before_text, after_text,
+                 guard, arg_count, json.dumps(new_names), vector.tobytes(), time.time())
+            )
+            self._conn.commit()
+            if cursor.rowcount == 0:
+                return False
+            self._ids.append(cursor.lastrowid)
+            self._matrix = np.vstack([self._matrix, vector[None, :]])
+            self.stats["recorded"] += 1
+        return True
+
+    @staticmethod
+    def _guard(before: ast.AST, after: ast.AST, arg_count: int, mapping: Dict[str, str]) -> Optional[str]:
+        """Statements the fix prepended to the body, if that is all it changed"""
+        before_body = [ast.dump(statement) for statement in before.body]
+        after_body = [ast.dump(statement) for statement in after.body]
+        inserted = len(after_body) - len(before_body)
+        if inserted <= 0 or after_body[inserted:] != before_body:
+            return None
+        guard = after.body[:inserted]
+        # A guard may only use the arguments (or names it introduces itself)
+        argument_placeholders = {f"_v{i}" for i in range(1, arg_count + 1)}
+        original_placeholders = set(mapping.values())
+        for node in ast.walk(ast.Module(body=guard, type_ignores=[])):
+            if isinstance(node, ast.Name) and node.id in original_placeholders \
+                    and node.id not in argument_placeholders:
+                return None
+        return "\n".join(ast.unparse(statement) for statement in guard)
+
+    def lookup(self, error_message: str, source: str, top_k: int = 3,
+               min_similarity: float = 0.75) -> List[Dict[str, Any]]:
+        """Most similar stored patterns for a faulting function (given its source), best first"""
+        canonical = canonicalize(source)
+        results = []
+        with self._lock:
+            self.stats["lookups"] += 1
+            if canonical is None or not self._ids:
+                return results
+            query = self.vectorize(error_signature(error_message), shape_tokens(canonical[0]))
+            scores = self._matrix @ query
+            for i in np.argsort(-scores)[:top_k]:
+                if scores[i] < min_similarity:
+                    break
+                row = self._conn.execute(
+                    "SELECT error_signature, shape, before, after, guard, arg_count, names FROM patterns "
+                    "WHERE id = ?", (self._ids[i],)
+                ).fetchone()
+                results.append({
+                    "id": self._ids[i], "similarity": float(scores[i]), "error_signature": row[0],
+                    "shape": row[1], "before": row[2], "after": row[3], "guard": row[4],
+                    "arg_count": row[5], "names": json.loads(row[6])
+                })
+        return results
+
+    def apply(self, pattern: Dict[str, Any], code: str, function_name: str) -> Optional[str]:
+        """Module source with the pattern applied to function_name, or None if it does not fit"""
+        symbol = next((s for s in outer_functions(code) if s.qualname == function_name), None)
+        if symbol is None:
+            return None
+        canonical = canonicalize(function_source(code, symbol))
+        if canonical is None:
+            return None
+        function, mapping = canonical
+        names = dict(pattern["names"])
+        names.update({placeholder: name for name, placeholder in mapping.items()})
+
+        if ast.unparse(function) == pattern["before"]:
+            return self._replace_function(code, symbol, pattern["after"], names)
+        if pattern["guard"] and len(function.args.posonlyargs) + len(function.args.args) >= pattern["arg_count"]:
+            return self._insert_guard(code, symbol, pattern["guard"], names)
+        return None
+
+    def mark_applied(self, pattern_id: int):
+        with self._lock:
+            self._conn.execute("UPDATE patterns SET applied = applied + 1 WHERE id = ?", (pattern_id,))
+            self._conn.commit()
+            self.stats["hits"] += 1
+
+    @staticmethod
+    def _rename(source: str, names: Dict[str, str]) -> Optional[str]:
+        """Replace placeholders with real names; None if any placeholder is left unmapped"""
+        tree = ast.parse(source)
+        for node in ast.walk(tree):
+            for attribute in ("id", "arg", "name"):
+                value = getattr(node, attribute, None)
+                if isinstance(value, str) and PLACEHOLDER_PATTERN.match(value):
+                    if value not in names:
+                        return None
+                    setattr(node, attribute, names[value])
+        return ast.unparse(tree)
+
+    def _replace_function(self, code: str, symbol, after: str, names: Dict[str, str]) -> Optional[str]:
+        fixed = self._rename(after, names)
+        if fixed is None:
+            return None
+        function = ast.parse(fixed).body[0]
+        # Keep the function's own docstring and annotations (decorators sit above the replaced lines)
+        original = ast.parse(function_source(code, symbol)).body[0]
+        docstring = _strip_docstring(original)
+        if docstring is not None:
+            function.body.insert(0, docstring)
+        function.returns = original.returns
+        annotations = {arg.arg: arg.annotation for arg in ast.walk(original.args) if isinstance(arg, ast.arg)}
+        for arg in ast.walk(function.args):
+            if isinstance(arg, ast.arg):
+                arg.annotation = annotations.get(arg.arg)
+        lines = code.splitlines(keepends=True)
+        start = symbol.line_start - 1
+        indent = lines[start][:len(lines[start]) - len(lines[start].lstrip())]
+        replacement = "".join(indent + line + "\n" if line.strip() else "\n"
+                              for line in ast.unparse(function).splitlines())
+        return "".join(lines[:start]) + replacement + "".join(lines[symbol.line_end:])
+
+    def _insert_guard(self, code: str, symbol, guard: str, names: Dict[str, str]) -> Optional[str]:
+        guard_source = self._rename(guard, names)
+        if guard_source is None:
+            return None
+        return insert_guard(code, symbol, guard_source)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
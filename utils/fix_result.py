@@ -0,0 +1,123 @@
+import os
+import gzip
+import json
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+SECTIONS = ("analysis", "review", "tests", "fix", "validation")
+
+
+class TranscriptLog:
+    """Gzip-compressed JSONL transcripts, one file per run.
+
+    Transcripts are written once when a run finishes and read back lazily,
+    so a long-lived process never has to keep past conversations in memory.
+    """
+
+    def __init__(self, directory: str = "logs/transcripts"):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def path_for(self, run_id: str) -> str:
+        return os.path.join(self.directory, f"{run_id}.jsonl.gz")
+
+    def write(self, run_id: str, messages: List[Dict[str, Any]]) -> str:
+        """Write a run's messages and return the transcript path"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(run_id)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, default=str) + "\n")
+        return path
+
+
+def iter_transcript(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the messages of a transcript file"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class FixResult:
+    """Compact outcome of one fix_bug run.
+
+    Only the extracted sections and summary stats are kept; the conversation
+    itself lives in the transcript file. Supports the dict-style access
+    (``result['status']``, ``result.get('results')``) that fix_bug callers use.
+    """
+
+    __slots__ = ("run_id", "status", "error", "snapshot_id", "analysis", "review", "tests", "fix",
+                 "validation", "structured_results", "result_errors", "termination", "speaker_selection",
+                 "cache", "llm_client", "compaction", "fix_memory", "static_fix", "pipeline", "resolved_by", "metrics",
+                 "transcript_path", "checkpoint_path")
+
+    def __init__(self, run_id: Optional[str] = None, status: str = "error", error: Optional[str] = None,
+                 snapshot_id: Optional[str] = None, sections: Optional[Dict[str, str]] = None,
+                 **fields: Any):
+        self.run_id = run_id
+        self.status = status
+        self.error = error
+        self.snapshot_id = snapshot_id
+        sections = sections or {}
+        for name in SECTIONS:
+            setattr(self, name, sections.get(name, ""))
+        for name in ("structured_results", "termination", "speaker_selection", "cache",
+                     "llm_client", "compaction", "fix_memory", "static_fix", "pipeline", "metrics"):
+            setattr(self, name, fields.pop(name, {}))
+        self.result_errors = fields.pop("result_errors", [])
+        # "static", "fix_memory", "pipeline" or "agents"; None when the run failed before any of them
+        self.resolved_by = fields.pop("resolved_by", None)
+        self.transcript_path = fields.pop("transcript_path", None)
+        # Set when a failed run left a checkpoint BugFixingSystem.resume can continue from
+        self.checkpoint_path = fields.pop("checkpoint_path", None)
+        if fields:
+            raise TypeError(f"Unknown FixResult fields: {', '.join(fields)}")
+
+    @property
+    def results(self) -> Dict[str, str]:
+        """Message text for each section"""
+        return {name: getattr(self, name) for name in SECTIONS}
+
+    def iter_conversation(self) -> Iterator[Dict[str, Any]]:
+        """Lazily read the conversation back from the transcript"""
+        if self.transcript_path and os.path.exists(self.transcript_path):
+            yield from iter_transcript(self.transcript_path)
+
+    @property
+    def conversation_history(self) -> List[Dict[str, Any]]:
+        """Whole conversation, loaded from disk on demand"""
+        return list(self.iter_conversation())
+
+    def _keys(self) -> List[str]:
+        return [name for name in self.__slots__ if name not in SECTIONS] + ["results"]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__ or key in ("results", "conversation_history"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return self._keys()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary (without the transcript), e.g. for JSON output"""
+        return {key: self[key] for key in self._keys()}
+
+    def __repr__(self):
+        return f"FixResult(run_id={self.run_id!r}, status={self.status!r}, snapshot_id={self.snapshot_id!r})"
@@ -0,0 +1,94 @@
+import os
+import difflib
+import contextvars
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from utils.code_executor import CodeExecutor
+from utils.metrics import trace_span
+
+
+def diff_size(original_code: str, new_code: str) -> int:
+    """Number of added or removed lines between two versions"""
+    diff = difflib.unified_diff(original_code.splitlines(), new_code.splitlines(), lineterm="", n=0)
+    return sum(1 for line in diff if line[:1] in "+-" and not line.startswith(("+++", "---")))
+
+
+class FixTournament:
+    """Validate candidate fixes side by side and pick the best one.
+
+    Every candidate is written to its own scratch directory together with the
+    tests, then tested and linted concurrently. Candidates are ranked by tests
+    passing, then by the smallest diff against the original, then by the
+    fewest lint issues.
+    """
+
+    def __init__(self, code_executor: CodeExecutor, max_workers: int = 4):
+        self.code_executor = code_executor
+        self.max_workers = max_workers
+
+    def run(self, original_code: str, candidates: List[Optional[str]], module_name: str,
+            test_code: str = "") -> Dict[str, Any]:
+        """
+        Validate all candidates and rank them
+
+        Args:
+            original_code: Source of the buggy module
+            candidates: Fixed module sources; None marks a candidate that produced no code
+            module_name: Module name the tests import
+            test_code: Pytest source exercising the module
+
+        Returns:
+            Dictionary with the winning candidate (or None) and every candidate's result
+        """
+        jobs = [(index, code) for index, code in enumerate(candidates) if code]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(jobs) or 1))) as pool:
+            # Copy the caller's context so spans land on the active tracer
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._validate, index, code,
+                            original_code, module_name, test_code)
+                for index, code in jobs
+            ]
+            results = [future.result() for future in futures]
+        results.extend(
+            {"index": index, "code": None, "tests_passed": False, "error": "no code block in reply"}
+            for index, code in enumerate(candidates) if not code
+        )
+
+        ranked = sorted((r for r in results if r["code"]), key=self._rank_key)
+        results.sort(key=lambda r: r["index"])
+        return {"best": ranked[0] if ranked else None, "candidates": results}
+
+    @staticmethod
+    def _rank_key(result: Dict[str, Any]) -> tuple:
+        return (not result["tests_passed"], result["diff_size"], result["lint_issues"])
+
+    def _validate(self, index: int, code: str, original_code: str, module_name: str,
+                  test_code: str) -> Dict[str, Any]:
+        """Run the tests (or the module itself when there are none) and flake8 on one candidate"""
+        with trace_span(f"candidate_{index}", "validate"), tempfile.TemporaryDirectory() as work_dir:
+            module_path = os.path.join(work_dir, f"{module_name}.py")
+            with open(module_path, "w", encoding="utf-8") as f:
+                f.write(code)
+
+            if test_code:
+                test_path = os.path.join(work_dir, f"test_{module_name}.py")
+                with open(test_path, "w", encoding="utf-8") as f:
+                    f.write(test_code)
+                # Candidates sharing the tests reuse each other's results for unchanged functions
+                result = self.code_executor.run_tests_incremental(test_path, module_code=code)
+                passed, output = result['success'], result['output']
+            else:
+                passed, stdout, stderr = self.code_executor.execute_python(code, file_path=module_path)
+                output = stdout + stderr
+
+            _, lint_output = self.code_executor.lint_code(module_path)
+
+        return {
+            "index": index,
+            "code": code,
+            "tests_passed": passed,
+            "diff_size": diff_size(original_code, code),
+            "lint_issues": sum(1 for line in lint_output.splitlines() if line.strip()),
+            "output": output[-2000:]
+        }
@@ -0,0 +1,140 @@
+import re
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+from utils.result_extractor import parse_message
+
+FENCED_BLOCK_PATTERN = re.compile(r"```([\w+-]*)[ \t]*\n(.*?)```", re.DOTALL)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough token count (4 characters per token), as used by the termination budget"""
+    return sum(len(message.get("content") or "") // 4 for message in messages if isinstance(message.get("content"), str))
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha1(code.strip().encode("utf-8")).hexdigest()[:8]
+
+
+class HistoryCompactor:
+    """``process_all_messages_before_reply`` hook that shrinks the history an agent sends.
+
+    Neither step touches the stored group chat messages:
+
+    * Once the history is over ``max_tokens``, every turn except the task
+      message and the last ``keep_recent`` turns is replaced by one message of
+      role-tagged summaries (result blocks when present, otherwise the opening
+      text). The latest code version is always kept verbatim.
+    * Repeated code blocks are deduplicated by hash. Only the latest copy of
+      each block stays verbatim; earlier copies become a short reference.
+    """
+
+    def __init__(self, max_tokens: int = 6000, keep_recent: int = 4, summary_chars: int = 300):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.summary_chars = summary_chars
+        self.stats = {"calls": 0, "compactions": 0, "code_blocks_deduped": 0,
+                      "tokens_before": 0, "tokens_after": 0}
+        self._lock = threading.Lock()
+
+    def __call__(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not messages:
+            return messages
+        before = estimate_tokens(messages)
+        compacted, deduped = self._dedupe_code(messages)
+
+        summarized = False
+        if estimate_tokens(compacted) > self.max_tokens:
+            # Summarize the raw turns so no code block is only referenced from a summarized turn
+            summary, summarized = self._summarize(messages)
+            if summarized:
+                compacted, deduped = self._dedupe_code(summary)
+
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["code_blocks_deduped"] += deduped
+            self.stats["compactions"] += int(summarized)
+            self.stats["tokens_before"] += before
+            self.stats["tokens_after"] += estimate_tokens(compacted)
+        return compacted
+
+    @staticmethod
+    def _dedupe_code(messages: List[Dict[str, Any]]):
+        """Replace all but the latest copy of each repeated code block with a reference"""
+        latest: Dict[str, tuple] = {}
+        for index, message in enumerate(messages):
+            content = message.get("content")
+            if isinstance(content, str):
+                for block in FENCED_BLOCK_PATTERN.finditer(content):
+                    latest[code_hash(block.group(2))] = (index, block.start(), message.get("name", message.get("role")))
+
+        deduped = 0
+        result = []
+        for index, message in enumerate(messages):
+            content = message.get("content")
+            if not isinstance(content, str) or "```" not in content:
+                result.append(message)
+                continue
+
+            def replace(block):
+                nonlocal deduped
+                digest = code_hash(block.group(2))
+                if latest[digest][:2] == (index, block.start()):
+                    return block.group(0)
+                reference = f"[code #{digest}, {block.group(2).count(chr(10))} lines: repeated verbatim later by {latest[digest][2]}]"
+                if len(reference) >= len(block.group(0)):
+                    return block.group(0)
+                deduped += 1
+                return reference
+
+            new_content = FENCED_BLOCK_PATTERN.sub(replace, content)
+            result.append(message if new_content == content else dict(message, content=new_content))
+        return result, deduped
+
+    def _summarize(self, messages: List[Dict[str, Any]]):
+        """Collapse the middle of the history into one message of per-turn summaries"""
+        if len(messages) <= self.keep_recent + 2:
+            return messages, False
+        head, middle, tail = messages[:1], messages[1:-self.keep_recent], messages[-self.keep_recent:]
+        # Leave tool/function call exchanges alone; their pairing must be preserved
+        if any(not isinstance(m.get("content"), str) or m.get("tool_calls") or m.get("function_call")
+               or m.get("role") in ("tool", "function") for m in middle):
+            return messages, False
+
+        lines = ["Summary of earlier turns (compacted to save context):"]
+        for message in middle:
+            name = message.get("name") or message.get("role")
+            lines.append(f"- [{name}] {self._summarize_message(message['content'])}")
+
+        latest_code = self._latest_code(messages)
+        if latest_code is not None and 1 <= latest_code[0] < len(messages) - self.keep_recent:
+            index, code = latest_code
+            name = messages[index].get("name") or messages[index].get("role")
+            lines.append(f"\nLatest code version (from {name}), verbatim:\n```python\n{code}```")
+
+        summary = {"role": "user", "name": "HistoryCompactor", "content": "\n".join(lines)}
+        return head + [summary] + tail, True
+
+    def _summarize_message(self, content: str) -> str:
+        parsed = parse_message(content)
+        if parsed["results"]:
+            return json.dumps(parsed["results"][-1], separators=(",", ":"))[:self.summary_chars * 2]
+
+        def stub(block):
+            return f"[code #{code_hash(block.group(2))}, {block.group(2).count(chr(10))} lines]"
+
+        text = FENCED_BLOCK_PATTERN.sub(stub, content)
+        text = " ".join(text.split())
+        return text if len(text) <= self.summary_chars else text[:self.summary_chars] + "..."
+
+    @staticmethod
+    def _latest_code(messages: List[Dict[str, Any]]) -> Optional[tuple]:
+        """(message index, code) of the last python code block in the history"""
+        for index in range(len(messages) - 1, -1, -1):
+            content = messages[index].get("content")
+            if isinstance(content, str):
+                code = parse_message(content)["code"]
+                if code:
+                    return index, code[-1]
+        return None
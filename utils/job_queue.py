@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+
+def idempotency_key(bug_report: Dict[str, Any]) -> str:
+    """Default dedupe key: the report itself plus the current content of its file"""
+    digest = hashlib.sha256(json.dumps(bug_report, sort_keys=True, default=str).encode("utf-8"))
+    try:
+        with open(bug_report.get('file_path', ''), 'rb') as f:
+            digest.update(f.read())
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+class JobQueue:
+    """Durable bug report queue with leases, retries and stage checkpoints.
+
+    SQLite stands in for a real broker: any number of worker processes on
+    one machine claim jobs with a visibility timeout. Workers on other
+    machines cannot share the queue, since SQLite's WAL locking does not
+    work over network filesystems and the stores workers depend on (fix
+    memory, snapshots, chat checkpoints) live under the local ``.cache``
+    too. A job whose worker stops heartbeating becomes
+    claimable again once its lease expires, and resumes from the last stage
+    checkpoint its previous attempt saved. Failed attempts are retried with
+    exponential backoff until ``max_attempts``, after which the job is dead.
+
+    Submitting the same report twice returns the existing job instead of
+    queueing a duplicate (see ``idempotency_key``).
+    """
+
+    def __init__(self, db_path: str = ".cache/jobs/queue.db", max_attempts: int = 3,
+                 backoff_base: float = 5.0, backoff_max: float = 300.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, so claims can take the write lock with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                idempotency_key TEXT UNIQUE NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoints (
+                job_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (job_id, stage)
+            )"""
+        )
+
+    def submit(self, bug_report: Dict[str, Any], key: Optional[str] = None,
+               max_attempts: Optional[int] = None) -> str:
+        """Queue a bug report; returns the job id (the existing one for a repeated key)"""
+        key = key or idempotency_key(bug_report)
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR IGNORE INTO jobs (id, idempotency_key, payload, status, max_attempts,
+                                               available_at, created, updated)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (job_id, key, json.dumps(bug_report), QUEUED, max_attempts or self.max_attempts, now, now, now)
+            )
+            row = self._conn.execute("SELECT id FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+        return row["id"]
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest ready job to worker_id
+
+        Ready means queued and past its backoff, or running with an expired
+        lease (its worker died). Expired jobs out of attempts are marked dead.
+
+        Returns:
+            Job dictionary with the bug report under "payload", or None
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """UPDATE jobs SET status = ?, error = COALESCE(error, 'lease expired'), lease_owner = NULL,
+                                      updated = ?
+                       WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts""",
+                    (DEAD, now, RUNNING, now)
+                )
+                row = self._conn.execute(
+                    """SELECT id FROM jobs
+                       WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)
+                       ORDER BY available_at LIMIT 1""",
+                    (QUEUED, now, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    """UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?,
+                                      updated = ?
+                       WHERE id = ?""",
+                    (RUNNING, worker_id, now + visibility_timeout, now, row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        """Extend the lease; False if the worker no longer holds it"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (time.time() + visibility_timeout, time.time(), job_id, worker_id, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a finished job; False if the lease was lost meanwhile"""
+        with self._lock:
+            cursor = self._conn.execute(
+                """UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, updated = ?
+                   WHERE id = ? AND lease_owner = ? AND status = ?""",
+                (DONE, json.dumps(result, default=str), time.time(), job_id, worker_id, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt, requeueing with backoff while attempts remain
+
+        Returns:
+            New status ("queued" or "dead"), or None if the lease was lost meanwhile
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+                                     (job_id, worker_id)).fetchone()
+            if row is None:
+                return None
+            status = DEAD if row["attempts"] >= row["max_attempts"] else QUEUED
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (row["attempts"] - 1))
+            # Jitter so jobs that failed together do not retry in lockstep
+            delay *= random.uniform(0.5, 1.0)
+            self._conn.execute(
+                """UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, updated = ?
+                   WHERE id = ?""",
+                (status, error, time.time() + delay, time.time(), job_id)
+            )
+        return status
+
+    def retry(self, job_id: str) -> bool:
+        """Requeue a dead job immediately with a fresh attempt budget"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated = ? WHERE id = ? AND status = ?",
+                (QUEUED, time.time(), time.time(), job_id, DEAD)
+            )
+        return cursor.rowcount == 1
+
+    def save_checkpoint(self, job_id: str, worker_id: str, stage: str, data: Any) -> bool:
+        """Persist a finished stage's output; ignored if the worker lost the lease"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                owner = self._conn.execute("SELECT lease_owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                saved = owner is not None and owner["lease_owner"] == worker_id
+                if saved:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO checkpoints (job_id, stage, data, created) VALUES (?, ?, ?, ?)",
+                        (job_id, stage, json.dumps(data, default=str), time.time())
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return saved
+
+    def checkpoints(self, job_id: str) -> Dict[str, Any]:
+        """Stage name -> saved output for every stage the job finished so far"""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, data FROM checkpoints WHERE job_id = ?", (job_id,)).fetchall()
+        return {row["stage"]: json.loads(row["data"]) for row in rows}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Job summaries (without payload or result), newest first"""
+        query = "SELECT id, status, attempts, max_attempts, error, created, updated FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created DESC LIMIT ?", params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, DEAD)}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class StageCheckpoints:
+    """The checkpoints of one leased job, in the shape fix_bug expects"""
+
+    def __init__(self, queue: JobQueue, job_id: str, worker_id: str):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+
+    def load(self) -> Dict[str, Any]:
+        return self.queue.checkpoints(self.job_id)
+
+    def save(self, stage: str, data: Any):
+        self.queue.save_checkpoint(self.job_id, self.worker_id, stage, data)
@@ -0,0 +1,318 @@
+import time
+import queue
+import random
+import atexit
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, Optional
+import httpx
+import openai
+from autogen.oai.client import OpenAIClient
+
+# Errors worth retrying: throttling, dropped connections, timeouts and 5xx
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError,
+                    openai.InternalServerError)
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until amount tokens are available; returns the seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return waited
+            delay = (amount - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RetryBudget:
+    """Caps retries (and hedges) at a fraction of recent requests.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    under a sustained outage retries add at most ``ratio`` extra load instead
+    of multiplying it. ``min_per_second`` keeps a trickle of retries available
+    when traffic is low.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window_seconds = window_seconds
+        self.balance = min_per_second * window_seconds
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        cap = max(self.min_per_second * self.window_seconds, self.balance)
+        self.balance = min(cap, self.balance + (now - self.updated) * self.min_per_second)
+        self.updated = now
+
+    def deposit(self):
+        self._refill()
+        self.balance += self.ratio
+
+    def withdraw(self) -> bool:
+        self._refill()
+        if self.balance >= 1.0:
+            self.balance -= 1.0
+            return True
+        return False
+
+
+class LLMTransport:
+    """One async OpenAI/Azure client shared by every agent.
+
+    Requests from any thread are executed on a private event loop over a
+    keep-alive connection pool. Each request waits on request and token rate
+    limits, retries retryable errors with jittered exponential backoff while
+    the shared retry budget allows, and (for non-streaming calls) sends a
+    hedged duplicate when the first attempt is slower than hedge_after_seconds.
+    """
+
+    def __init__(self, llm_config: Dict[str, Any], max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 60.0,
+                 connect_timeout: float = 10.0, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 20.0, retry_budget_ratio: float = 0.2,
+                 hedge_after_seconds: Optional[float] = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after_seconds = hedge_after_seconds
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.retry_budget = RetryBudget(ratio=retry_budget_ratio)
+        self.stats = {"requests": 0, "retries": 0, "retry_budget_exhausted": 0, "hedges": 0,
+                      "hedge_wins": 0, "rate_limited_seconds": 0.0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-transport", daemon=True)
+        self._thread.start()
+
+        read_timeout = llm_config.get("timeout") or 120
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+        if (llm_config.get("api_type") or "").startswith("azure"):
+            self.client = openai.AsyncAzureOpenAI(
+                api_key=llm_config.get("api_key"),
+                azure_endpoint=llm_config.get("base_url"),
+                api_version=llm_config.get("api_version"),
+                http_client=http_client,
+                max_retries=0
+            )
+        else:
+            self.client = openai.AsyncOpenAI(
+                api_key=llm_config.get("api_key"),
+                base_url=llm_config.get("base_url"),
+                http_client=http_client,
+                max_retries=0
+            )
+        atexit.register(self.close)
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def create(self, params: Dict[str, Any]) -> Any:
+        """Blocking chat/completions call, executed on the shared loop"""
+        return asyncio.run_coroutine_threadsafe(self._create(params), self.loop).result()
+
+    def stream(self, params: Dict[str, Any]) -> Iterator[Any]:
+        """Blocking iterator over streamed chunks, fetched on the shared loop"""
+        chunks: "queue.Queue" = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                stream = await self._create(params)
+                async for chunk in stream:
+                    chunks.put(chunk)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(done)
+
+        asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def _create(self, params: Dict[str, Any]) -> Any:
+        params = {k: v for k, v in params.items() if k != "model_client_cls"}
+        estimated_tokens = self._estimate_tokens(params)
+        await self._throttle(estimated_tokens)
+        self._count("requests")
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                if params.get("stream") or not self.hedge_after_seconds:
+                    response = await self._call(params)
+                else:
+                    response = await self._hedged_call(params)
+                self._refund(estimated_tokens, response)
+                return response
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._count("errors")
+                    raise
+                if not self.retry_budget.withdraw():
+                    self._count("retry_budget_exhausted")
+                    self._count("errors")
+                    raise
+                self._count("retries")
+                await asyncio.sleep(self._backoff(attempt, e))
+                await self._throttle(estimated_tokens)
+
+    async def _call(self, params: Dict[str, Any]) -> Any:
+        if "messages" in params:
+            return await self.client.chat.completions.create(**params)
+        return await self.client.completions.create(**params)
+
+    async def _hedged_call(self, params: Dict[str, Any]) -> Any:
+        """Send a duplicate request if the first one is slow; first success wins"""
+        primary = asyncio.ensure_future(self._call(params))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after_seconds)
+        if done:
+            return primary.result()
+        # A hedge is extra load: it has to fit both the retry budget and the rate limit
+        if not self.retry_budget.withdraw() or (self.request_bucket and not self.request_bucket.try_acquire()):
+            return await primary
+
+        self._count("hedges")
+        hedge = asyncio.ensure_future(self._call(params))
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if task is hedge:
+                        self._count("hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends it"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(self.backoff_max, float(retry_after)) + random.uniform(0, self.backoff_base)
+        except ValueError:
+            pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _throttle(self, estimated_tokens: int):
+        waited = 0.0
+        if self.request_bucket is not None:
+            waited += await self.request_bucket.acquire(1)
+        if self.token_bucket is not None:
+            waited += await self.token_bucket.acquire(estimated_tokens)
+        if waited:
+            self._count("rate_limited_seconds", waited)
+
+    @staticmethod
+    def _estimate_tokens(params: Dict[str, Any]) -> int:
+        """Rough prompt size (4 characters per token) plus the completion allowance"""
+        characters = sum(len(str(m.get("content") or "")) for m in params.get("messages", []))
+        characters += len(str(params.get("prompt") or ""))
+        return characters // 4 + (params.get("max_tokens") or 0)
+
+    def _refund(self, estimated_tokens: int, response: Any):
+        """Return the unused part of the token reservation once usage is known"""
+        usage = getattr(response, "usage", None)
+        if self.token_bucket is not None and usage is not None:
+            self.token_bucket.refund(max(0, estimated_tokens - usage.total_tokens))
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.client.close(), self.loop)
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self.loop.close()
+
+
+class _Completions:
+    def __init__(self, transport: LLMTransport):
+        self.transport = transport
+
+    def create(self, **params: Any) -> Any:
+        if params.get("stream"):
+            return self.transport.stream(params)
+        return self.transport.create(params)
+
+
+class _Chat:
+    def __init__(self, transport: LLMTransport):
+        self.completions = _Completions(transport)
+
+
+class _SyncFacade:
+    """Looks enough like openai.OpenAI for OpenAIClient.create"""
+
+    def __init__(self, transport: LLMTransport):
+        self.chat = _Chat(transport)
+        self.completions = _Completions(transport)
+
+
+class SharedLLMClient(OpenAIClient):
+    """autogen model client that sends requests through a shared LLMTransport.
+
+    Selected with ``"model_client_cls": "SharedLLMClient"`` in llm_config and
+    registered on each agent with ``agent.register_model_client(SharedLLMClient,
+    transport=...)``. Response handling (streaming, usage, cost) is inherited
+    from autogen's OpenAIClient.
+    """
+
+    def __init__(self, config: Dict[str, Any], transport: LLMTransport):
+        self.config = config
+        self.transport = transport
+        self._oai_client = _SyncFacade(transport)
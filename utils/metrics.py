@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import threading
+import contextlib
+import contextvars
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+from utils.agent_hooks import TurnObserver
+
+# resolved_by values of runs that never called an LLM ("pipeline" and "agents" do)
+NO_LLM_PATHS = ("static", "fix_memory")
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar("bugfix_tracer", default=None)
+
+
+class Span:
+    """A timed unit of work (group chat round, LLM call, executor call)"""
+
+    __slots__ = ("name", "kind", "start", "duration", "attributes")
+
+    def __init__(self, name: str, kind: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.start = time.time()
+        self.duration = 0.0
+        self.attributes = attributes or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Collects spans and token counts for one fix_bug run"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id
+        self.spans: List[Span] = []
+        self.tokens: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+        span = Span(name, kind, attributes)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = str(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            with self._lock:
+                self.spans.append(span)
+
+    def add_tokens(self, role: str, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            usage = self.tokens.setdefault(role, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
+            usage["prompt_tokens"] += prompt_tokens
+            usage["completion_tokens"] += completion_tokens
+            usage["total_tokens"] += prompt_tokens + completion_tokens
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Per-stage totals: time by span kind and by name, and tokens by role"""
+        by_kind: Dict[str, Dict[str, float]] = {}
+        by_name: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            for key, table in ((span.kind, by_kind), (f"{span.kind}:{span.name}", by_name)):
+                entry = table.setdefault(key, {"count": 0, "seconds": 0.0})
+                entry["count"] += 1
+                entry["seconds"] += span.duration
+        return {
+            "run_id": self.run_id,
+            "rounds": sum(1 for span in self.spans if "round" in span.attributes),
+            "by_kind": by_kind,
+            "by_stage": by_name,
+            "tokens": self.tokens,
+        }
+
+    def export_jsonl(self, path: str):
+        """Append this run's spans to a JSON lines file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(path, "a", encoding="utf-8") as f:
+            for span in self.spans:
+                record = span.to_dict()
+                record["run_id"] = self.run_id
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+@contextlib.contextmanager
+def use_tracer(tracer: Optional[Tracer]):
+    """Make tracer the target of trace_span calls in the current context"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Tracer active in the current context, if any"""
+    return _current_tracer.get()
+
+
+@contextlib.contextmanager
+def trace_span(name: str, kind: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a span on the active tracer; a no-op when no run is being traced"""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, kind, **attributes) as span:
+        yield span
+
+
+class TurnTracer(TurnObserver):
+    """Turn observer that records a span and token usage for every group chat round"""
+
+    def __init__(self, tracer: Tracer, executor_name: str = "UserProxy"):
+        self.tracer = tracer
+        self.executor_name = executor_name
+        self.round = 0
+        self._open: Dict[str, Any] = {}
+        self._tracked: Dict[str, Any] = {}
+
+    def track(self, agent):
+        """Attribute an agent's token usage outside of turns (e.g. the chat manager) at finish()"""
+        self._tracked[agent.name] = (agent, self.usage(agent))
+
+    def finish(self):
+        for name, (agent, before) in self._tracked.items():
+            after = self.usage(agent)
+            if after != before:
+                self.tracer.add_tokens(name, after[0] - before[0], after[1] - before[1])
+        self._tracked = {}
+
+    def on_turn_start(self, agent, sender, messages):
+        self.round += 1
+        kind = "executor" if agent.name == self.executor_name else "llm"
+        context = self.tracer.span(agent.name, kind, round=self.round)
+        span = context.__enter__()
+        self._open[agent.name] = (context, span, self.usage(agent))
+
+    def on_turn_end(self, agent, reply, error):
+        context, span, before = self._open.pop(agent.name, (None, None, None))
+        if context is None:
+            return
+        after = self.usage(agent)
+        prompt = after[0] - before[0]
+        completion = after[1] - before[1]
+        span.attributes.update(prompt_tokens=prompt, completion_tokens=completion)
+        if prompt or completion:
+            self.tracer.add_tokens(agent.name, prompt, completion)
+        if error is not None:
+            context.__exit__(type(error), error, error.__traceback__)
+        else:
+            context.__exit__(None, None, None)
+
+    @staticmethod
+    def usage(agent) -> tuple:
+        """Cumulative (prompt, completion) tokens actually sent by an agent's client"""
+        summary = getattr(getattr(agent, "client", None), "actual_usage_summary", None) or {}
+        prompt = completion = 0
+        for model, usage in summary.items():
+            if isinstance(usage, dict):
+                prompt += usage.get("prompt_tokens", 0)
+                completion += usage.get("completion_tokens", 0)
+        return prompt, completion
+
+
+class MetricsRegistry:
+    """Aggregates traced runs and renders them in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs: Dict[str, int] = {}
+        self.resolved_by: Dict[str, int] = {}
+        self.span_seconds: Dict[tuple, List[float]] = {}
+        self.tokens: Dict[tuple, int] = {}
+
+    def observe(self, tracer: Tracer, status: str, resolved_by: Optional[str] = None):
+        with self._lock:
+            self.runs[status] = self.runs.get(status, 0) + 1
+            if resolved_by:
+                self.resolved_by[resolved_by] = self.resolved_by.get(resolved_by, 0) + 1
+            for span in tracer.spans:
+                entry = self.span_seconds.setdefault((span.kind, span.name), [0, 0.0])
+                entry[0] += 1
+                entry[1] += span.duration
+            for role, usage in tracer.tokens.items():
+                for kind in ("prompt", "completion"):
+                    key = (role, kind)
+                    self.tokens[key] = self.tokens.get(key, 0) + usage[f"{kind}_tokens"]
+
+    def no_llm_fraction(self) -> float:
+        """Share of observed runs that were resolved without any LLM call"""
+        with self._lock:
+            total = sum(self.runs.values())
+            without_llm = sum(self.resolved_by.get(path, 0) for path in NO_LLM_PATHS)
+        return without_llm / total if total else 0.0
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP bugfix_runs_total Completed fix_bug runs by status",
+            "# TYPE bugfix_runs_total counter",
+        ]
+        with self._lock:
+            for status, count in sorted(self.runs.items()):
+                lines.append(f'bugfix_runs_total{{status="{status}"}} {count}')
+            lines += [
+                "# HELP bugfix_runs_resolved_total Successful runs by the path that resolved them",
+                "# TYPE bugfix_runs_resolved_total counter",
+            ]
+            for path, count in sorted(self.resolved_by.items()):
+                lines.append(f'bugfix_runs_resolved_total{{path="{path}"}} {count}')
+            lines += [
+                "# HELP bugfix_stage_seconds Time spent per stage",
+                "# TYPE bugfix_stage_seconds summary",
+            ]
+            for (kind, name), (count, seconds) in sorted(self.span_seconds.items()):
+                labels = f'kind="{kind}",stage="{name}"'
+                lines.append(f"bugfix_stage_seconds_sum{{{labels}}} {seconds:.6f}")
+                lines.append(f"bugfix_stage_seconds_count{{{labels}}} {count}")
+            lines += [
+                "# HELP bugfix_tokens_total LLM tokens used per agent role",
+                "# TYPE bugfix_tokens_total counter",
+            ]
+            for (role, kind), count in sorted(self.tokens.items()):
+                lines.append(f'bugfix_tokens_total{{role="{role}",type="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Expose /metrics over HTTP from a background thread"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
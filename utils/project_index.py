@@ -0,0 +1,376 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from utils.ast_index import ModuleIndex
+from utils.file_handler import FileHandler
+from utils.context_slicer import parse_stack_trace
+
+
+def module_name(relpath: str) -> str:
+    """Dotted module name of a path relative to the project root"""
+    parts = relpath[:-3].split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def resolve_relative(module: str, is_package: bool, source: str) -> str:
+    """Absolute module for ``from <source> import ...`` written in module"""
+    level = len(source) - len(source.lstrip("."))
+    if not level:
+        return source
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    base = package[:len(package) - (level - 1)] if level > 1 else package
+    rest = source[level:]
+    return ".".join(base + ([rest] if rest else []))
+
+
+def project_root(file_path: str) -> str:
+    """Directory a file's top-level package is imported from (its own directory outside a package)"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while os.path.exists(os.path.join(directory, "__init__.py")) and os.path.dirname(directory) != directory:
+        directory = os.path.dirname(directory)
+    return directory
+
+
+class ProjectIndex:
+    """Module import graph and symbol -> definition map for a source tree.
+
+    Kept in SQLite next to the other caches and updated incrementally: files
+    whose mtime and size are unchanged are skipped, changed ones are hashed
+    and only re-parsed when their content differs. Imports are stored as
+    absolute module names and resolved to files at query time, so adding a
+    module never forces its importers to be re-indexed. Full directory walks
+    happen at most once per ``rescan_seconds``; files on a traceback are
+    always re-checked before they are used.
+    """
+
+    def __init__(self, file_handler: FileHandler, root: str, db_path: str, rescan_seconds: float = 30.0):
+        self.file_handler = file_handler
+        self.root = os.path.abspath(root)
+        self.db_path = db_path
+        self.rescan_seconds = rescan_seconds
+        self.last_scan = 0.0
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                module TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_module ON files (module);
+            CREATE TABLE IF NOT EXISTS imports (
+                path TEXT NOT NULL,
+                target TEXT NOT NULL,
+                name TEXT,
+                alias TEXT
+            );
+            CREATE INDEX IF NOT EXISTS imports_path ON imports (path);
+            CREATE INDEX IF NOT EXISTS imports_target ON imports (target);
+            CREATE TABLE IF NOT EXISTS symbols (
+                path TEXT NOT NULL,
+                name TEXT NOT NULL,
+                qualname TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                line_start INTEGER NOT NULL,
+                line_end INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+            CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);"""
+        )
+        self._conn.commit()
+
+    def update(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files under root
+
+        Args:
+            force: Walk the tree even if the last walk was under rescan_seconds ago
+
+        Returns:
+            Counts of unchanged, re-indexed and removed files
+        """
+        counts = {"unchanged": 0, "indexed": 0, "removed": 0}
+        if not force and time.monotonic() - self.last_scan < self.rescan_seconds:
+            return counts
+
+        with self._lock:
+            known = {path: (mtime, size) for path, mtime, size in
+                     self._conn.execute("SELECT path, mtime, size FROM files")}
+        seen = set()
+        for entry in self.file_handler.iter_files(self.root, ['.py']):
+            relpath = os.path.relpath(entry.path, self.root)
+            seen.add(relpath)
+            stat = entry.stat()
+            if known.get(relpath) != (stat.st_mtime, stat.st_size) and self._index_file(relpath, stat):
+                counts["indexed"] += 1
+            else:
+                counts["unchanged"] += 1
+
+        removed = [path for path in known if path not in seen]
+        with self._lock, self._conn:
+            for path in removed:
+                self._forget(path)
+        counts["removed"] = len(removed)
+        self.last_scan = time.monotonic()
+        return counts
+
+    def refresh(self, relpaths: Iterable[str]):
+        """Re-check just these files (e.g. the ones on a traceback)"""
+        for relpath in relpaths:
+            path = os.path.join(self.root, relpath)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                with self._lock, self._conn:
+                    self._forget(relpath)
+                continue
+            with self._lock:
+                row = self._conn.execute("SELECT mtime, size FROM files WHERE path = ?", (relpath,)).fetchone()
+            if row != (stat.st_mtime, stat.st_size):
+                self._index_file(relpath, stat)
+
+    def _index_file(self, relpath: str, stat: os.stat_result) -> bool:
+        """Re-index one file unless only its stat changed; True if it was parsed"""
+        try:
+            with open(os.path.join(self.root, relpath), 'rb') as f:
+                content = f.read()
+        except OSError:
+            return False
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            row = self._conn.execute("SELECT sha256 FROM files WHERE path = ?", (relpath,)).fetchone()
+        if row is not None and row[0] == digest:
+            with self._lock, self._conn:
+                self._conn.execute("UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                                   (stat.st_mtime, stat.st_size, relpath))
+            return False
+
+        # Parsed directly rather than through CodeAnalyzer, whose shared LRU a
+        # large tree would flush for no benefit
+        module = module_name(relpath)
+        parsed = ModuleIndex(content.decode('utf-8', 'replace'))
+        imports = []
+        for source, name, alias in parsed.import_names:
+            if name is not None:
+                source = resolve_relative(module, relpath.endswith("__init__.py"), source)
+            imports.append((relpath, source, name, alias))
+        symbols = [(relpath, symbol.name, symbol.qualname, symbol.kind, symbol.line_start, symbol.line_end)
+                   for symbol in parsed.symbols]
+
+        with self._lock, self._conn:
+            self._forget(relpath)
+            self._conn.execute("INSERT INTO files (path, module, mtime, size, sha256) VALUES (?, ?, ?, ?, ?)",
+                               (relpath, module, stat.st_mtime, stat.st_size, digest))
+            self._conn.executemany("INSERT INTO imports (path, target, name, alias) VALUES (?, ?, ?, ?)", imports)
+            self._conn.executemany(
+                "INSERT INTO symbols (path, name, qualname, kind, line_start, line_end) VALUES (?, ?, ?, ?, ?, ?)",
+                symbols
+            )
+        return True
+
+    def _forget(self, relpath: str):
+        for table in ("files", "imports", "symbols"):
+            self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (relpath,))
+
+    def relpath(self, path: str) -> Optional[str]:
+        """Path relative to root, or None if path lies outside the project"""
+        relpath = os.path.relpath(os.path.abspath(path), self.root)
+        return None if relpath.startswith(os.pardir) else relpath
+
+    def path_of(self, module: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM files WHERE module = ?", (module,)).fetchone()
+        return row[0] if row else None
+
+    def imports_of(self, relpath: str) -> List[str]:
+        """Project files imported by relpath (its out-edges in the import graph)"""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT DISTINCT files.path FROM imports JOIN files
+                   ON files.module = imports.target OR files.module = imports.target || '.' || imports.name
+                   WHERE imports.path = ?""", (relpath,)
+            ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def importers_of(self, relpath: str) -> List[str]:
+        """Project files that import relpath (its in-edges)"""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT DISTINCT imports.path FROM imports JOIN files
+                   ON files.module = imports.target OR files.module = imports.target || '.' || imports.name
+                   WHERE files.path = ?""", (relpath,)
+            ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def definitions(self, name: str) -> List[Dict[str, Any]]:
+        """Every top-level definition or method called name in the project"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, qualname, kind, line_start, line_end FROM symbols WHERE name = ?", (name,)
+            ).fetchall()
+        return [dict(zip(("path", "qualname", "kind", "line_start", "line_end"), row)) for row in rows]
+
+    def resolve(self, name: str, from_path: str, depth: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        Definition that name refers to inside the file from_path
+
+        Follows ``from m import name`` (including re-exports, up to depth hops)
+        and dotted names through ``import a.b``, ``import a.b as c`` and
+        ``from package import m``, aliases included. Falls back to the only
+        definition of that name in the project, if there is exactly one.
+        """
+        found = self._resolve(name, from_path, depth)
+        if found is None and "." not in name:
+            # Attribute calls are recorded by attribute name only, so try the
+            # modules imported whole (`import m`, `from package import m`)
+            for module in self._imported_modules(from_path):
+                found = self._resolve(name, self.path_of(module), 0)
+                if found is not None:
+                    return found
+            matches = [d for d in self.definitions(name) if d["qualname"] == name and d["path"] != from_path]
+            found = matches[0] if len(matches) == 1 else None
+        return found
+
+    def _imported_modules(self, from_path: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT files.module FROM imports JOIN files
+                   ON (imports.name IS NULL AND files.module = imports.target)
+                   OR files.module = imports.target || '.' || imports.name
+                   WHERE imports.path = ?""", (from_path,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _resolve(self, name: str, from_path: str, depth: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            local = self._conn.execute(
+                "SELECT path, qualname, kind, line_start, line_end FROM symbols WHERE path = ? AND qualname = ?",
+                (from_path, name)
+            ).fetchone()
+            if local is not None:
+                return dict(zip(("path", "qualname", "kind", "line_start", "line_end"), local))
+            rows = self._conn.execute("SELECT target, name, alias FROM imports WHERE path = ?",
+                                      (from_path,)).fetchall()
+        if depth <= 0:
+            return None
+
+        # The longest prefix of name bound by an import wins, so `a.b.f` goes
+        # through `import a.b` even when `import a` is there too
+        parts = name.split(".")
+        for size in range(len(parts), 0, -1):
+            bound, rest = ".".join(parts[:size]), ".".join(parts[size:])
+            for target, imported, alias in rows:
+                if imported is None and alias is None and target.startswith(bound + "."):
+                    # `import a.b` binds the package a as well
+                    target = bound
+                elif (alias or imported or target) != bound:
+                    continue
+                found = self._resolve_import(target, imported, rest, from_path, depth)
+                if found is not None:
+                    return found
+        return None
+
+    def _resolve_import(self, target: str, imported: Optional[str], rest: str, from_path: str,
+                        depth: int) -> Optional[Dict[str, Any]]:
+        """Definition of rest (or of the import itself if rest is empty) reached through one import"""
+        if imported is None:
+            # `import target [as alias]` binds a module, which is not a definition
+            path = self.path_of(target)
+            return self._resolve(rest, path, depth - 1) if path is not None and rest else None
+        submodule = self.path_of(f"{target}.{imported}")
+        if submodule is not None:
+            # `from package import module`
+            return self._resolve(rest, submodule, depth - 1) if rest else None
+        path = self.path_of(target)
+        if path is None or path == from_path:
+            return None
+        return self._resolve(f"{imported}.{rest}" if rest else imported, path, depth - 1)
+
+    def related_definitions(self, file_path: str, code: str, stack_trace: str = "",
+                            roots: Optional[List[str]] = None, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Definitions in other project files that a bug in file_path runs through
+
+        These are the functions of traceback frames in other files, plus the
+        cross-module definitions that the faulting functions of file_path call.
+
+        Args:
+            file_path: The buggy file
+            code: Its current source
+            stack_trace: Traceback text from the bug report
+            roots: Functions of file_path already selected as relevant (e.g. by the slicer)
+            limit: Maximum number of definitions returned
+
+        Returns:
+            Dictionaries with path, qualname, line range, code and the reason each was included
+        """
+        own = self.relpath(file_path)
+        frames = []
+        for frame in parse_stack_trace(stack_trace):
+            relpath = self.relpath(frame['file'])
+            if relpath is not None and relpath.endswith(".py"):
+                frames.append(dict(frame, relpath=relpath))
+        self.refresh({frame['relpath'] for frame in frames} | ({own} if own else set()))
+
+        related: Dict[tuple, Dict[str, Any]] = {}
+        roots = list(roots or [])
+        for frame in frames:
+            if frame['relpath'] == own:
+                if frame['function'] not in roots and frame['function'] != '<module>':
+                    roots.append(frame['function'])
+                continue
+            definition = self._enclosing(frame['relpath'], frame['line'])
+            if definition is not None:
+                related.setdefault((definition['path'], definition['qualname']), dict(definition, reason="stack trace"))
+
+        if own is not None:
+            parsed = ModuleIndex(code)
+            if not roots:
+                roots = [symbol.name for symbol in parsed.functions() if symbol.parent is None]
+            for root in roots:
+                for callee in parsed.calls.get(root, []):
+                    definition = self.resolve(callee, own)
+                    if definition is not None and definition['path'] != own:
+                        related.setdefault((definition['path'], definition['qualname']),
+                                           dict(definition, reason=f"called by {root}"))
+
+        definitions = list(related.values())[:limit]
+        for definition in definitions:
+            definition['code'] = self._source(definition)
+        return definitions
+
+    def _enclosing(self, relpath: str, line: int) -> Optional[Dict[str, Any]]:
+        """Innermost function or method of relpath containing line"""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT path, qualname, kind, line_start, line_end FROM symbols
+                   WHERE path = ? AND kind != 'class' AND line_start <= ? AND line_end >= ?
+                   ORDER BY line_start DESC LIMIT 1""", (relpath, line, line)
+            ).fetchone()
+        return dict(zip(("path", "qualname", "kind", "line_start", "line_end"), row)) if row else None
+
+    def _source(self, definition: Dict[str, Any]) -> str:
+        try:
+            with open(os.path.join(self.root, definition['path']), 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return ""
+        return "\n".join(lines[definition['line_start'] - 1:definition['line_end']])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("files", "imports", "symbols")}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
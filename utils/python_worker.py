@@ -0,0 +1,150 @@
+"""
+Long-lived Python worker used by PythonWorkerPool.
+
+Reads one JSON job per line from stdin and answers with one JSON line on
+stdout. The real stdin/stdout file descriptors are kept for the protocol;
+while a job runs, fd 1 and fd 2 point at the capture files named in the job
+so user code (and any subprocesses it starts) cannot corrupt the protocol.
+"""
+
+import os
+import sys
+import json
+import runpy
+import signal
+import threading
+import importlib
+import traceback
+
+
+def _current_rss_kb() -> int:
+    """Resident set size of this process in KB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except Exception:
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except Exception:
+            return 0
+
+
+def _is_internal_frame(filename: str) -> bool:
+    return filename == os.path.abspath(__file__) or os.path.basename(filename) in ("runpy.py", "<frozen runpy>")
+
+
+def _signal_handlers():
+    handlers = {}
+    for signum in signal.valid_signals():
+        try:
+            handlers[signum] = signal.getsignal(signum)
+        except (OSError, ValueError):
+            continue
+    return handlers
+
+
+def _restore_signal_handlers(handlers):
+    for signum, handler in handlers.items():
+        if handler is not None and signal.getsignal(signum) is not handler:
+            try:
+                signal.signal(signum, handler)
+            except (OSError, ValueError):
+                pass
+
+
+def _run_job(job):
+    """Run a script or module the way `python <path>` / `python -m <module>` would"""
+    saved_modules = set(sys.modules)
+    saved_path = list(sys.path)
+    saved_argv = list(sys.argv)
+    saved_cwd = os.getcwd()
+    saved_environ = dict(os.environ)
+    saved_handlers = _signal_handlers()
+    returncode = 0
+
+    try:
+        if job.get("cwd"):
+            os.chdir(job["cwd"])
+        if job.get("module"):
+            sys.argv = [job["module"]] + job.get("args", [])
+            sys.path.insert(0, os.getcwd())
+            runpy.run_module(job["module"], run_name="__main__", alter_sys=True)
+        else:
+            path = os.path.abspath(job["path"])
+            sys.argv = [path] + job.get("args", [])
+            sys.path.insert(0, os.path.dirname(path))
+            runpy.run_path(path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            returncode = 0
+        elif isinstance(e.code, int):
+            returncode = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException as e:
+        # Hide the worker and runpy frames so tracebacks match `python <path>`
+        tb = e.__traceback__
+        while tb is not None and _is_internal_frame(tb.tb_frame.f_code.co_filename):
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        returncode = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(saved_cwd)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        if dict(os.environ) != saved_environ:
+            os.environ.clear()
+            os.environ.update(saved_environ)
+        _restore_signal_handlers(saved_handlers)
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+
+    return returncode
+
+
+def main():
+    # Keep private copies of the protocol pipes, then detach fds 0/1
+    proto_in = os.fdopen(os.dup(0), "r")
+    proto_out = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    for name in sys.argv[1:]:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    proto_out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    proto_out.flush()
+
+    for line in proto_in:
+        job = json.loads(line)
+        stdout_fd = os.open(job["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        stderr_fd = os.open(job["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        saved_stderr = os.dup(2)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        try:
+            returncode = _run_job(job)
+        finally:
+            os.dup2(devnull, 1)
+            os.dup2(saved_stderr, 2)
+            os.close(saved_stderr)
+            os.close(stdout_fd)
+            os.close(stderr_fd)
+
+        # Threads the job left running keep its state alive; the pool replaces this worker
+        dirty = threading.active_count() > 1
+        proto_out.write(json.dumps({"returncode": returncode, "rss_kb": _current_rss_kb(), "dirty": dirty}) + "\n")
+        proto_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import re
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from utils.file_handler import FileHandler
+from utils.code_executor import CodeExecutor
+from utils.project_index import module_name, project_root
+
+LINT_LINE_PATTERN = re.compile(r"^(?P<file>.+?):(?P<line>\d+):(?P<col>\d+): (?P<code>[A-Z]+\d+) (?P<message>.*)$")
+
+# flake8 codes that almost always mean a real bug (syntax errors, undefined names)
+SEVERE_LINT_PREFIXES = ("E9", "F63", "F7", "F82")
+
+
+class RepoScanner:
+    """Cheap, non-LLM triage pass over a source tree.
+
+    Every Python module is executed with CodeExecutor and linted with flake8,
+    then ranked by failure signal. Modules run as ``python -m`` from the
+    directory their top-level package is imported from, so package imports
+    resolve as they would in use. Results are kept in an mtime/size/hash
+    manifest, per scanned root and keyed by paths relative to it, so unchanged
+    files are not re-run on the next scan from any working directory; only
+    failing modules are turned into bug reports for the agents.
+    """
+
+    def __init__(self, file_handler: FileHandler, code_executor: CodeExecutor,
+                 manifest_path: str = ".cache/scan_manifest.json", run_modules: bool = True,
+                 lint: bool = True, max_workers: int = 4, checkpoint_every: int = 500):
+        self.file_handler = file_handler
+        self.code_executor = code_executor
+        self.manifest_path = manifest_path
+        self.run_modules = run_modules
+        self.lint = lint
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+        # Scanned root (absolute) -> path relative to it -> record
+        self.manifest: Dict[str, Dict[str, Dict[str, Any]]] = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_manifest(self):
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def scan(self, root: str) -> Dict[str, Any]:
+        """
+        Scan every Python file under root
+
+        Returns:
+            Dictionary with scan counts and the failing files, worst first
+        """
+        counts = {"scanned": 0, "skipped": 0, "healthy": 0, "failing": 0}
+        records = self.manifest.setdefault(os.path.abspath(root), {})
+        seen = set()
+        pending = []
+
+        for entry in self.file_handler.iter_files(root, ['.py']):
+            relpath = os.path.relpath(entry.path, root)
+            seen.add(relpath)
+            stat = entry.stat()
+            previous = records.get(relpath)
+            if previous and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+                counts["skipped"] += 1
+                continue
+            pending.append((relpath, stat))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            checked = pool.map(lambda item: (item[0], self._check(root, *item)), pending)
+            for index, (relpath, record) in enumerate(checked, 1):
+                records[relpath] = record
+                counts["scanned"] += 1
+                if index % self.checkpoint_every == 0:
+                    self.save_manifest()
+
+        # Forget files that have been deleted since the last scan
+        for relpath in list(records):
+            if relpath not in seen and not os.path.exists(os.path.join(root, relpath)):
+                del records[relpath]
+        self.save_manifest()
+
+        failing = [dict(record, path=os.path.normpath(os.path.join(root, relpath)))
+                   for relpath, record in records.items() if relpath in seen and record['status'] == 'failing']
+        failing.sort(key=lambda record: record['score'], reverse=True)
+        counts["failing"] = len(failing)
+        counts["healthy"] = len(seen) - len(failing)
+        return dict(counts, failing_files=failing)
+
+    def _check(self, root: str, relpath: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Run and lint one file unless its content hash is unchanged"""
+        path = os.path.join(root, relpath)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        previous = self.manifest[os.path.abspath(root)].get(relpath)
+        if previous and previous.get('sha256') == digest:
+            return dict(previous, mtime=stat.st_mtime, size=stat.st_size)
+
+        record = {"path": relpath, "mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest,
+                  "score": 0.0, "error_message": "", "stack_trace": "", "lint": []}
+
+        if self.run_modules:
+            success, _, stderr = self._run(path)
+            if not success:
+                record["stack_trace"] = stderr[-4000:]
+                record["error_message"] = self._error_line(stderr)
+                record["score"] += 10.0 if "Traceback" in stderr else 3.0
+
+        if self.lint:
+            _, output = self.code_executor.lint_code(path)
+            issues = []
+            for line in output.splitlines():
+                match = LINT_LINE_PATTERN.match(line)
+                if match:
+                    issues.append({"line": int(match.group('line')), "code": match.group('code'),
+                                   "message": match.group('message')})
+            record["lint"] = issues[:50]
+            severe = sum(1 for issue in issues if issue["code"].startswith(SEVERE_LINT_PREFIXES))
+            record["score"] += 2.0 * severe + min(0.1 * (len(issues) - severe), 1.0)
+            if severe and not record["error_message"]:
+                first = next(issue for issue in issues if issue["code"].startswith(SEVERE_LINT_PREFIXES))
+                record["error_message"] = f"{first['code']} line {first['line']}: {first['message']}"
+
+        record["status"] = "failing" if record["error_message"] else "healthy"
+        return record
+
+    def _run(self, path: str):
+        """Run a file as the module it is imported as, from its package's import root"""
+        import_root = project_root(path)
+        module = module_name(os.path.relpath(os.path.abspath(path), import_root))
+        if os.path.basename(path) == "__init__.py":
+            # A package only runs with -m through a __main__, so run its __init__ as the module
+            module += ".__init__"
+        if not all(part.isidentifier() for part in module.split(".")):
+            # e.g. my-script.py, which cannot be imported at all
+            return self.code_executor.execute_python("", file_path=path)
+        return self.code_executor.execute_module(module, import_root)
+
+    @staticmethod
+    def _error_line(stderr: str) -> str:
+        """Last non-empty line of a traceback, e.g. 'ZeroDivisionError: division by zero'"""
+        lines = [line for line in stderr.strip().splitlines() if line.strip()]
+        return lines[-1].strip() if lines else "Execution failed"
+
+    @staticmethod
+    def to_bug_report(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Bug report for fix_bug built from a failing scan record"""
+        lint_summary = "\n".join(f"line {i['line']}: {i['code']} {i['message']}" for i in record.get('lint', [])[:10])
+        return {
+            'file_path': record['path'],
+            'error_message': record['error_message'],
+            'stack_trace': record['stack_trace'],
+            'actual_output': lint_summary
+        }
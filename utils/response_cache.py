@@ -0,0 +1,151 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """Persistent, content-addressed cache for LLM responses.
+
+    Implements the cache protocol used by ``autogen.OpenAIWrapper`` (get, set,
+    close and the context manager methods), so an instance can be placed in an
+    agent's ``llm_config`` under the ``"cache"`` key. autogen builds the lookup
+    key from the full request (model, temperature, the agent's system message
+    and the message history); the cache stores it under its SHA-256 digest.
+
+    Entries are evicted least-recently-used first once ``max_entries`` or
+    ``max_size_mb`` is exceeded, and expire after ``ttl_seconds``.
+    """
+
+    def __init__(self, cache_dir: str = ".cache/llm_responses", max_entries: int = 10000,
+                 max_size_mb: float = 256, ttl_seconds: Optional[float] = 7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "responses.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(key: Any) -> str:
+        """Content address for a request key"""
+        return hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached response for key, or default on a miss"""
+        digest = self.make_key(key)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (digest,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+
+            value, created = row
+            if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (digest,))
+                self._conn.commit()
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, digest))
+            self._conn.commit()
+            self.hits += 1
+
+        try:
+            return pickle.loads(value)
+        except Exception:
+            return default
+
+    def set(self, key: Any, value: Any):
+        """Store a response and evict old entries if the cache is over budget"""
+        try:
+            blob = pickle.dumps(value)
+        except Exception:
+            return
+
+        digest = self.make_key(key)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (digest, blob, len(blob), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until within the size limits"""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        while count > self.max_entries or (total > self.max_bytes and count > 1):
+            excess = max(count - self.max_entries, 1)
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT ?", (excess,)
+            ).fetchall()
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in rows])
+            self.evictions += len(rows)
+            count -= len(rows)
+            total -= sum(size for _, size in rows)
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": count,
+            "size_bytes": total,
+        }
+
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+    # autogen enters the cache around every lookup; keep the connection open
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+    # Agents may copy their llm_config; all copies must share one cache
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
@@ -0,0 +1,126 @@
+import re
+import json
+from typing import Any, Dict, List, Optional
+from utils.agent_hooks import TurnObserver
+
+# Result section produced by each agent's turn
+SECTION_BY_AGENT = {
+    "BugAnalyzer": "analysis",
+    "CodeReviewer": "review",
+    "Tester": "tests",
+    "BugFixer": "fix",
+    "Coordinator": "validation",
+}
+
+# Required fields and their types for each section's result block
+RESULT_SCHEMAS = {
+    "analysis": {"bug_type": str, "severity": str, "root_cause": str, "recommended_fix": str},
+    "review": {"assessment": str, "issues": list},
+    "tests": {"summary": str, "test_count": int},
+    "fix": {"change_summary": str, "functions_changed": list},
+    "validation": {"passed": bool, "summary": str},
+}
+
+# Tags rather than a ``` fence: autogen's extract_code treats any fenced block as
+# code to execute, and UserProxy fails a turn on an unknown language
+RESULT_BLOCK_PATTERN = re.compile(r"<result>\s*(.*?)\s*</result>", re.DOTALL)
+CODE_BLOCK_PATTERN = re.compile(r"```(?:python|py)\s*\n(.*?)```", re.DOTALL)
+
+
+def result_block_instructions(section: str) -> str:
+    """System message addendum asking an agent to end with a result block"""
+    fields = ", ".join(f'"{name}": <{kind.__name__}>' for name, kind in RESULT_SCHEMAS[section].items())
+    return f"""
+            End every response with exactly one machine-readable result block:
+            <result>
+            {{"section": "{section}", {fields}}}
+            </result>
+            Do not wrap the result block in ``` fences. Put any code in separate
+            ```python blocks, not inside the result block.
+            """
+
+
+def validate_result(data: Any) -> Optional[str]:
+    """Return an error message if data does not match its section schema"""
+    if not isinstance(data, dict):
+        return "result block is not a JSON object"
+    schema = RESULT_SCHEMAS.get(data.get("section"))
+    if schema is None:
+        return f"unknown section: {data.get('section')!r}"
+    for name, kind in schema.items():
+        if name not in data:
+            return f"missing field: {name}"
+        if not isinstance(data[name], kind) or (kind is int and isinstance(data[name], bool)):
+            return f"field {name} should be {kind.__name__}"
+    return None
+
+
+def parse_message(content: str) -> Dict[str, Any]:
+    """Parse result blocks and python code blocks out of one message"""
+    parsed = {"results": [], "errors": [], "code": CODE_BLOCK_PATTERN.findall(content)}
+    for block in RESULT_BLOCK_PATTERN.findall(content):
+        try:
+            data = json.loads(block)
+        except ValueError as e:
+            parsed["errors"].append(f"invalid JSON in result block: {e}")
+            continue
+        error = validate_result(data)
+        if error:
+            parsed["errors"].append(error)
+        else:
+            parsed["results"].append(data)
+    return parsed
+
+
+class ResultExtractor(TurnObserver):
+    """Incrementally extracts the analysis/review/tests/fix/validation sections.
+
+    Each message is parsed exactly once as it arrives (either through the turn
+    observer hooks or via feed). Schema-valid result blocks win; a message from
+    the role that owns a section is used as a fallback until one arrives.
+    """
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.by_role: Dict[str, List[Dict[str, Any]]] = {}
+        self.errors: List[str] = []
+
+    def on_turn_end(self, agent, reply, error):
+        if error is None and reply is not None:
+            self.feed({"name": agent.name, "content": reply.get("content") if isinstance(reply, dict) else reply})
+
+    def feed(self, message: Dict[str, Any]):
+        """Parse one group chat message and update the section index"""
+        sender = message.get("name", "")
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = str(content)
+
+        parsed = parse_message(content)
+        entry = {"content": content, "code": parsed["code"][-1] if parsed["code"] else "", "structured": None}
+        self.by_role.setdefault(sender, []).append(entry)
+        self.errors.extend(f"{sender}: {error}" for error in parsed["errors"])
+
+        for data in parsed["results"]:
+            self.sections[data["section"]] = dict(entry, structured=data)
+
+        section = SECTION_BY_AGENT.get(sender)
+        if section and content and not parsed["results"]:
+            current = self.sections.get(section)
+            if current is None or current["structured"] is None:
+                self.sections[section] = entry
+
+    def feed_all(self, messages: List[Dict[str, Any]]):
+        for message in messages:
+            self.feed(message)
+
+    def results(self) -> Dict[str, str]:
+        """Message text for each section (empty string if missing)"""
+        return {section: self.sections.get(section, {}).get("content", "") for section in RESULT_SCHEMAS}
+
+    def structured(self) -> Dict[str, Any]:
+        """Parsed result blocks and the latest code block for each section"""
+        return {
+            section: {"result": entry["structured"], "code": entry["code"]}
+            for section, entry in self.sections.items()
+        }
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+# ioctl request for a copy-on-write clone (Linux btrfs/XFS/overlay), see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+
+def clone_file(src: str, dst: str) -> str:
+    """Copy src to dst, sharing data blocks via reflink when the filesystem allows it
+
+    Returns "reflink" or "copy" depending on how the data was written.
+    """
+    try:
+        import fcntl
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return "reflink"
+    except (ImportError, OSError):
+        shutil.copy2(src, dst)
+        return "copy"
+
+
+class SnapshotStore:
+    """Content-addressed snapshots of workspace files.
+
+    File contents are stored once as read-only blobs named by their sha256,
+    so a snapshot is just a small manifest of path -> blob. Unchanged files
+    (same size, mtime and inode as last seen) are not even re-hashed, making
+    repeated snapshots of a mostly unchanged tree cheap. Any snapshot can be
+    restored in place or checked out into a separate directory. Manifests
+    also record the paths that were snapshotted, so a restore removes files
+    created under them afterwards.
+    """
+
+    def __init__(self, store_dir: str = ".cache/snapshots"):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, "objects")
+        self.manifests_dir = os.path.join(store_dir, "manifests")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        # abspath -> (size, mtime_ns, inode, hashed_at_ns, sha256); avoids re-hashing unchanged files
+        self._stat_cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _hash_file(self, path: str, stat: os.stat_result) -> str:
+        key = os.path.abspath(path)
+        signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        with self._lock:
+            cached = self._stat_cache.get(key)
+        # Like git's racy-clean check: only trust entries hashed well after the last write
+        if cached and cached[:3] == signature and cached[3] - stat.st_mtime_ns > 2_000_000_000:
+            return cached[4]
+
+        hashed_at = time.time_ns()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        value = digest.hexdigest()
+        with self._lock:
+            self._stat_cache[key] = signature + (hashed_at, value)
+        return value
+
+    def _store_blob(self, path: str, digest: str):
+        blob = self._blob_path(digest)
+        if os.path.exists(blob):
+            try:
+                # Refresh the ctime so a concurrent gc treats the reused blob as new
+                os.chmod(blob, 0o444)
+                return
+            except FileNotFoundError:
+                pass
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        temp_path = f"{blob}.{uuid.uuid4().hex}.tmp"
+        clone_file(path, temp_path)
+        os.chmod(temp_path, 0o444)
+        os.replace(temp_path, blob)
+
+    def snapshot(self, paths: Iterable[str], label: str = "", base_dir: Optional[str] = None) -> str:
+        """
+        Record the current content of files (directories are walked recursively)
+
+        Args:
+            paths: Files or directories to include
+            label: Free-form description, e.g. "before fix attempt 2"
+            base_dir: Directory manifest paths are relative to (default: current directory)
+
+        Returns:
+            Snapshot id
+        """
+        base_dir = os.path.abspath(base_dir or os.getcwd())
+        paths = list(paths)
+        files: Dict[str, Dict[str, Any]] = {}
+        for path in self._expand(paths):
+            stat = os.stat(path)
+            digest = self._hash_file(path, stat)
+            self._store_blob(path, digest)
+            files[os.path.relpath(os.path.abspath(path), base_dir)] = {
+                "sha256": digest, "size": stat.st_size, "mode": stat.st_mode & 0o777
+            }
+
+        snapshot_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        # Files later found under a root but missing from files are removed on restore
+        roots = {os.path.relpath(os.path.abspath(path), base_dir): "dir" if os.path.isdir(path) else "file"
+                 for path in paths}
+        manifest = {"id": snapshot_id, "label": label, "created": time.time(), "base_dir": base_dir,
+                    "roots": roots, "files": files}
+        temp_path = os.path.join(self.manifests_dir, f".{snapshot_id}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, os.path.join(self.manifests_dir, f"{snapshot_id}.json"))
+        return snapshot_id
+
+    @staticmethod
+    def _expand(paths: Iterable[str]) -> List[str]:
+        expanded = []
+        for path in paths:
+            if os.path.isdir(path):
+                for directory, dirnames, filenames in os.walk(path):
+                    dirnames[:] = [d for d in dirnames if d not in ('.git', '__pycache__')]
+                    expanded.extend(os.path.join(directory, name) for name in filenames)
+            elif os.path.isfile(path):
+                expanded.append(path)
+        return expanded
+
+    @staticmethod
+    def _covered(relpath: str, roots: Dict[str, str]) -> bool:
+        """Whether relpath lies under one of a snapshot's roots"""
+        for root, kind in roots.items():
+            if relpath == root or (kind == "dir" and (root == os.curdir or relpath.startswith(root + os.sep))):
+                return True
+        return False
+
+    def load(self, snapshot_id: str) -> Dict[str, Any]:
+        with open(os.path.join(self.manifests_dir, f"{snapshot_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """All snapshots, oldest first, without their file lists"""
+        snapshots = []
+        for name in os.listdir(self.manifests_dir):
+            if name.endswith('.json'):
+                try:
+                    manifest = self.load(name[:-5])
+                except FileNotFoundError:
+                    # Deleted concurrently
+                    continue
+                snapshots.append({key: manifest[key] for key in ("id", "label", "created")})
+        return sorted(snapshots, key=lambda s: s["created"])
+
+    def restore(self, snapshot_id: str, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Roll files back to a snapshot in place
+
+        Only files whose current content differs are rewritten, each one
+        atomically. Files created under the snapshotted paths since the
+        snapshot was taken are removed.
+
+        Args:
+            snapshot_id: Snapshot to restore
+            paths: Restrict the rollback to these files (default: everything the snapshot covers)
+
+        Returns:
+            Paths that were rewritten or removed
+        """
+        manifest = self.load(snapshot_id)
+        base_dir = manifest["base_dir"]
+        wanted = None
+        if paths is not None:
+            wanted = {os.path.relpath(os.path.abspath(p), base_dir) for p in paths}
+
+        restored = []
+        for relpath, entry in manifest["files"].items():
+            if wanted is not None and relpath not in wanted:
+                continue
+            target = os.path.join(base_dir, relpath)
+            if os.path.isfile(target) and self._hash_file(target, os.stat(target)) == entry["sha256"]:
+                continue
+            self._write_blob(entry, target)
+            restored.append(target)
+
+        roots = manifest["roots"]
+        if wanted is None:
+            candidates = self._expand(os.path.normpath(os.path.join(base_dir, root)) for root in roots)
+        else:
+            candidates = [os.path.join(base_dir, relpath) for relpath in wanted]
+        for target in candidates:
+            relpath = os.path.relpath(os.path.abspath(target), base_dir)
+            if relpath not in manifest["files"] and self._covered(relpath, roots) and os.path.isfile(target):
+                os.remove(target)
+                restored.append(target)
+        return restored
+
+    def checkout(self, snapshot_id: str, dest_dir: str, read_only: bool = False) -> str:
+        """
+        Materialize a snapshot in dest_dir as an isolated view
+
+        Writable views are reflinked (or copied) from the blobs. Read-only views
+        hard-link the blobs, costing no data at all; never modify files in
+        such a view, since the blobs are shared.
+        """
+        manifest = self.load(snapshot_id)
+        for relpath, entry in manifest["files"].items():
+            target = os.path.join(dest_dir, relpath)
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            if read_only:
+                try:
+                    os.link(self._blob_path(entry["sha256"]), target)
+                    continue
+                except OSError:
+                    pass
+            self._write_blob(entry, target)
+        return dest_dir
+
+    def _write_blob(self, entry: Dict[str, Any], target: str):
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        temp_path = f"{target}.{uuid.uuid4().hex}.restore"
+        clone_file(self._blob_path(entry["sha256"]), temp_path)
+        os.chmod(temp_path, entry.get("mode", 0o644))
+        os.replace(temp_path, target)
+
+    def diff(self, old_id: str, new_id: str) -> Dict[str, List[str]]:
+        """Paths added, removed and modified between two snapshots"""
+        old = self.load(old_id)["files"]
+        new = self.load(new_id)["files"]
+        return {
+            "added": sorted(set(new) - set(old)),
+            "removed": sorted(set(old) - set(new)),
+            "modified": sorted(p for p in set(old) & set(new) if old[p]["sha256"] != new[p]["sha256"]),
+        }
+
+    def delete(self, snapshot_id: str):
+        os.remove(os.path.join(self.manifests_dir, f"{snapshot_id}.json"))
+
+    def gc(self, min_age: float = 60.0) -> int:
+        """
+        Remove blobs no snapshot refers to
+
+        Blobs stored less than min_age seconds ago are kept, since a snapshot
+        being taken concurrently (another thread or queue worker) writes its
+        blobs before its manifest.
+
+        Returns:
+            Number of blobs removed
+        """
+        cutoff = time.time() - min_age
+        referenced = set()
+        for name in os.listdir(self.manifests_dir):
+            if name.endswith('.json'):
+                try:
+                    referenced.update(entry["sha256"] for entry in self.load(name[:-5])["files"].values())
+                except FileNotFoundError:
+                    continue
+        removed = 0
+        for directory, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                path = os.path.join(directory, name)
+                if name in referenced:
+                    continue
+                try:
+                    # ctime, not mtime: blobs keep the source file's mtime
+                    if os.stat(path).st_ctime > cutoff:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        blobs = size = 0
+        for directory, _, filenames in os.walk(self.objects_dir):
+            for name in filenames:
+                blobs += 1
+                size += os.path.getsize(os.path.join(directory, name))
+        return {"snapshots": len(self.list_snapshots()), "blobs": blobs, "blob_bytes": size}
@@ -0,0 +1,114 @@
+import re
+import autogen
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from utils.metrics import trace_span
+
+# Fixed workflow from the Coordinator's system message
+DEFAULT_WORKFLOW = ["BugAnalyzer", "CodeReviewer", "Tester", "BugFixer", "UserProxy", "Coordinator"]
+
+# "exitcode: 124 (execution failed)" as reported by autogen's code execution
+EXITCODE_PATTERN = re.compile(r"exitcode:\s*(-?\d+)")
+
+
+class WorkflowSpeakerSelector:
+    """State machine that picks the next group chat speaker from a fixed workflow.
+
+    Transitions that follow the workflow are resolved without an LLM call. Only
+    ambiguous transitions (e.g. after the final validation step) return None so
+    the group chat can fall back to LLM-driven selection.
+    """
+
+    def __init__(self, workflow: Optional[List[str]] = None,
+                 executor_name: str = "UserProxy", fixer_name: str = "BugFixer"):
+        self.workflow = workflow or list(DEFAULT_WORKFLOW)
+        self.executor_name = executor_name
+        self.fixer_name = fixer_name
+        self.reset()
+
+    def reset(self):
+        """Reset workflow position and counters for a new run"""
+        self.position = 0
+        self.deterministic_selections = 0
+        self.llm_selections = 0
+
+    def next_speaker_name(self, last_speaker_name: str, last_message: Dict[str, Any]) -> Optional[str]:
+        """Return the next speaker's name, or None if the transition is ambiguous"""
+        content = last_message.get("content") or ""
+        if not isinstance(content, str):
+            content = str(content)
+
+        # Failed code execution goes straight back to the fixer
+        if last_speaker_name == self.executor_name and self.position > 0:
+            exitcode = EXITCODE_PATTERN.search(content)
+            if exitcode and int(exitcode.group(1)) != 0:
+                return self.fixer_name
+
+        if self.position >= len(self.workflow):
+            return None
+
+        name = self.workflow[self.position]
+        # Nothing to execute if the fixer did not produce a code block
+        if name == self.executor_name and last_speaker_name == self.fixer_name and "```" not in content:
+            name = self.workflow[self.position + 1] if self.position + 1 < len(self.workflow) else None
+        return name
+
+    def record(self, speaker_name: str, used_llm: bool):
+        """Advance the workflow to just after the speaker that was selected"""
+        if used_llm:
+            self.llm_selections += 1
+        else:
+            self.deterministic_selections += 1
+
+        if speaker_name in self.workflow:
+            self.position = self.workflow.index(speaker_name) + 1
+
+    def get_state(self) -> Dict[str, int]:
+        """Workflow position and counters, e.g. for checkpointing"""
+        return {
+            "position": self.position,
+            "deterministic_selections": self.deterministic_selections,
+            "llm_selections": self.llm_selections,
+        }
+
+    def set_state(self, state: Dict[str, int]):
+        """Restore what get_state returned, e.g. when resuming a checkpointed run"""
+        self.position = state["position"]
+        self.deterministic_selections = state["deterministic_selections"]
+        self.llm_selections = state["llm_selections"]
+
+    def stats(self) -> Dict[str, int]:
+        """Selection counts for the current run"""
+        return {
+            "deterministic_selections": self.deterministic_selections,
+            "llm_selections": self.llm_selections,
+            "llm_calls_saved": self.deterministic_selections,
+        }
+
+
+@dataclass
+class WorkflowGroupChat(autogen.GroupChat):
+    """GroupChat that consults a WorkflowSpeakerSelector before LLM speaker selection"""
+
+    speaker_selector: Optional[WorkflowSpeakerSelector] = None
+
+    def reset(self):
+        super().reset()
+        if self.speaker_selector is not None:
+            self.speaker_selector.reset()
+
+    def select_speaker(self, last_speaker: autogen.Agent, selector: autogen.ConversableAgent) -> autogen.Agent:
+        if self.speaker_selector is None:
+            return super().select_speaker(last_speaker, selector)
+
+        last_message = self.messages[-1] if self.messages else {}
+        name = self.speaker_selector.next_speaker_name(last_speaker.name, last_message)
+        agent = self.agent_by_name(name) if name else None
+        if agent is not None:
+            self.speaker_selector.record(agent.name, used_llm=False)
+            return agent
+
+        with trace_span("speaker_selection", "llm"):
+            speaker = super().select_speaker(last_speaker, selector)
+        self.speaker_selector.record(speaker.name, used_llm=True)
+        return speaker
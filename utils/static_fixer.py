@@ -0,0 +1,277 @@
+import os
+import re
+import ast
+import builtins
+import textwrap
+from typing import Any, Dict, List, Optional
+from utils.file_handler import CodeAnalyzer
+
+EXCEPTION_PATTERN = re.compile(r"\b([A-Z]\w*(?:Error|Exception|Warning|Exit|Interrupt))\b(?::\s*(.*))?")
+NONE_TYPE_ERROR_PATTERN = re.compile(r"'?NoneType'? object (?:is not (?:subscriptable|iterable))|"
+                                     r"object of type '?NoneType'? has no len\(\)")
+DIVISION_OPERATORS = (ast.Div, ast.FloorDiv, ast.Mod)
+
+
+def error_signature(error_message: str) -> str:
+    """Exception type and message with literals, numbers and paths normalized away"""
+    lines = [line.strip() for line in (error_message or "").strip().splitlines() if line.strip()]
+    # The exception line is the last one in a traceback
+    for line in reversed(lines):
+        match = EXCEPTION_PATTERN.search(line)
+        if match:
+            message = match.group(2) or ""
+            break
+    else:
+        return " ".join(" ".join(lines).lower().split())[:200]
+    message = re.sub(r"(['\"]).*?\1", "<str>", message)
+    message = re.sub(r"(/[\w.-]+)+", "<path>", message)
+    message = re.sub(r"\b0x[0-9a-f]+\b|\b\d+(\.\d+)?\b", "<num>", message)
+    return f"{match.group(1)}: {' '.join(message.lower().split())}".strip()
+
+
+def exception_type(error_message: str) -> Optional[str]:
+    """Name of the reported exception if it is a built-in exception class"""
+    signature = error_signature(error_message)
+    name = signature.split(":", 1)[0]
+    candidate = getattr(builtins, name, None)
+    if isinstance(candidate, type) and issubclass(candidate, BaseException):
+        return name
+    return None
+
+
+def outer_functions(code: str) -> list:
+    """Module-level functions and methods (nested functions are fixed along with their parent)"""
+    return [symbol for symbol in CodeAnalyzer.index(code).functions()
+            if symbol.parent is None or symbol.parent.kind == "class"]
+
+
+def function_source(code: str, symbol) -> str:
+    """Dedented source lines of a function, so methods parse on their own"""
+    lines = code.splitlines(keepends=True)[symbol.line_start - 1:symbol.line_end]
+    return textwrap.dedent("".join(lines))
+
+
+def insert_guard(code: str, symbol, guard_source: str) -> Optional[str]:
+    """Module source with guard_source inserted at the top of a function's body (after its docstring)"""
+    body = ast.parse(function_source(code, symbol)).body[0].body
+    has_docstring = isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+        and isinstance(body[0].value.value, str)
+    anchor = body[0] if has_docstring and len(body) == 1 else body[int(has_docstring)]
+    if anchor.lineno == 1:
+        # Body on the same line as the def
+        return None
+    lines = code.splitlines(keepends=True)
+    anchor_line = lines[symbol.line_start + anchor.lineno - 2]
+    indent = anchor_line[:len(anchor_line) - len(anchor_line.lstrip())]
+    # Guards go before the first statement, or after a docstring-only body
+    insert_at = symbol.line_start - 1 + (anchor.end_lineno if anchor is body[0] and has_docstring
+                                         else anchor.lineno - 1)
+    guard_lines = "".join(indent + line + "\n" for line in guard_source.splitlines())
+    return "".join(lines[:insert_at]) + guard_lines + "".join(lines[insert_at:])
+
+
+def faulting_functions(code: str, file_path: str, stack_trace: str = "", hints: Optional[List[str]] = None,
+                       limit: int = 5) -> List[str]:
+    """Qualified names of the functions most likely at fault, most likely first
+
+    Frames of the stack trace in this file come first, then functions named in
+    the hints (error message, test input), then the functions those call.
+    """
+    functions = outer_functions(code)
+    by_name: Dict[str, List[str]] = {}
+    for symbol in functions:
+        by_name.setdefault(symbol.name, []).append(symbol.qualname)
+    outer = {symbol.qualname for symbol in functions}
+
+    found: List[str] = []
+
+    def add(qualname: Optional[str]):
+        if qualname and qualname in outer and qualname not in found:
+            found.append(qualname)
+
+    base_name = os.path.basename(file_path)
+    for frame_file, line in re.findall(r'File "([^"]+)", line (\d+)', stack_trace or ""):
+        if os.path.basename(frame_file) == base_name:
+            symbol = CodeAnalyzer.function_at_line(code, int(line))
+            while symbol is not None and symbol.qualname not in outer:
+                symbol = symbol.parent
+            add(symbol.qualname if symbol is not None else None)
+    # Innermost frame first
+    found.reverse()
+
+    for hint in hints or []:
+        for name in re.findall(r"\b(\w+)\s*\(", hint or ""):
+            for qualname in by_name.get(name, []):
+                add(qualname)
+
+    calls = CodeAnalyzer.index(code).calls
+    for qualname in list(found):
+        for callee in calls.get(qualname.rsplit(".", 1)[-1], []):
+            for callee_qualname in by_name.get(callee, []):
+                add(callee_qualname)
+    return found[:limit]
+
+
+def reproduction_test(module_name: str, test_input: str, error_message: str) -> str:
+    """Pytest source that re-runs the reported input and fails if the reported exception recurs
+
+    Other exceptions only pass when the code raised them explicitly, i.e. the
+    fix now rejects the input instead of crashing on it.
+
+    Returns an empty string when the input is not runnable code or the
+    exception type is not a built-in one, i.e. when there is nothing to
+    validate a fix against without the LLM.
+    """
+    name = exception_type(error_message)
+    if not name or not (test_input or "").strip():
+        return ""
+    try:
+        compile(test_input, "<test_input>", "exec")
+    except SyntaxError:
+        return ""
+    body = "\n".join("        " + line for line in test_input.strip().splitlines())
+    return (
+        f"import traceback\n"
+        f"import pytest\n"
+        f"from {module_name} import *\n\n\n"
+        f"def test_reported_input():\n"
+        f"    try:\n"
+        f"{body}\n"
+        f"    except {name} as e:\n"
+        f"        pytest.fail(f\"reported error still raised: {{e!r}}\")\n"
+        f"    except Exception as e:\n"
+        f"        # Rejecting bad input with an explicit raise is a valid fix; anything else is not\n"
+        f"        if not (traceback.extract_tb(e.__traceback__)[-1].line or \"\").startswith(\"raise\"):\n"
+        f"            pytest.fail(f\"unexpected error: {{e!r}}\")\n"
+    )
+
+
+class StaticFixer:
+    """Rule-based guard fixes for mechanical bugs, produced without the LLM.
+
+    The reported exception selects a rule, and the faulting functions (see
+    faulting_functions) are searched for the operation that fails on one of
+    the function's arguments:
+
+    * ZeroDivisionError: dividing by an argument, by ``len(arg)`` or by a
+      local assigned from ``len(arg)``
+    * IndexError: ``arg[0]`` / ``arg[-1]`` on a possibly empty sequence
+    * AttributeError / TypeError on ``None``: attribute access, subscripting,
+      iterating or ``len()`` of an argument
+
+    Each match becomes a guard at the top of the function, so candidates only
+    ever reference arguments. Candidates still have to pass validation.
+    """
+
+    def candidates(self, bug_report: Dict[str, Any], code: str, limit: int = 4) -> List[Dict[str, Any]]:
+        """Candidate fixes as dicts with the rule, function, guard and fixed module source"""
+        error_message = bug_report.get('error_message', '')
+        rule_name, rule = {
+            "ZeroDivisionError": ("zero_division", self._zero_division_guards),
+            "IndexError": ("empty_sequence", self._empty_sequence_guards),
+            "AttributeError": ("none_value", self._none_value_guards),
+            "TypeError": ("none_value", self._none_value_guards),
+        }.get(exception_type(error_message) or "", (None, None))
+        if rule is None:
+            return []
+
+        symbols = {symbol.qualname: symbol for symbol in outer_functions(code)}
+        functions = faulting_functions(code, bug_report.get('file_path', ''), bug_report.get('stack_trace', ''),
+                                       hints=[error_message, bug_report.get('test_input', '')])
+        results: List[Dict[str, Any]] = []
+        for qualname in functions:
+            function = ast.parse(function_source(code, symbols[qualname])).body[0]
+            arguments = [arg.arg for arg in function.args.posonlyargs + function.args.args + function.args.kwonlyargs]
+            if arguments[:1] in (["self"], ["cls"]):
+                arguments = arguments[1:]
+            for guard in rule(function, set(arguments), error_message):
+                fixed = insert_guard(code, symbols[qualname], guard)
+                if fixed and all(result["code"] != fixed for result in results):
+                    results.append({"rule": rule_name, "function": qualname, "guard": guard, "code": fixed})
+                if len(results) >= limit:
+                    return results
+        return results
+
+    @staticmethod
+    def _zero_division_guards(function: ast.AST, arguments: set, error_message: str) -> List[str]:
+        # Locals assigned straight from len(argument)
+        lengths = {}
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                argument = _len_argument(node.value, arguments)
+                if argument:
+                    lengths[node.targets[0].id] = argument
+
+        guards = []
+        for node in ast.walk(function):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, DIVISION_OPERATORS):
+                divisor = node.right
+            elif isinstance(node, ast.AugAssign) and isinstance(node.op, DIVISION_OPERATORS):
+                divisor = node.value
+            else:
+                continue
+            sequence = _len_argument(divisor, arguments) or \
+                (lengths.get(divisor.id) if isinstance(divisor, ast.Name) else None)
+            if sequence:
+                guard = f"if not {sequence}:\n    return None"
+            elif isinstance(divisor, ast.Name) and divisor.id in arguments:
+                guard = f"if {divisor.id} == 0:\n    raise ValueError('{divisor.id} must not be zero')"
+            else:
+                continue
+            if guard not in guards:
+                guards.append(guard)
+        return guards
+
+    @staticmethod
+    def _empty_sequence_guards(function: ast.AST, arguments: set, error_message: str) -> List[str]:
+        guards = []
+        for node in ast.walk(function):
+            if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) \
+                    and node.value.id in arguments and _constant_index(node.slice) in (0, -1):
+                guard = f"if not {node.value.id}:\n    return None"
+                if guard not in guards:
+                    guards.append(guard)
+        return guards
+
+    @staticmethod
+    def _none_value_guards(function: ast.AST, arguments: set, error_message: str) -> List[str]:
+        attribute = re.search(r"'?NoneType'? object has no attribute '?(\w+)", error_message)
+        if attribute is None and not NONE_TYPE_ERROR_PATTERN.search(error_message):
+            return []
+
+        names = []
+        for node in ast.walk(function):
+            if attribute is not None:
+                if isinstance(node, ast.Attribute) and node.attr == attribute.group(1) \
+                        and isinstance(node.value, ast.Name):
+                    names.append(node.value.id)
+            elif isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name):
+                names.append(node.value.id)
+            elif isinstance(node, (ast.For, ast.comprehension)) and isinstance(node.iter, ast.Name):
+                names.append(node.iter.id)
+            elif _len_argument(node, arguments):
+                names.append(_len_argument(node, arguments))
+
+        guards = []
+        for name in names:
+            guard = f"if {name} is None:\n    return None"
+            if name in arguments and guard not in guards:
+                guards.append(guard)
+        return guards
+
+
+def _len_argument(node: ast.AST, arguments: set) -> Optional[str]:
+    """Name of the argument in a ``len(argument)`` call"""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "len" \
+            and len(node.args) == 1 and isinstance(node.args[0], ast.Name) and node.args[0].id in arguments:
+        return node.args[0].id
+    return None
+
+
+def _constant_index(node: ast.AST) -> Optional[int]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant) \
+            and isinstance(node.operand.value, int):
+        return -node.operand.value
+    return None
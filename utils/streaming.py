@@ -0,0 +1,149 @@
+import re
+import sys
+import time
+import threading
+import contextlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from utils.agent_hooks import TurnObserver
+from utils.result_extractor import SECTION_BY_AGENT, parse_message
+
+# Event types yielded by BugFixingSystem.fix_bug_stream
+TURN_STARTED = "turn_started"
+TOKEN = "token"
+TURN_FINISHED = "turn_finished"
+EXECUTION_STARTED = "execution_started"
+EXECUTION_FINISHED = "execution_finished"
+SECTION = "section"
+RESULT = "result"
+ERROR = "error"
+
+EXIT_CODE_PATTERN = re.compile(r"exitcode: (-?\d+)")
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+@dataclass
+class FixEvent:
+    """A progress event from a running fix"""
+
+    type: str
+    agent: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class _StdoutRouter:
+    """Replacement for sys.stdout that also hands writes from registered threads to a sink.
+
+    autogen prints streamed completion chunks to stdout as they arrive, so this
+    is the only place token-level output can be observed. Output is always
+    forwarded to the real stdout as well.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sinks: Dict[int, Callable[[str], None]] = {}
+        self._users = 0
+        self._original = None
+
+    def install(self):
+        with self._lock:
+            if self._users == 0:
+                self._original = sys.stdout
+                sys.stdout = self
+            self._users += 1
+
+    def uninstall(self):
+        with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                sys.stdout = self._original
+                self._original = None
+
+    def set_sink(self, sink: Optional[Callable[[str], None]]):
+        """Route writes from the current thread to sink (None to stop)"""
+        thread_id = threading.get_ident()
+        if sink is None:
+            self._sinks.pop(thread_id, None)
+        else:
+            self._sinks[thread_id] = sink
+
+    def write(self, text: str) -> int:
+        sink = self._sinks.get(threading.get_ident())
+        if sink is not None and text:
+            sink(text)
+        return self._original.write(text)
+
+    def flush(self):
+        self._original.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._original, name)
+
+
+stdout_router = _StdoutRouter()
+
+
+class EventStream(TurnObserver):
+    """Turn observer that converts group chat activity into FixEvents.
+
+    Turns may run concurrently on different threads (the fix_bug pipeline
+    stages), so per-turn state is thread-local like the stdout sinks.
+    """
+
+    def __init__(self, emit: Callable[[FixEvent], None], executor_name: str = "UserProxy"):
+        self.emit = emit
+        self.executor_name = executor_name
+        self._turn = threading.local()
+
+    @contextlib.contextmanager
+    def capture_stdout(self):
+        """Install the stdout router for the duration of a run"""
+        stdout_router.install()
+        try:
+            yield
+        finally:
+            stdout_router.set_sink(None)
+            stdout_router.uninstall()
+
+    def on_turn_start(self, agent, sender, messages):
+        last_content = (messages[-1].get("content") or "") if messages else ""
+        self._turn.executing = agent.name == self.executor_name and "```" in str(last_content)
+        if self._turn.executing:
+            self.emit(FixEvent(EXECUTION_STARTED, agent.name))
+            return
+
+        self.emit(FixEvent(TURN_STARTED, agent.name))
+        stdout_router.set_sink(lambda text: self._emit_token(agent.name, text))
+
+    def _emit_token(self, agent_name: str, text: str):
+        text = ANSI_PATTERN.sub("", text)
+        if text.strip():
+            self.emit(FixEvent(TOKEN, agent_name, {"text": text}))
+
+    def on_turn_end(self, agent, reply, error):
+        stdout_router.set_sink(None)
+        content = reply.get("content") if isinstance(reply, dict) else reply
+        content = content or ""
+
+        if getattr(self._turn, "executing", False):
+            match = EXIT_CODE_PATTERN.search(content)
+            self.emit(FixEvent(EXECUTION_FINISHED, agent.name, {
+                "exit_code": int(match.group(1)) if match else None,
+                "output": content,
+                "error": str(error) if error else None
+            }))
+            return
+
+        self.emit(FixEvent(TURN_FINISHED, agent.name, {
+            "content": content,
+            "error": str(error) if error else None
+        }))
+        if not content or error is not None:
+            return
+        parsed = parse_message(content)
+        for data in parsed["results"]:
+            self.emit(FixEvent(SECTION, agent.name, {"section": data["section"], "content": content, "result": data}))
+        section = SECTION_BY_AGENT.get(agent.name)
+        if section and not parsed["results"]:
+            self.emit(FixEvent(SECTION, agent.name, {"section": section, "content": content, "result": None}))
@@ -0,0 +1,155 @@
+import os
+import time
+import difflib
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+from utils.code_executor import CodeExecutor
+from utils.result_extractor import CODE_BLOCK_PATTERN
+
+
+class TerminationController:
+    """Decides when the bug fixing group chat should stop.
+
+    Used as the GroupChatManager's ``is_termination_msg``. The chat ends as soon
+    as the fixer's latest code runs cleanly and the tester's latest tests pass
+    against it, when agents start repeating near-identical messages, or when the
+    run exceeds its token or time budget. ``stop_reason`` records why.
+    """
+
+    def __init__(self, code_executor: CodeExecutor, validate_fix: bool = True,
+                 max_tokens: Optional[int] = None, max_seconds: Optional[float] = None,
+                 duplicate_threshold: float = 0.95, duplicate_window: int = 4,
+                 fixer_name: str = "BugFixer", tester_name: str = "Tester"):
+        self.code_executor = code_executor
+        self.validate_fix = validate_fix
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.duplicate_threshold = duplicate_threshold
+        self.duplicate_window = duplicate_window
+        self.fixer_name = fixer_name
+        self.tester_name = tester_name
+        self.start()
+
+    def start(self, module_name: str = "module", token_counter: Optional[Callable[[], int]] = None):
+        """Reset state for a new run"""
+        self.module_name = module_name
+        self.token_counter = token_counter
+        self.started = time.monotonic()
+        self.rounds = 0
+        self.estimated_tokens = 0
+        self.recent: List[str] = []
+        self.latest_tests = ""
+        self.validation: Dict[str, Any] = {}
+        self.validated_code: Optional[str] = None
+        self.stop_reason: Optional[str] = None
+
+    def __call__(self, message: Dict[str, Any]) -> bool:
+        if self.stop_reason is not None:
+            return True
+
+        self.rounds += 1
+        sender = message.get("name", "")
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = str(content)
+        self.estimated_tokens += len(content) // 4
+
+        code_blocks = CODE_BLOCK_PATTERN.findall(content)
+        if sender == self.tester_name and code_blocks:
+            self.latest_tests = code_blocks[-1]
+        if sender == self.fixer_name and code_blocks and self.validate_fix:
+            if self._validate(code_blocks[-1]):
+                return self._stop("validated")
+
+        if self._is_repeat(content):
+            return self._stop("loop_detected")
+
+        if self.max_tokens is not None and self._tokens_used() >= self.max_tokens:
+            return self._stop("token_budget_exceeded")
+        if self.max_seconds is not None and time.monotonic() - self.started >= self.max_seconds:
+            return self._stop("time_budget_exceeded")
+        return False
+
+    def _stop(self, reason: str) -> bool:
+        self.stop_reason = reason
+        return True
+
+    def _tokens_used(self) -> int:
+        if self.token_counter is not None:
+            return self.token_counter()
+        return self.estimated_tokens
+
+    def _is_repeat(self, content: str) -> bool:
+        """Check content against the last few messages for near-duplicates"""
+        text = content.strip()
+        if len(text) < 20:
+            return False
+        repeated = False
+        for previous in self.recent:
+            matcher = difflib.SequenceMatcher(None, previous, text, autojunk=False)
+            if matcher.real_quick_ratio() >= self.duplicate_threshold and \
+                    matcher.quick_ratio() >= self.duplicate_threshold and \
+                    matcher.ratio() >= self.duplicate_threshold:
+                repeated = True
+                break
+        self.recent = (self.recent + [text])[-self.duplicate_window:]
+        return repeated
+
+    def _validate(self, fixed_code: str) -> bool:
+        """Run the fixed code and the latest generated tests in a scratch directory"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            module_path = os.path.join(work_dir, f"{self.module_name}.py")
+            with open(module_path, "w", encoding="utf-8") as f:
+                f.write(fixed_code)
+
+            runs, stdout, stderr = self.code_executor.execute_python(fixed_code, file_path=module_path)
+            self.validation = {"code_runs": runs, "tests_passed": None, "output": (stdout + stderr)[-2000:]}
+            if not runs or not self.latest_tests:
+                return False
+
+            test_path = os.path.join(work_dir, f"test_{self.module_name}.py")
+            with open(test_path, "w", encoding="utf-8") as f:
+                f.write(self.latest_tests)
+            # Only tests reaching functions changed since the previous attempt run again
+            result = self.code_executor.run_tests_incremental(test_path, module_code=fixed_code)
+            passed = result['success']
+            self.validation.update(tests_passed=passed, tests_run=result['selected'], tests_reused=result['reused'],
+                                   output=result['output'][-2000:])
+            if passed:
+                self.validated_code = fixed_code
+            return passed
+
+    def get_state(self) -> Dict[str, Any]:
+        """Per-run state, e.g. for checkpointing"""
+        return {
+            "module_name": self.module_name,
+            "elapsed_seconds": time.monotonic() - self.started,
+            "rounds": self.rounds,
+            "estimated_tokens": self.estimated_tokens,
+            "tokens": self._tokens_used(),
+            "recent": list(self.recent),
+            "latest_tests": self.latest_tests,
+            "validation": self.validation,
+            "validated_code": self.validated_code,
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restore what get_state returned; the time budget keeps counting from where it was"""
+        self.module_name = state["module_name"]
+        self.started = time.monotonic() - state["elapsed_seconds"]
+        self.rounds = state["rounds"]
+        self.estimated_tokens = state["estimated_tokens"]
+        self.recent = list(state["recent"])
+        self.latest_tests = state["latest_tests"]
+        self.validation = state["validation"]
+        self.validated_code = state["validated_code"]
+
+    def report(self) -> Dict[str, Any]:
+        """Why and when the chat stopped"""
+        return {
+            "reason": self.stop_reason or "max_round_or_no_reply",
+            "rounds": self.rounds,
+            "elapsed_seconds": time.monotonic() - self.started,
+            "tokens": self._tokens_used(),
+            "validation": self.validation,
+        }
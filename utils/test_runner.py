@@ -0,0 +1,244 @@
+import os
+import ast
+import hashlib
+import threading
+import xml.etree.ElementTree as ElementTree
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set
+from utils.file_handler import CodeAnalyzer
+
+
+def parse_junit(xml_path: str, test_file: str) -> List[Dict[str, Any]]:
+    """Per-test results from a pytest --junitxml report, keyed by node id"""
+    try:
+        root = ElementTree.parse(xml_path).getroot()
+    except (OSError, ElementTree.ParseError):
+        return []
+
+    module = os.path.splitext(os.path.basename(test_file))[0]
+    results = []
+    for case in root.iter("testcase"):
+        owner = (case.get("classname") or "").split(".")[-1]
+        name = case.get("name", "")
+        local_id = f"{owner}::{name}" if owner and owner != module else name
+        outcome, message = "passed", ""
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[child.tag]
+                message = ((child.get("message") or "") + "\n" + (child.text or "")).strip()[-2000:]
+                break
+        results.append({
+            'nodeid': f"{test_file}::{local_id}",
+            'test': local_id,
+            'outcome': outcome,
+            'duration': float(case.get("time") or 0.0),
+            'message': message
+        })
+    return results
+
+
+class IncrementalTestRunner:
+    """Pick the tests that exercise changed functions and reuse results for the rest.
+
+    Tests are mapped to the functions they call by static analysis of the test
+    file (following helpers and fixtures defined in the same file), cached per
+    test file content. After each run the per-test results are remembered
+    together with the module code they ran against; the next run of the same
+    tests only has to execute the tests reaching a function that changed since,
+    directly or through the module's own call graph.
+    Running the tests is left to CodeExecutor, which isolates them in a worker
+    or subprocess and enforces its timeout.
+    """
+
+    def __init__(self, fallback_to_all: bool = True, max_entries: int = 64):
+        self.fallback_to_all = fallback_to_all
+        self.max_entries = max_entries
+        self.code_analyzer = CodeAnalyzer()
+        self._collection_cache: "OrderedDict[str, Dict[str, Set[str]]]" = OrderedDict()
+        self._baselines: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def changed_functions(old_code: str, new_code: str) -> List[str]:
+        """Names of functions added, removed or modified between two versions"""
+        old = {f['name']: f['code'] for f in CodeAnalyzer.extract_functions(old_code)}
+        new = {f['name']: f['code'] for f in CodeAnalyzer.extract_functions(new_code)}
+        return sorted(name for name in set(old) | set(new) if old.get(name) != new.get(name))
+
+    @classmethod
+    def changes(cls, old_code: str, new_code: str) -> Optional[List[str]]:
+        """Changed functions, or None when module-level code (imports, constants) changed too"""
+        if cls._module_level(old_code) != cls._module_level(new_code):
+            return None
+        return cls.changed_functions(old_code, new_code)
+
+    @staticmethod
+    def with_callers(changed_functions: List[str], *module_codes: str) -> List[str]:
+        """changed_functions plus every function of the module that (transitively) calls one of them
+
+        Tests are mapped to the functions they call directly, so a fix to a
+        helper has to reach the tests of the functions built on it.
+        """
+        callers: Dict[str, Set[str]] = {}
+        for code in module_codes:
+            for caller, called in CodeAnalyzer.index(code).calls.items():
+                for name in called:
+                    callers.setdefault(name, set()).add(caller)
+        affected, stack = set(changed_functions), list(changed_functions)
+        while stack:
+            for caller in callers.get(stack.pop(), ()):
+                if caller not in affected:
+                    affected.add(caller)
+                    stack.append(caller)
+        return sorted(affected)
+
+    @staticmethod
+    def _module_level(code: str) -> Optional[str]:
+        """Source with top-level function and class bodies removed"""
+        index = CodeAnalyzer.index(code)
+        if index.tree is None:
+            return None
+        lines = code.splitlines()
+        for symbol in index.symbols:
+            if symbol.parent is None:
+                lines[symbol.line_start - 1:symbol.line_end] = [""] * (symbol.line_end - symbol.line_start + 1)
+        return "\n".join(line for line in lines if line.strip())
+
+    def collect(self, test_file: str) -> Dict[str, Set[str]]:
+        """Map each test node id to the names it (transitively) calls"""
+        with open(test_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+        return {f"{test_file}::{test}": called for test, called in self._collect_source(source).items()}
+
+    def _collect_source(self, source: str) -> Dict[str, Set[str]]:
+        """Test ids relative to their file ("test_x", "TestY::test_z") -> names they call"""
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        with self._lock:
+            cached = self._collection_cache.get(digest)
+            if cached is not None:
+                self._collection_cache.move_to_end(digest)
+                return cached
+
+        tests = self._static_collect(source)
+        with self._lock:
+            self._collection_cache[digest] = tests
+            while len(self._collection_cache) > self.max_entries:
+                self._collection_cache.popitem(last=False)
+        return tests
+
+    def _static_collect(self, source: str) -> Dict[str, Set[str]]:
+        index = self.code_analyzer.index(source)
+        if index.tree is None:
+            return {}
+        tree = index.tree
+
+        calls = index.calls
+        # Fixtures are referenced by argument name rather than called
+        local_functions = {}
+        for symbol in index.functions():
+            local_functions.setdefault(symbol.name, list(symbol.args))
+
+        def reachable(name: str) -> Set[str]:
+            seen, stack = set(), [name]
+            while stack:
+                current = stack.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                stack.extend(calls.get(current, []))
+                stack.extend(a for a in local_functions.get(current, []) if a in local_functions)
+            return seen
+
+        tests = {}
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test'):
+                tests[node.name] = reachable(node.name)
+            elif isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith('test'):
+                        tests[f"{node.name}::{item.name}"] = reachable(item.name)
+        return tests
+
+    def select_tests(self, test_file: str, changed_functions: Optional[List[str]] = None) -> List[str]:
+        """Node ids of the tests affected by changed_functions (all tests if None)"""
+        tests = self.collect(test_file)
+        if changed_functions is None:
+            return list(tests)
+        changed = set(changed_functions)
+        selected = [nodeid for nodeid, called in tests.items() if called & changed]
+        if not selected and self.fallback_to_all:
+            return list(tests)
+        return selected
+
+    def plan(self, test_file: str, changed_functions: Optional[List[str]] = None,
+             module_code: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Decide which tests to run and which earlier results still hold
+
+        Args:
+            test_file: Pytest file
+            changed_functions: Functions known to have changed (all tests run if None
+                and there is no earlier run to compare module_code with)
+            module_code: Source of the module under test; compared with the code
+                these tests last ran against, whose results are reused for tests
+                that reach none of the changed functions or their callers
+
+        Returns:
+            Dictionary with the node ids to run, the reused results and the total test count
+        """
+        with open(test_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+        tests = self._collect_source(source)
+        if not tests:
+            # Nothing found statically (e.g. a syntax error): let pytest report on the whole file
+            return {'run': [test_file], 'reused': [], 'total': 0}
+        key = self._baseline_key(test_file, source)
+        with self._lock:
+            baseline = self._baselines.get(key)
+
+        reusable = {}
+        if baseline is not None and module_code is not None:
+            since_baseline = self.changes(baseline['code'], module_code)
+            if since_baseline is not None:
+                changed_functions = self.with_callers(sorted(set(since_baseline) | set(changed_functions or [])),
+                                                      baseline['code'], module_code)
+                reusable = baseline['results']
+        elif changed_functions is not None and module_code is not None:
+            changed_functions = self.with_callers(changed_functions, module_code)
+
+        if reusable:
+            changed = set(changed_functions)
+            # Tests without an earlier result (e.g. newly added) always run
+            run = [test for test, called in tests.items()
+                   if called & changed or not any(self._base(r) == test for r in reusable)]
+        else:
+            run = [self._local(nodeid) for nodeid in self.select_tests(test_file, changed_functions)]
+
+        reused = [dict(result, nodeid=f"{test_file}::{test}") for test, result in reusable.items()
+                  if self._base(test) in tests and self._base(test) not in run]
+        return {'run': [f"{test_file}::{test}" for test in run], 'reused': reused, 'total': len(tests)}
+
+    def remember(self, test_file: str, module_code: str, results: List[Dict[str, Any]]):
+        """Record the results of a complete (fresh plus reused) run against module_code"""
+        with open(test_file, 'r', encoding='utf-8') as f:
+            source = f.read()
+        key = self._baseline_key(test_file, source)
+        with self._lock:
+            self._baselines[key] = {'code': module_code, 'results': {r['test']: r for r in results}}
+            self._baselines.move_to_end(key)
+            while len(self._baselines) > self.max_entries:
+                self._baselines.popitem(last=False)
+
+    @staticmethod
+    def _baseline_key(test_file: str, source: str) -> str:
+        # Scratch directories differ between validations, so key on the file name and content only
+        return hashlib.sha256(f"{os.path.basename(test_file)}\0{source}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _local(nodeid: str) -> str:
+        return nodeid.split("::", 1)[1]
+
+    @staticmethod
+    def _base(test: str) -> str:
+        """Test id without its parametrize suffix"""
+        return test.split("[", 1)[0]
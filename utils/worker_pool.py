@@ -0,0 +1,218 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import tempfile
+import threading
+import subprocess
+from typing import Tuple, Dict, Any, List, Optional
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+
+
+class _Worker:
+    """One pre-warmed interpreter running python_worker.py"""
+
+    def __init__(self, preload: List[str]):
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", WORKER_SCRIPT] + list(preload),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self.jobs = 0
+        self.rss_kb = 0
+        self.ready = False
+        self.replies: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        threading.Thread(target=self._read_replies, daemon=True).start()
+
+    def _read_replies(self):
+        for line in self.process.stdout:
+            try:
+                self.replies.put(json.loads(line))
+            except ValueError:
+                continue
+        self.replies.put(None)
+
+    def wait_ready(self, timeout: float) -> bool:
+        if not self.ready:
+            reply = self.replies.get(timeout=timeout)
+            self.ready = bool(reply and reply.get("ready"))
+        return self.ready
+
+    def send(self, job: Dict[str, Any]):
+        self.process.stdin.write(json.dumps(job) + "\n")
+        self.process.stdin.flush()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+
+
+class PythonWorkerPool:
+    """Pool of pre-warmed Python interpreters for running scripts and modules.
+
+    Each job runs in a separate worker process with its stdout/stderr captured,
+    so results match ``subprocess.run(['python', path])`` without paying
+    interpreter startup and import time on every call. Between jobs a worker
+    drops the modules the job imported and restores its environment variables,
+    working directory, sys.path, argv and signal handlers. A worker is replaced
+    after ``max_jobs_per_worker`` jobs, when a job leaves threads running, when
+    its RSS passes ``max_rss_mb``, when it dies, or when a job exceeds its
+    timeout. State a job mutates inside already-loaded modules (the preloads)
+    is not reset; use ``max_jobs_per_worker=1`` where that matters.
+    """
+
+    def __init__(self, size: int = 2, timeout: int = 60, max_jobs_per_worker: int = 50,
+                 max_rss_mb: float = 512, preload: Optional[List[str]] = None,
+                 acquire_timeout: float = 300, spawn_attempts: int = 3):
+        self.size = size
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_kb = int(max_rss_mb * 1024)
+        self.preload = preload or []
+        self.acquire_timeout = acquire_timeout
+        self.spawn_attempts = spawn_attempts
+
+        self.stats = {"jobs": 0, "timeouts": 0, "recycled": 0, "crashed": 0, "spawn_failures": 0}
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Workers that could not be respawned; started again before the next job
+        self._missing = 0
+        for _ in range(size):
+            self._idle.put(_Worker(self.preload))
+        atexit.register(self.close)
+
+    def run_file(self, file_path: str, args: Optional[List[str]] = None,
+                 timeout: Optional[int] = None) -> Tuple[bool, str, str]:
+        """Run a Python file and return success, stdout, stderr"""
+        returncode, stdout, stderr = self._run({"path": file_path, "args": args or []}, timeout)
+        return returncode == 0, stdout, stderr
+
+    def run_module(self, module: str, args: Optional[List[str]] = None, cwd: Optional[str] = None,
+                   timeout: Optional[int] = None) -> Tuple[int, str, str]:
+        """Run ``python -m module args`` and return returncode, stdout, stderr"""
+        return self._run({"module": module, "args": args or [], "cwd": cwd}, timeout)
+
+    def _run(self, job: Dict[str, Any], timeout: Optional[int]) -> Tuple[int, str, str]:
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        timeout = timeout or self.timeout
+
+        try:
+            self._respawn_missing()
+        except OSError as e:
+            if self._missing >= self.size:
+                raise RuntimeError(f"Could not start any pool worker: {e}") from e
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"No idle worker after {self.acquire_timeout}s (pool size {self.size}, "
+                f"{self._missing} failed to respawn)"
+            ) from None
+        with tempfile.TemporaryDirectory() as capture_dir:
+            job = dict(job, stdout=os.path.join(capture_dir, "stdout"), stderr=os.path.join(capture_dir, "stderr"))
+            deadline = time.monotonic() + timeout
+            try:
+                if not worker.wait_ready(timeout):
+                    raise RuntimeError("Worker failed to start")
+                worker.send(job)
+                reply = worker.replies.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self._count("timeouts")
+                self._replace(worker)
+                return 1, self._read(job["stdout"]), "Execution timeout"
+            except Exception as e:
+                self._count("crashed")
+                self._replace(worker)
+                return 1, "", str(e)
+
+            stdout, stderr = self._read(job["stdout"]), self._read(job["stderr"])
+
+        self._count("jobs")
+        if reply is None:
+            # The worker died mid-job (e.g. os._exit or a segfault)
+            self._count("crashed")
+            self._replace(worker)
+            return worker.process.wait() or 1, stdout, stderr
+
+        worker.jobs += 1
+        worker.rss_kb = reply.get("rss_kb", 0)
+        # A job that leaves threads behind cannot be cleaned up in place
+        if worker.jobs >= self.max_jobs_per_worker or worker.rss_kb > self.max_rss_kb or reply.get("dirty"):
+            self._count("recycled")
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return reply["returncode"], stdout, stderr
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _replace(self, worker: _Worker):
+        """Kill a worker and start a fresh one in its place"""
+        worker.kill()
+        with self._lock:
+            if self._closed:
+                return
+            self._missing += 1
+        try:
+            self._respawn_missing()
+        except OSError:
+            # Still counted in _missing (and stats["spawn_failures"]); retried before the next job
+            pass
+
+    def _respawn_missing(self):
+        """Start replacements for workers that are gone, retrying failed spawns"""
+        while True:
+            with self._lock:
+                if self._closed or self._missing == 0:
+                    return
+                self._missing -= 1
+            try:
+                worker = self._spawn()
+            except OSError:
+                with self._lock:
+                    self._missing += 1
+                raise
+            self._idle.put(worker)
+
+    def _spawn(self) -> _Worker:
+        for attempt in range(self.spawn_attempts):
+            try:
+                return _Worker(self.preload)
+            except OSError:
+                self._count("spawn_failures")
+                if attempt == self.spawn_attempts - 1:
+                    raise
+                time.sleep(0.1 * 2 ** attempt)
+
+    @staticmethod
+    def _read(path: str) -> str:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def close(self):
+        """Stop all workers"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Queue-backed bug fixing service
+
+Bug reports are submitted to a durable job queue (SQLite by default, see
+utils/job_queue.py) and processed by any number of worker processes on the
+same machine, each with its own BugFixingSystem:
+
+    python worker.py submit report.json [more.json ...]
+    python worker.py run --processes 4
+    python worker.py status [JOB_ID]
+    python worker.py retry JOB_ID
+
+A worker that is killed mid-run loses only the stage it was in: once its
+lease expires another worker picks the job up and resumes from the last
+stage checkpoint.
+"""
+
+import os
+import sys
+import json
+import uuid
+import signal
+import socket
+import argparse
+import threading
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+from main import BugFixingSystem, load_config
+from utils.job_queue import JobQueue, StageCheckpoints, DEAD
+
+
+def open_queue(config: Dict[str, Any]) -> JobQueue:
+    """JobQueue configured from job_queue_config"""
+    queue_config = config.get('job_queue_config', {})
+    return JobQueue(
+        queue_config.get('db_path', '.cache/jobs/queue.db'),
+        max_attempts=queue_config.get('max_attempts', 3),
+        backoff_base=queue_config.get('backoff_base', 5),
+        backoff_max=queue_config.get('backoff_max', 300)
+    )
+
+
+class FixWorker:
+    """Pulls jobs from a JobQueue and runs fix_bug on them, one at a time"""
+
+    def __init__(self, config_path: str = "config/config.json", worker_id: Optional[str] = None):
+        self.system = BugFixingSystem(config_path)
+        queue_config = self.system.config.get('job_queue_config', {})
+        self.queue = open_queue(self.system.config)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.visibility_timeout = queue_config.get('visibility_timeout', 600)
+        self.heartbeat_interval = queue_config.get('heartbeat_interval', 30)
+        self.poll_interval = queue_config.get('poll_interval', 1.0)
+        self.processed = 0
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Finish the current job, then exit the run loop"""
+        self._stop.set()
+
+    def run(self, drain: bool = False, max_jobs: Optional[int] = None) -> int:
+        """
+        Process jobs until stopped
+
+        Args:
+            drain: Exit once no job is ready instead of polling for new ones
+            max_jobs: Exit after this many jobs
+
+        Returns:
+            Number of jobs processed
+        """
+        print(f"👷 Worker {self.worker_id} polling {self.queue.db_path}")
+        while not self._stop.is_set() and (max_jobs is None or self.processed < max_jobs):
+            if not self.run_once():
+                stats = self.queue.stats()
+                if drain and not stats['queued'] and not stats['running']:
+                    break
+                self._stop.wait(self.poll_interval)
+        return self.processed
+
+    def run_once(self) -> bool:
+        """Claim and process a single job; False if none was ready"""
+        job = self.queue.claim(self.worker_id, self.visibility_timeout)
+        if job is None:
+            return False
+
+        print(f"📥 Job {job['id']} (attempt {job['attempts']}/{job['max_attempts']}): {job['payload'].get('file_path')}")
+        lease_lost = threading.Event()
+        finished = threading.Event()
+
+        def heartbeat():
+            while not finished.wait(self.heartbeat_interval):
+                if not self.queue.heartbeat(job['id'], self.worker_id, self.visibility_timeout):
+                    lease_lost.set()
+                    return
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            result = self.system.fix_bug(job['payload'], StageCheckpoints(self.queue, job['id'], self.worker_id))
+            error = result.get('error') if result.get('status') != 'success' else None
+        except Exception as e:
+            result, error = None, str(e)
+        finally:
+            finished.set()
+            beat.join()
+
+        self.processed += 1
+        if lease_lost.is_set():
+            print(f"⚠️  Lost the lease on job {job['id']}; another worker owns it now")
+        elif error is None:
+            self.queue.complete(job['id'], self.worker_id, result.to_dict())
+            print(f"✅ Job {job['id']} done")
+        else:
+            status = self.queue.fail(job['id'], self.worker_id, error)
+            print(f"❌ Job {job['id']} failed ({error}); {'giving up' if status == DEAD else 'will retry'}")
+        return True
+
+
+def _worker_process(config_path: str, drain: bool):
+    worker = FixWorker(config_path)
+    signal.signal(signal.SIGTERM, worker.stop)
+    worker.run(drain=drain)
+
+
+def run_workers(config_path: str, processes: int, drain: bool = False):
+    """Run FixWorkers in separate processes until they exit or are interrupted"""
+    if processes == 1:
+        _worker_process(config_path, drain)
+        return
+    workers = [multiprocessing.Process(target=_worker_process, args=(config_path, drain))
+               for _ in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
+
+
+def submit(queue: JobQueue, paths: List[str]) -> List[str]:
+    """Queue the bug reports in JSON files (each one report or a list of them)"""
+    job_ids = []
+    for path in paths:
+        with open(path) as f:
+            reports = json.load(f)
+        for report in reports if isinstance(reports, list) else [reports]:
+            job_ids.append(queue.submit(report))
+    return job_ids
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="config/config.json")
+    commands = parser.add_subparsers(dest="command", required=True)
+    submit_parser = commands.add_parser("submit", help="queue bug reports from JSON files")
+    submit_parser.add_argument("reports", nargs="+")
+    run_parser = commands.add_parser("run", help="process queued jobs")
+    run_parser.add_argument("--processes", type=int, default=1)
+    run_parser.add_argument("--drain", action="store_true", help="exit when the queue is empty")
+    status_parser = commands.add_parser("status", help="queue counts, or one job's state and result")
+    status_parser.add_argument("job_id", nargs="?")
+    retry_parser = commands.add_parser("retry", help="requeue a dead job")
+    retry_parser.add_argument("job_id")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        run_workers(args.config, args.processes, args.drain)
+        return 0
+
+    queue = open_queue(load_config(args.config))
+    if args.command == "submit":
+        for job_id in submit(queue, args.reports):
+            print(job_id)
+    elif args.command == "status":
+        if args.job_id:
+            job = queue.get(args.job_id)
+            if job is None:
+                print(f"Unknown job {args.job_id}", file=sys.stderr)
+                return 1
+            job['checkpoints'] = sorted(queue.checkpoints(args.job_id))
+            print(json.dumps(job, indent=2, default=str))
+        else:
+            print(json.dumps(queue.stats(), indent=2))
+    elif args.command == "retry":
+        if not queue.retry(args.job_id):
+            print(f"Job {args.job_id} is not dead", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())